@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Delivery Engine Benchmark
+Sends the same digest to N recipients through a local SMTP sink, over one
+pooled session in a serial loop (the old send_batch_email_only behaviour)
+and then through DeliveryEngine with several workers, and reports time,
+connections and outcomes. --defer-every makes the sink answer 452 to every
+Nth RCPT so the adaptive backoff and retries are exercised too
+
+Usage: python benchmarks/bench_delivery.py [--messages N] [--rtt-ms MS] [--workers N] [--rate R] [--defer-every N]
+"""
+import argparse
+import itertools
+import os
+import sys
+import tempfile
+import threading
+import time
+from email.mime.text import MIMEText
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from delivery import DailyQuota, DeliveryEngine, SENT
+from smtp_pool import SMTPConnection
+from smtp_sink import SMTPSink
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--messages', type=int, default=50, help="recipients to send to")
+    parser.add_argument('--rtt-ms', type=float, default=20.0, help="delay before every server reply")
+    parser.add_argument('--workers', type=int, default=4, help="delivery workers")
+    parser.add_argument('--rate', type=float, default=100.0, help="engine send rate, emails/s")
+    parser.add_argument('--defer-every', type=int, default=0, help="answer 452 to every Nth RCPT (0: never)")
+    return parser.parse_args()
+
+
+def make_message(to, body):
+    msg = MIMEText(body)
+    msg['Subject'] = "🎯 New Internship Alert"
+    msg['From'] = 'bench@example.com'
+    msg['To'] = to
+    return msg
+
+
+def deferring(every):
+    """reply_for that answers 452 to every Nth RCPT"""
+    if not every:
+        return None
+    counter = itertools.count(1)
+    lock = threading.Lock()
+
+    def reply_for(command):
+        with lock:
+            n = next(counter)
+        return '452 4.5.3 Too many recipients, try later' if n % every == 0 else None
+    return reply_for
+
+
+def main():
+    args = parse_args()
+    body = "1. Python Developer Intern at Acme\n   🔗 Link: https://example.com/job/1\n\n" * 40
+    recipients = [f"user{i}@example.com" for i in range(args.messages)]
+
+    print(f"📊 Sending {args.messages} emails to a local sink ({args.rtt_ms:.0f} ms per reply)")
+    print(f"   {'mode':<24} {'seconds':>8} {'emails/s':>9} {'connections':>11} {'sent':>5}")
+    results = {}
+    for mode in ('serial session', f'engine, {args.workers} workers'):
+        sink = SMTPSink(rtt=args.rtt_ms / 1000, reply_for=deferring(args.defer_every)).start()
+        cfg = sink.config()
+        start = time.perf_counter()
+        if mode == 'serial session':
+            sent = 0
+            with SMTPConnection(cfg) as smtp:
+                for to in recipients:
+                    try:
+                        smtp.send(make_message(to, body))
+                        sent += 1
+                    except Exception:
+                        pass
+        else:
+            quota = DailyQuota(limit=args.messages * 10, path=os.path.join(tempfile.mkdtemp(), 'quota.json'))
+            engine = DeliveryEngine(cfg, workers=args.workers, rate=args.rate, quota=quota)
+            outcome = engine.deliver(recipients, lambda to: make_message(to, body))
+            sent = sum(1 for r in outcome.values() if r.status == SENT)
+        elapsed = time.perf_counter() - start
+        sink.stop()
+        results[mode] = elapsed
+        print(f"   {mode:<24} {elapsed:>8.2f} {args.messages / elapsed:>9.1f} "
+              f"{sink.stats['connections']:>11} {sent:>5}")
+
+    serial, engine = results.values()
+    print(f"\n   Speed-up: {serial / engine:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+HTML Parsing Benchmark
+Parse time and peak memory of the listing page parsers: full html.parser
+DOM from decoded text (the old path) versus strained parsing from bytes
+
+Usage: python benchmarks/bench_html_parsing.py [fixtures_dir]
+
+fixtures_dir may hold saved pages named <source>_*.html (for example
+internshala_python.html); without it synthetic pages are used.
+"""
+import glob
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bs4 import BeautifulSoup
+
+import html_parsing
+import scraper
+from synthetic_pages import PAGE_BUILDERS
+
+PARSERS = {
+    'internshala': scraper.parse_internshala_page,
+    'linkedin': scraper.parse_linkedin_page,
+    'timesjobs': scraper.parse_timesjobs_page,
+}
+
+ROUNDS = 5
+
+
+def load_pages(fixtures_dir):
+    pages = {}
+    for source in PARSERS:
+        if fixtures_dir:
+            paths = sorted(glob.glob(os.path.join(fixtures_dir, f"{source}_*.html")))
+            pages[source] = [open(path, 'rb').read() for path in paths]
+        else:
+            pages[source] = [PAGE_BUILDERS[source](seed=seed) for seed in range(3)]
+    return pages
+
+
+def old_parse_listings(content, source, parser=None, fallback=False):
+    """The previous behaviour: decode to text, then build the full DOM"""
+    return BeautifulSoup(content.decode('utf-8', errors='replace'), 'html.parser')
+
+
+def measure(parse_fn, pages):
+    """Return (ms per page, peak KiB, jobs found) for parsing every page"""
+    tracemalloc.start()
+    jobs = sum(len(parse_fn(page)) for page in pages)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    start = time.perf_counter()
+    for _ in range(ROUNDS):
+        for page in pages:
+            parse_fn(page)
+    elapsed = time.perf_counter() - start
+    return elapsed * 1000 / (ROUNDS * len(pages)), peak / 1024, jobs
+
+
+def main():
+    fixtures_dir = sys.argv[1] if len(sys.argv) > 1 else None
+    pages = load_pages(fixtures_dir)
+
+    print(f"📊 Listing page parsing ({'fixtures: ' + fixtures_dir if fixtures_dir else 'synthetic pages'}, "
+          f"parser: {html_parsing.HTML_PARSER})")
+    for source, parse_fn in PARSERS.items():
+        if not pages[source]:
+            print(f"   {source}: no pages")
+            continue
+        size_kb = sum(len(page) for page in pages[source]) / len(pages[source]) / 1024
+
+        strained = scraper.parse_listings
+        scraper.parse_listings = old_parse_listings
+        try:
+            before = measure(parse_fn, pages[source])
+        finally:
+            scraper.parse_listings = strained
+        after = measure(parse_fn, pages[source])
+
+        print(f"   {source} ({len(pages[source])} pages, {size_kb:.0f} KiB avg)")
+        print(f"      before: {before[0]:7.1f} ms/page  peak {before[1]:8.0f} KiB  {before[2]} jobs")
+        print(f"      after:  {after[0]:7.1f} ms/page  peak {after[1]:8.0f} KiB  {after[2]} jobs")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Keyword Matcher Benchmark
+Compares the old per-keyword substring loop with the precompiled
+Aho-Corasick matcher on synthetic listing titles
+
+Usage: python benchmarks/bench_keyword_matcher.py [num_titles]
+"""
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scraper import TECH_KEYWORDS, is_relevant_internship
+
+FILLER_WORDS = [
+    'senior', 'chef', 'driver', 'warehouse', 'night', 'shift', 'associate', 'remote',
+    'part', 'time', 'delivery', 'partner', 'field', 'officer', 'store', 'helper',
+    'bangalore', 'mumbai', 'pvt', 'ltd', 'solutions', 'global', 'services', 'private'
+]
+
+
+def make_titles(count, seed=42):
+    """Titles with a mix of relevant keywords and filler, like real listings"""
+    rng = random.Random(seed)
+    titles = []
+    for _ in range(count):
+        words = rng.sample(FILLER_WORDS, rng.randint(3, 6))
+        if rng.random() < 0.5:
+            words.insert(rng.randint(0, len(words)), rng.choice(TECH_KEYWORDS))
+        titles.append(' '.join(words).title())
+    return titles
+
+
+def old_is_relevant(title, company=""):
+    """The original implementation, kept here only for comparison"""
+    text_to_check = f"{title} {company}".lower()
+    for keyword in TECH_KEYWORDS:
+        if keyword.lower() in text_to_check:
+            return True
+    return False
+
+
+def bench(fn, titles):
+    start = time.perf_counter()
+    matched = sum(1 for title in titles if fn(title, "Acme Corp"))
+    return time.perf_counter() - start, matched
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    titles = make_titles(count)
+
+    old_time, old_matched = bench(old_is_relevant, titles)
+    new_time, new_matched = bench(is_relevant_internship, titles)
+
+    print(f"📊 Keyword matching over {count} titles ({len(TECH_KEYWORDS)} keywords)")
+    print(f"   Substring loop: {old_time * 1000:8.1f} ms  ({old_matched} relevant)")
+    print(f"   Aho-Corasick:   {new_time * 1000:8.1f} ms  ({new_matched} relevant)")
+    print(f"   Speedup:        {old_time / new_time:8.1f}x")
+    print("   (counts differ where word boundaries now reject matches inside other words)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+Scraper Benchmark
+Runs every registered source end to end against replayed HTTP fixtures and
+reports pages/sec, parse ms per page, jobs/sec and peak memory per source
+
+Usage: python benchmarks/bench_scrapers.py [--fixtures DIR] [--listings N] [--chrome N] [--pages N]
+                                           [--parse-workers N] [--inline-pages N]
+
+DIR is a store recorded with: python http_fixtures.py DIR. Without it a
+synthetic store is generated; --listings and --chrome set the listings
+and the amount of non-listing markup per synthetic page, so large values
+stress the parsers. --parse-workers sets the parse pool's processes (0:
+parse in-process) and --inline-pages how many pages are parsed in-process
+before the pool starts. Parse ms is parse time summed over every process.
+"""
+import argparse
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections import defaultdict
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--fixtures', help="recorded fixture directory (default: synthetic pages)")
+    parser.add_argument('--listings', type=int, default=40, help="listings per synthetic page")
+    parser.add_argument('--chrome', type=int, default=30, help="non-listing blocks per synthetic page")
+    parser.add_argument('--pages', type=int, default=3, help="pages walked per category or search")
+    parser.add_argument('--parse-workers', type=int, help="parse pool processes (default: PARSE_WORKERS)")
+    parser.add_argument('--inline-pages', type=int, default=0,
+                        help="pages parsed in-process before the pool starts")
+    return parser.parse_args()
+
+
+def build_synthetic_store(path, listings, chrome, pages):
+    """Fixture store with a synthetic page for every URL the scrapers request"""
+    from http_fixtures import FixtureStore
+    from synthetic_pages import PAGE_BUILDERS
+    import scraper
+
+    store = FixtureStore(path)
+    html = {'Content-Type': 'text/html; charset=utf-8'}
+    urls = {
+        'internshala': [scraper.internshala_page_url(url, page)
+                        for url in scraper.INTERNSHALA_URLS for page in range(1, pages + 1)],
+        'linkedin': [scraper.linkedin_search_url(term, page)
+                     for term in scraper.LINKEDIN_SEARCHES for page in range(1, pages + 1)],
+        'timesjobs': [scraper.timesjobs_search_url(term, page)
+                      for term in scraper.TIMESJOBS_SEARCHES for page in range(1, pages + 1)],
+    }
+    for source, source_urls in urls.items():
+        for seed, url in enumerate(source_urls):
+            store.save(url, 200, html, PAGE_BUILDERS[source](listings, chrome, seed=seed))
+    store.save('https://www.freshersworld.com/jobs/rss', 200,
+               {'Content-Type': 'application/rss+xml; charset=utf-8'},
+               PAGE_BUILDERS['freshersworld'](listings * 5))
+    return store
+
+
+def run_source(registered, seen_factory, trace=False):
+    """Run one source to completion; returns (jobs, seconds, peak traced bytes)"""
+    if trace:
+        tracemalloc.start()
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        jobs = list(registered.scrape(seen_factory()))
+    elapsed = time.perf_counter() - start
+    peak = 0
+    if trace:
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    return jobs, elapsed, peak
+
+
+def main():
+    args = parse_args()
+    tmp = tempfile.TemporaryDirectory()
+    fixtures_dir = args.fixtures or os.path.join(tmp.name, 'fixtures')
+
+    # Configure replay before the project modules read their settings
+    os.environ['HTTP_FIXTURES'] = 'replay'
+    os.environ['HTTP_FIXTURES_DIR'] = fixtures_dir
+    os.environ['PAGINATION_MAX_PAGES'] = str(args.pages)
+    os.environ['CRAWL_STATS_FILE'] = os.path.join(tmp.name, 'crawl_stats.json')
+    os.environ['CRAWL_BUDGET'] = '1000'
+    os.environ['SELECTOR_CACHE_FILE'] = os.path.join(tmp.name, 'selector_cache.json')
+    os.environ['PARSE_INLINE_PAGES'] = str(args.inline_pages)
+    os.environ['PARSE_CACHE_ENABLED'] = '0'  # every pass parses every page
+    if args.parse_workers is not None:
+        os.environ['PARSE_WORKERS'] = str(args.parse_workers)
+
+    import http_fixtures
+    import sources
+    from http_client import get_client
+    from parse_pool import get_parse_pool
+    from run_metrics import start_run
+    from storage import SeenSet
+
+    if not args.fixtures:
+        build_synthetic_store(fixtures_dir, args.listings, args.chrome, args.pages)
+    get_client()  # created after the store is written, so it sees every fixture
+
+    # Count replayed pages and bytes per host
+    pages = defaultdict(int)
+    sizes = defaultdict(int)
+    replay_send = http_fixtures.ReplayAdapter.send
+
+    def counting_send(adapter, request, **kwargs):
+        response = replay_send(adapter, request, **kwargs)
+        host = request.url.split('/')[2]
+        pages[host] += 1
+        sizes[host] += len(response.content)
+        return response
+
+    http_fixtures.ReplayAdapter.send = counting_send
+
+    pool = get_parse_pool()
+    source = 'synthetic' if not args.fixtures else args.fixtures
+    print(f"📊 Scrapers against replayed fixtures ({source}, up to {args.pages} pages per search, "
+          f"{pool.workers} parse processes)")
+    print(f"   {'source':<16} {'pages':>5} {'KiB/page':>8} {'pages/s':>8} {'parse ms':>9} "
+          f"{'jobs':>5} {'jobs/s':>8} {'peak MiB':>8}")
+    for registered in list(sources.SOURCES):
+        # No result caps, so every available page is processed
+        registered = registered._replace(max_results=10 ** 9)
+        sources.SOURCES[[s.key for s in sources.SOURCES].index(registered.key)] = registered
+        host = registered.host
+
+        # Timed without tracemalloc, which slows parsing down; then once more for memory
+        pages[host] = sizes[host] = 0
+        metrics = start_run()
+        jobs, elapsed, _ = run_source(registered, SeenSet)
+        count = pages[host]
+        parse_seconds = metrics.record()['sources'].get(registered.key, {}).get('parse_seconds', 0.0)
+        parse_ms = parse_seconds * 1000 / count if count else 0.0
+        kib = sizes[host] / count / 1024 if count else 0.0
+        _, _, peak = run_source(registered, SeenSet, trace=True)
+
+        print(f"   {registered.name:<16} {count:>5} {kib:>8.0f} {count / elapsed:>8.1f} {parse_ms:>9.1f} "
+              f"{len(jobs):>5} {len(jobs) / elapsed:>8.1f} {peak / (1024 * 1024):>8.1f}")
+
+    pool.shutdown()
+    tmp.cleanup()
+
+
+if __name__ == "__main__":
+    main()
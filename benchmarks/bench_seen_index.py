@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Seen Index Benchmark
+Load time, lookup time and memory of the JSON seen set versus the
+memory-mapped seen index, on synthetic job IDs
+
+Usage: python benchmarks/bench_seen_index.py [num_ids]
+"""
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import storage
+from seen_index import SeenIndex
+
+SOURCES = ['internshala', 'linkedin', 'timesjobs', 'freshers']
+LOOKUPS = 100000
+
+
+def make_ids(count, seed=42):
+    rng = random.Random(seed)
+    return [f"{rng.choice(SOURCES)}_{rng.getrandbits(64):016x}" for _ in range(count)]
+
+
+def make_probes(ids, seed=7):
+    """Half IDs that are in the set, half that aren't"""
+    rng = random.Random(seed)
+    hits = rng.sample(ids, LOOKUPS // 2)
+    misses = make_ids(LOOKUPS // 2, seed=seed + 1)
+    probes = hits + misses
+    rng.shuffle(probes)
+    return probes
+
+
+def measure(load_fn, probes):
+    """Return (load ms, peak MiB while loading, µs per lookup, hits)"""
+    tracemalloc.start()
+    start = time.perf_counter()
+    seen = load_fn()
+    load_ms = (time.perf_counter() - start) * 1000
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    start = time.perf_counter()
+    hits = sum(1 for job_id in probes if job_id in seen)
+    lookup_us = (time.perf_counter() - start) * 1e6 / len(probes)
+    return load_ms, peak / (1024 * 1024), lookup_us, hits
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    ids = make_ids(count)
+    probes = make_probes(ids)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        storage.FILE = os.path.join(tmp, 'seen.json')
+        seen_at = '2026-01-01T00:00:00'
+        with open(storage.FILE, 'w') as f:
+            json.dump({job_id: seen_at for job_id in ids}, f)
+
+        index_path = os.path.join(tmp, 'seen.idx')
+        start = time.perf_counter()
+        SeenIndex(index_path).import_ids(dict.fromkeys(ids, seen_at))
+        build_s = time.perf_counter() - start
+
+        json_size = os.path.getsize(storage.FILE) / (1024 * 1024)
+        index_size = os.path.getsize(index_path) / (1024 * 1024)
+
+        before = measure(storage.load_seen, probes)
+        after = measure(lambda: SeenIndex(index_path), probes)
+
+    print(f"📊 Seen-ID store with {count} IDs, {len(probes)} lookups (50% hits)")
+    print(f"   json set: {json_size:6.1f} MiB file  load {before[0]:8.1f} ms  peak {before[1]:7.1f} MiB  "
+          f"{before[2]:.2f} µs/lookup  {before[3]} hits")
+    print(f"   mmap idx: {index_size:6.1f} MiB file  load {after[0]:8.1f} ms  peak {after[1]:7.1f} MiB  "
+          f"{after[2]:.2f} µs/lookup  {after[3]} hits")
+    print(f"   (index built once in {build_s:.1f} s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+SMTP Delivery Benchmark
+Sends the same digest to N recipients through a local SMTP sink, first with
+a new connection and login per email (the old send_batch_email behaviour),
+then over one pooled SMTPConnection, and reports time and connections used
+
+Usage: python benchmarks/bench_smtp.py [--messages N] [--rtt-ms MS] [--rotate N]
+
+--rtt-ms delays every server reply to model the round trip to a real
+provider; --rotate sets how many messages one pooled session carries.
+"""
+import argparse
+import os
+import sys
+import time
+from email.mime.text import MIMEText
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from smtp_pool import SMTPConnection
+from smtp_sink import SMTPSink
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--messages', type=int, default=50, help="recipients to send to")
+    parser.add_argument('--rtt-ms', type=float, default=20.0, help="delay before every server reply")
+    parser.add_argument('--rotate', type=int, default=50, help="messages per pooled session")
+    return parser.parse_args()
+
+
+def make_message(to, body):
+    msg = MIMEText(body)
+    msg['Subject'] = "🎯 New Internship Alert"
+    msg['From'] = 'bench@example.com'
+    msg['To'] = to
+    return msg
+
+
+def main():
+    args = parse_args()
+    body = "1. Python Developer Intern at Acme\n   🔗 Link: https://example.com/job/1\n\n" * 40
+    recipients = [f"user{i}@example.com" for i in range(args.messages)]
+
+    print(f"📊 Sending {args.messages} emails to a local sink ({args.rtt_ms:.0f} ms per reply)")
+    print(f"   {'mode':<24} {'seconds':>8} {'emails/s':>9} {'connections':>11}")
+    results = {}
+    for mode in ('connection per email', 'pooled session'):
+        sink = SMTPSink(rtt=args.rtt_ms / 1000).start()
+        cfg = sink.config()
+        start = time.perf_counter()
+        if mode == 'pooled session':
+            with SMTPConnection(cfg, max_messages=args.rotate) as smtp:
+                for to in recipients:
+                    smtp.send(make_message(to, body))
+        else:
+            for to in recipients:
+                with SMTPConnection(cfg) as smtp:
+                    smtp.send(make_message(to, body))
+        elapsed = time.perf_counter() - start
+        sink.stop()
+        assert sink.stats['messages'] == args.messages
+        results[mode] = elapsed
+        print(f"   {mode:<24} {elapsed:>8.2f} {args.messages / elapsed:>9.1f} {sink.stats['connections']:>11}")
+
+    print(f"\n   Speed-up: {results['connection per email'] / results['pooled session']:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
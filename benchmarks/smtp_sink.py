@@ -0,0 +1,88 @@
+"""
+Local SMTP Sink
+A threaded SMTP server on localhost that accepts (and discards) mail for
+delivery benchmarks. Every reply is delayed by rtt seconds to stand in for
+the network round trip to a real provider, and reply_for can turn chosen
+RCPT commands into temporary failures such as 421 or 452
+"""
+import socketserver
+import threading
+import time
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    def reply(self, line):
+        time.sleep(self.server.sink.rtt)
+        self.wfile.write(line.encode('ascii') + b'\r\n')
+        self.wfile.flush()
+
+    def handle(self):
+        sink = self.server.sink
+        sink.count('connections')
+        self.reply('220 sink ESMTP ready')
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return
+            command = line.decode('ascii', 'replace').strip()
+            verb = command.split(' ', 1)[0].upper()
+            if verb in ('EHLO', 'HELO'):
+                self.reply('250-sink\r\n250-AUTH PLAIN\r\n250 8BITMIME')
+            elif verb == 'AUTH':
+                sink.count('logins')
+                self.reply('235 2.7.0 Authentication successful')
+            elif verb == 'RCPT':
+                special = sink.reply_for(command) if sink.reply_for else None
+                self.reply(special or '250 2.1.5 OK')
+                if special and special.startswith('421'):
+                    return
+            elif verb == 'DATA':
+                self.reply('354 End data with <CR><LF>.<CR><LF>')
+                while self.rfile.readline() not in (b'.\r\n', b'.\n', b''):
+                    pass
+                sink.count('messages')
+                self.reply('250 2.0.0 Queued')
+            elif verb == 'QUIT':
+                self.reply('221 2.0.0 Bye')
+                return
+            elif verb in ('MAIL', 'RSET', 'NOOP'):
+                self.reply('250 2.0.0 OK')
+            else:
+                self.reply('502 5.5.2 Command not implemented')
+
+
+class _Server(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+class SMTPSink:
+    """Start with start(); connect to ('127.0.0.1', sink.port)"""
+
+    def __init__(self, rtt=0.0, reply_for=None):
+        self.rtt = rtt
+        self.reply_for = reply_for
+        self.stats = {'connections': 0, 'logins': 0, 'messages': 0}
+        self._lock = threading.Lock()
+        self._server = _Server(('127.0.0.1', 0), _Handler)
+        self._server.sink = self
+        self.port = self._server.server_address[1]
+
+    def count(self, name):
+        with self._lock:
+            self.stats[name] += 1
+
+    def config(self, **overrides):
+        """SMTP_CONFIG-style settings for this sink"""
+        cfg = {'host': '127.0.0.1', 'port': self.port, 'user': 'bench@example.com',
+               'pass': 'secret', 'starttls': False}
+        cfg.update(overrides)
+        return cfg
+
+    def start(self):
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
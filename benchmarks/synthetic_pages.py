@@ -0,0 +1,111 @@
+"""
+Synthetic Listing Pages
+Generates result pages shaped like each source's markup, padded with the
+navigation, script and footer chrome real pages carry, for offline parser
+benchmarks
+"""
+import random
+
+TITLES = [
+    'Python Developer Intern', 'Data Science Internship', 'Marketing Intern',
+    'Business Development Trainee', 'Finance Analyst Intern', 'HR Intern',
+    'Content Writing Internship', 'UI/UX Design Intern', 'Sales Executive Trainee',
+    'Machine Learning Intern', 'Operations Intern', 'Research Analyst Intern'
+]
+
+COMPANIES = [
+    'Acme Technologies Pvt. Ltd.', 'Brightpath Analytics', 'Nimbus Labs',
+    'Quantum Retail', 'Greenleaf Consulting', 'Orbit Fintech', 'Pixel Studio'
+]
+
+
+def _chrome(rng, blocks):
+    """Non-listing markup: nav menus, inline scripts and footer links"""
+    parts = []
+    for i in range(blocks):
+        links = ''.join(f'<li><a href="/nav/{i}/{j}" class="nav-link">Menu item {j}</a></li>' for j in range(20))
+        parts.append(f'<nav class="menu menu-{i}"><ul>{links}</ul></nav>')
+        parts.append('<script>window.__DATA__ = {"k": "' + 'x' * rng.randint(500, 2000) + '"};</script>')
+        parts.append(f'<div class="footer-block"><p>{"Lorem ipsum dolor sit amet. " * 20}</p></div>')
+    return ''.join(parts)
+
+
+def internshala_page(listings=40, chrome_blocks=30, seed=0):
+    rng = random.Random(seed)
+    cards = []
+    for i in range(listings):
+        title = rng.choice(TITLES)
+        cards.append(
+            f'<div class="container-fluid individual_internship" internshipid="{seed}{i}">'
+            f'<h3 class="job-internship-name"><a class="job-title-href" href="/internship/detail/{title.lower().replace(" ", "-").replace("/", "")}-{seed}-{i}">{title}</a></h3>'
+            f'<p class="company-name">{rng.choice(COMPANIES)}</p>'
+            f'<div class="row-1-item"><span>Work from home</span></div>'
+            f'<div class="status-inactive"><span>{rng.randint(1, 20)} days ago</span></div>'
+            f'<div class="row-1-item"><span>Apply by {rng.randint(1, 28)} Jan</span></div>'
+            '</div>'
+        )
+    return ('<html><head><title>Internships</title></head><body>' + _chrome(rng, chrome_blocks)
+            + '<div id="internship_list_container">' + ''.join(cards) + '</div>'
+            + _chrome(rng, chrome_blocks // 2) + '</body></html>').encode('utf-8')
+
+
+def linkedin_page(listings=25, chrome_blocks=30, seed=0):
+    rng = random.Random(seed)
+    cards = []
+    for i in range(listings):
+        cards.append(
+            f'<li><div class="base-card job-search-card" data-entity-urn="urn:li:jobPosting:{seed}{i}">'
+            f'<h3 class="base-search-card__title job-search-card__title">'
+            f'<a href="https://in.linkedin.com/jobs/view/{seed}{i}?refId=abc&amp;trackingId=xyz">{rng.choice(TITLES)}</a></h3>'
+            f'<h4 class="base-search-card__subtitle"><a class="job-search-card__subtitle-link" href="/company/{i}">{rng.choice(COMPANIES)}</a></h4>'
+            f'<time class="job-search-card__listdate" datetime="2026-01-0{rng.randint(1, 9)}">{rng.randint(1, 14)} days ago</time>'
+            '</div></li>'
+        )
+    return ('<html><head><title>Jobs</title></head><body>' + _chrome(rng, chrome_blocks)
+            + '<ul class="jobs-search__results-list">' + ''.join(cards) + '</ul>'
+            + _chrome(rng, chrome_blocks // 2) + '</body></html>').encode('utf-8')
+
+
+def timesjobs_page(listings=25, chrome_blocks=30, seed=0):
+    rng = random.Random(seed)
+    cards = []
+    for i in range(listings):
+        cards.append(
+            '<li class="clearfix job-bx wht-shd-bx">'
+            f'<header class="clearfix"><h2><a href="https://www.timesjobs.com/job-detail/{seed}-{i}">{rng.choice(TITLES)}</a></h2>'
+            f'<h3 class="joblist-comp-name">{rng.choice(COMPANIES)}</h3></header>'
+            f'<span class="sim-posted">Posted {rng.randint(1, 20)} days ago</span>'
+            '</li>'
+        )
+    return ('<html><head><title>Jobs</title></head><body>' + _chrome(rng, chrome_blocks)
+            + '<ul class="new-joblist">' + ''.join(cards) + '</ul>'
+            + _chrome(rng, chrome_blocks // 2) + '</body></html>').encode('utf-8')
+
+
+FEED_COMPANIES = ['Infosys', 'Tata Motors', 'HDFC Bank', 'Deloitte', 'Wipro', 'Quantum Retail']
+FEED_ROLES = ['Graduate Engineer Trainee', 'Software Intern', 'Junior Analyst',
+              'Campus Associate', 'Senior Manager', 'Marketing Trainee']
+
+
+def freshersworld_feed(listings=50, chrome_blocks=0, seed=0):
+    """Freshersworld-style RSS feed (chrome_blocks is accepted for a uniform signature)"""
+    rng = random.Random(seed)
+    items = []
+    for i in range(listings):
+        company = rng.choice(FEED_COMPANIES)
+        items.append(
+            f'<item><title>{rng.choice(FEED_ROLES)}</title>'
+            f'<link>https://www.freshersworld.com/jobs/{seed}-{i}</link>'
+            f'<description>{company} is hiring freshers in Pune. Apply now.</description>'
+            f'<pubDate>Mon, 0{rng.randint(1, 9)} Jun 2026 10:00:00 +0530</pubDate></item>'
+        )
+    return ('<?xml version="1.0" encoding="UTF-8"?><rss version="2.0"><channel>'
+            '<title>Freshersworld Jobs</title>' + ''.join(items) + '</channel></rss>').encode('utf-8')
+
+
+PAGE_BUILDERS = {
+    'internshala': internshala_page,
+    'linkedin': linkedin_page,
+    'timesjobs': timesjobs_page,
+    'freshersworld': freshersworld_feed,
+}
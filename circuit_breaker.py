@@ -0,0 +1,181 @@
+"""
+Circuit Breakers
+One breaker per host (blocked or erroring responses such as 429, 999 and
+5xx) and one per source (pages that fail or stop matching any listings).
+When the recent failure rate crosses the threshold the circuit opens and
+nothing is fetched until its cool-down ends; then a single probe decides
+whether it closes again or stays open for twice as long. State is kept in
+circuit_state.json, so a broken source costs one probe per cool-down
+instead of every search on every run
+"""
+import json
+import os
+import threading
+import time
+from datetime import datetime
+
+import requests
+
+CIRCUIT_FILE = os.getenv("CIRCUIT_STATE_FILE", "circuit_state.json")
+
+# Open once at least MIN_REQUESTS of the last WINDOW outcomes failed at this rate
+FAILURE_RATE = float(os.getenv("CIRCUIT_FAILURE_RATE", "0.5"))
+MIN_REQUESTS = int(os.getenv("CIRCUIT_MIN_REQUESTS", "4"))
+WINDOW = 20
+
+# First cool-down in seconds; each failed probe doubles it, up to MAX_OPEN_SECONDS
+OPEN_SECONDS = float(os.getenv("CIRCUIT_OPEN_SECONDS", "3600"))
+MAX_OPEN_SECONDS = float(os.getenv("CIRCUIT_MAX_OPEN_SECONDS", "86400"))
+
+# Responses meaning the host is refusing or failing us (999 is LinkedIn's block)
+FAILURE_STATUSES = {403, 429, 999}
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+
+class CircuitOpenError(requests.RequestException):
+    """A request was refused because its host's circuit is open"""
+
+
+def is_failed_response(response):
+    status = response.status_code
+    return status in FAILURE_STATUSES or status >= 500
+
+
+class CircuitBreaker:
+    """Failure-rate breaker over a sliding window of outcomes"""
+
+    def __init__(self, name, state=None, on_change=None):
+        state = state or {}
+        self.name = name
+        self.state = state.get('state', CLOSED)
+        self.window = list(state.get('window', []))
+        self.open_until = state.get('open_until', 0.0)
+        self.cooldown = state.get('cooldown', OPEN_SECONDS)
+        self.probing = False
+        self._on_change = on_change
+        self._lock = threading.Lock()
+
+    def allow(self):
+        """Whether a request may go ahead. A half-open circuit allows one probe at a time"""
+        with self._lock:
+            if self.state == OPEN and time.time() >= self.open_until:
+                self.state = HALF_OPEN
+            if self.state == CLOSED:
+                return True
+            if self.state == HALF_OPEN and not self.probing:
+                self.probing = True
+                return True
+            return False
+
+    def record(self, success):
+        """Record the outcome of an allowed request"""
+        with self._lock:
+            if self.state == HALF_OPEN:
+                self.probing = False
+                if success:
+                    self._close()
+                else:
+                    self._open(min(self.cooldown * 2, MAX_OPEN_SECONDS))
+            elif self.state == CLOSED:
+                self.window = (self.window + [0 if success else 1])[-WINDOW:]
+                if len(self.window) >= MIN_REQUESTS and sum(self.window) / len(self.window) >= FAILURE_RATE:
+                    self._open(OPEN_SECONDS)
+        if self._on_change:
+            self._on_change()
+
+    def release(self):
+        """End an allowed request that said nothing about the circuit, such as
+        one answered from the cache, so a half-open circuit can probe again"""
+        with self._lock:
+            self.probing = False
+
+    def _open(self, cooldown):
+        self.state = OPEN
+        self.cooldown = cooldown
+        self.open_until = time.time() + cooldown
+        self.window = []
+        print(f"⛔ Circuit {self.name} opened for {cooldown / 60:.0f} min")
+
+    def _close(self):
+        self.state = CLOSED
+        self.cooldown = OPEN_SECONDS
+        self.open_until = 0.0
+        self.window = []
+        print(f"✅ Circuit {self.name} closed again")
+
+    def describe(self):
+        if self.state == OPEN:
+            until = datetime.fromtimestamp(self.open_until).strftime('%Y-%m-%d %H:%M')
+            return f"open until {until}"
+        return self.state.replace('_', '-')
+
+    def as_dict(self):
+        return {
+            'state': self.state,
+            'window': self.window,
+            'open_until': self.open_until,
+            'cooldown': self.cooldown,
+        }
+
+
+class CircuitBoard:
+    """Every breaker, keyed 'host:<host>' or 'source:<key>', persisted to one file"""
+
+    def __init__(self, path=CIRCUIT_FILE):
+        self.path = path
+        self.breakers = {}
+        self._states = {}
+        self._dirty = False
+        self._lock = threading.Lock()
+        if os.path.exists(path):
+            with open(path, 'r') as f:
+                self._states = json.load(f).get('circuits', {})
+
+    def _changed(self):
+        self._dirty = True
+
+    def get(self, name):
+        with self._lock:
+            if name not in self.breakers:
+                self.breakers[name] = CircuitBreaker(name, self._states.get(name), self._changed)
+            return self.breakers[name]
+
+    def host(self, host):
+        return self.get(f"host:{host}")
+
+    def source(self, key):
+        return self.get(f"source:{key}")
+
+    def not_closed(self):
+        """Breakers currently open or half-open, including ones not used this run"""
+        with self._lock:
+            names = set(self._states) | set(self.breakers)
+        return [breaker for breaker in map(self.get, sorted(names)) if breaker.state != CLOSED]
+
+    def save(self):
+        with self._lock:
+            if not self._dirty:
+                return
+            states = dict(self._states)
+            states.update((name, breaker.as_dict()) for name, breaker in self.breakers.items())
+            self._dirty = False
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump({'circuits': states}, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, self.path)
+
+
+_board = None
+_board_lock = threading.Lock()
+
+
+def get_circuits():
+    """Return the circuit breakers shared by the fetch engine and the scrapers"""
+    global _board
+    with _board_lock:
+        if _board is None:
+            _board = CircuitBoard()
+        return _board
@@ -1,65 +1,86 @@
-from scraper import scrape_all
-from storage import load_seen, save_seen, add_to_batch
+from scraper import iter_all
+from storage import load_seen, save_seen, compact_seen, open_batch_store, SEEN_RETENTION_DAYS
 from config import SUBSCRIBERS
-import re
-from datetime import datetime, timedelta
+from crawl_stats import get_crawl_stats
+from run_metrics import start_run, METRICS_FILE
+from date_normalizer import normalize_posted, parse_timestamp, utc_now
+from datetime import timezone
 
-def is_internship_too_old(posted_date):
-    """Check if an internship is older than 2 weeks based on posted_date"""
-    if not posted_date or posted_date == "Not specified":
-        return False  # If no date info, allow it through
-    
-    posted_date_lower = posted_date.lower()
-    
-    # Extract number and time unit
-    time_pattern = r'(\d+)\s+(day|week|month)s?\s+ago'
-    match = re.search(time_pattern, posted_date_lower)
-    
-    if not match:
-        return False  # If can't parse, allow it through
-    
-    number = int(match.group(1))
-    unit = match.group(2)
-    
-    # Convert to days
-    if unit == 'day':
-        days_old = number
-    elif unit == 'week':
-        days_old = number * 7
-    elif unit == 'month':
-        days_old = number * 30  # Approximate
-    else:
-        return False  # Unknown unit, allow through
-    
-    # Filter out if older than 14 days (2 weeks)
-    return days_old > 14
+# Listings posted longer ago than this are not sent (2 weeks)
+MAX_AGE_DAYS = 14
 
-def collect_internships():
-    """Collect new internships and add them to the batch"""
-    seen_ids = load_seen()
-    new_count = 0
+def is_internship_too_old(posted_date, posted_at=None, now=None):
+    """Check if an internship is older than 2 weeks.
 
-    internships = scrape_all()
-    print(f"📦 Found {len(internships)} internships total.")
+    Uses the absolute posted_at timestamp recorded at scrape time, falling
+    back to parsing the posted_date text for jobs scraped before it existed.
+    """
+    now = now or utc_now()
+    posted = parse_timestamp(posted_at) or normalize_posted(posted_date, now)
+    if posted is None:
+        return False  # If no date info, allow it through
+
+    # Whole days, so "14 days ago" is kept whatever the time of day
+    days_old = (now.astimezone(timezone.utc).date() - posted.astimezone(timezone.utc).date()).days
+    return days_old > MAX_AGE_DAYS
 
-    for job in internships:
+def drop_seen(jobs, seen_ids, stats):
+    """Stage: skip jobs already seen in an earlier run"""
+    for job in jobs:
         if job['id'] in seen_ids:
+            stats.record_outcome(job.get('page_url'), new=False)
             continue
-        
-        # Filter out internships older than 2 weeks
-        if is_internship_too_old(job.get('posted_date', '')):
+        yield job
+
+def drop_too_old(jobs, now):
+    """Stage: skip internships older than 2 weeks"""
+    for job in jobs:
+        if is_internship_too_old(job.get('posted_date', ''), job.get('posted_at'), now):
             print(f"⏰ Skipped (too old): {job['title']} at {job['company']} - Posted: {job.get('posted_date', 'Unknown')}")
             continue
+        yield job
+
+def collect_internships(bot_run_id=None):
+    """Collect new internships and add them to the batch"""
+    metrics = start_run(bot_run_id)
+    seen_ids = load_seen()
+    evicted = compact_seen(seen_ids)
+    print(f"🧹 Evicted {evicted} seen IDs older than {SEEN_RETENTION_DAYS} days ({len(seen_ids)} kept).")
+    new_count = 0
+    now = utc_now()
+    stats = get_crawl_stats()
+
+    # Jobs flow through the stages as each source parses them
+    jobs = iter_all(seen_ids)
+    jobs = drop_seen(jobs, seen_ids, stats)
+    jobs = drop_too_old(jobs, now)
+
+    # One load and one write of the batch for the whole cycle
+    with open_batch_store() as batch:
+        for job in jobs:
+            # Add to batch instead of sending immediately
+            if batch.add(job):
+                stats.record_outcome(job.get('page_url'), new=True)
+                seen_ids.add(job['id'])
+                new_count += 1
+                print(f"✅ Added to batch: {job['title']} at {job['company']}")
+            else:
+                # Seen too, so later runs skip it instead of merging it again
+                seen_ids.add(job['id'])
+                stats.record_outcome(job.get('page_url'), new=False)
+                print(f"🔄 Skipped (duplicate in batch): {job['title']} at {job['company']}")
 
-        # Add to batch instead of sending immediately
-        if add_to_batch(job):
-            seen_ids.add(job['id'])
-            new_count += 1
-            print(f"✅ Added to batch: {job['title']} at {job['company']}")
-        else:
-            print(f"🔄 Skipped (duplicate in batch): {job['title']} at {job['company']}")
+    if batch.merged:
+        print(f"🔗 Merged {len(batch.merged)} near-duplicate listings:")
+        for line in batch.merged:
+            print(f"   {line}")
 
     save_seen(seen_ids)
+    stats.save()
+    metrics.save()
+    print(f"📈 Run {metrics.bot_run_id} metrics appended to {METRICS_FILE}:")
+    for line in metrics.summary_lines():
+        print(f"   {line}")
     print(f"📥 Added {new_count} new internships to batch.")
     print("✅ Collection cycle completed.")
 
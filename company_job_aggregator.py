@@ -4,14 +4,29 @@ Uses publicly available job RSS feeds and APIs to find company opportunities
 """
 import requests
 import feedparser
-from datetime import datetime
+import time
 import re
+from http_client import HEADER_PROFILES
+from fetcher import get_engine
+from keyword_matcher import KeywordMatcher
+from date_normalizer import normalize_rss_published, to_timestamp
+from job_ids import NO_COMPANY, make_job_id
+from run_metrics import get_run_metrics
+
+# Entry-level signals and seniority exclusions for company job titles
+RELEVANT_JOB_MATCHER = KeywordMatcher([
+    'intern', 'internship', 'graduate', 'trainee', 'entry level', 'junior',
+    'fresher', 'associate', 'apprentice', 'campus', 'new grad'
+])
+
+EXCLUDED_JOB_MATCHER = KeywordMatcher([
+    'senior', 'lead', 'manager', 'director', 'head', 'chief', 'principal',
+    'experienced', '5+ years', '3+ years'
+])
 
 class CompanyJobAggregator:
     def __init__(self):
-        self.headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-        }
+        self.headers = HEADER_PROFILES['freshersworld']
         
         # Company-specific job RSS feeds and public APIs
         self.job_sources = [
@@ -34,7 +49,12 @@ class CompanyJobAggregator:
         try:
             print("🔍 Checking Freshersworld RSS for new opportunities...")
             
-            feed = feedparser.parse('https://www.freshersworld.com/jobs/rss')
+            # Fetch through the shared engine so the feed gets a timeout, retries
+            # and Freshersworld's rate limit
+            response = get_engine().submit('https://www.freshersworld.com/jobs/rss',
+                                           profile='freshersworld', timeout=15).result()
+            parse_start = time.perf_counter()
+            feed = feedparser.parse(response.content)
             
             if not feed.entries:
                 print("   No entries found in RSS feed")
@@ -54,14 +74,14 @@ class CompanyJobAggregator:
                     company = self.extract_company_from_description(entry.description if hasattr(entry, 'description') else "")
                     
                     if not company:
-                        company = "Company not specified"
+                        company = NO_COMPANY
                     
                     # Check if it's from a top company
                     if self.is_top_company(company):
                         sector = self.categorize_company(company)
                         
                         job = {
-                            'id': f"freshers_{hash(title + company)}_{datetime.now().strftime('%Y%m%d')}",
+                            'id': make_job_id('freshers', url=getattr(entry, 'link', None), title=title, company=company),
                             'title': title,
                             'company': company,
                             'location': self.extract_location(entry.description if hasattr(entry, 'description') else ""),
@@ -69,6 +89,7 @@ class CompanyJobAggregator:
                             'source': 'Freshersworld RSS',
                             'link': entry.link if hasattr(entry, 'link') else "",
                             'posted_date': entry.published if hasattr(entry, 'published') else 'Recently posted',
+                            'posted_at': to_timestamp(normalize_rss_published(entry)),
                             'description': f"Position at {company} in {sector} sector. Check Freshersworld for detailed requirements."
                         }
                         
@@ -78,6 +99,8 @@ class CompanyJobAggregator:
                     print(f"   ⚠️ Error processing entry: {e}")
                     continue
             
+            get_run_metrics().record_parse('freshersworld', time.perf_counter() - parse_start,
+                                           len(feed.entries[:20]), len(jobs))
             print(f"✅ Freshersworld: Found {len(jobs)} relevant company positions")
             
         except Exception as e:
@@ -92,7 +115,7 @@ class CompanyJobAggregator:
         # Mock data for top companies (this would be replaced with real API calls)
         mock_jobs = [
             {
-                'id': f"company_mock_{datetime.now().strftime('%Y%m%d')}_1",
+                'id': make_job_id('company_mock', title='Software Development Intern', company='Microsoft India'),
                 'title': 'Software Development Intern',
                 'company': 'Microsoft India',
                 'location': 'Hyderabad, India',
@@ -103,7 +126,7 @@ class CompanyJobAggregator:
                 'description': 'Software development internship at Microsoft India. Work on cutting-edge technology with experienced mentors.'
             },
             {
-                'id': f"company_mock_{datetime.now().strftime('%Y%m%d')}_2",
+                'id': make_job_id('company_mock', title='Data Science Graduate Trainee', company='Amazon India'),
                 'title': 'Data Science Graduate Trainee',
                 'company': 'Amazon India',
                 'location': 'Bangalore, India', 
@@ -114,7 +137,7 @@ class CompanyJobAggregator:
                 'description': 'Graduate trainee program in data science at Amazon India. 12-month rotation program.'
             },
             {
-                'id': f"company_mock_{datetime.now().strftime('%Y%m%d')}_3",
+                'id': make_job_id('company_mock', title='Management Trainee Program', company='Tata Motors'),
                 'title': 'Management Trainee Program',
                 'company': 'Tata Motors',
                 'location': 'Pune, India',
@@ -125,7 +148,7 @@ class CompanyJobAggregator:
                 'description': 'Management trainee program at Tata Motors. Exposure to various business functions in automotive industry.'
             },
             {
-                'id': f"company_mock_{datetime.now().strftime('%Y%m%d')}_4",
+                'id': make_job_id('company_mock', title='Finance Graduate Associate', company='HDFC Bank'),
                 'title': 'Finance Graduate Associate',
                 'company': 'HDFC Bank',
                 'location': 'Mumbai, India',
@@ -136,7 +159,7 @@ class CompanyJobAggregator:
                 'description': 'Graduate associate program in finance at HDFC Bank. Training in banking operations and financial services.'
             },
             {
-                'id': f"company_mock_{datetime.now().strftime('%Y%m%d')}_5",
+                'id': make_job_id('company_mock', title='Marketing Intern', company='Unilever India'),
                 'title': 'Marketing Intern',
                 'company': 'Unilever India',
                 'location': 'Mumbai, India',
@@ -147,7 +170,7 @@ class CompanyJobAggregator:
                 'description': 'Marketing internship at Unilever India. Work on brand management and consumer insights projects.'
             },
             {
-                'id': f"company_mock_{datetime.now().strftime('%Y%m%d')}_6",
+                'id': make_job_id('company_mock', title='Engineering Graduate Trainee', company='Larsen & Toubro'),
                 'title': 'Engineering Graduate Trainee',
                 'company': 'Larsen & Toubro',
                 'location': 'Chennai, India',
@@ -225,29 +248,12 @@ class CompanyJobAggregator:
         if not title:
             return False
             
-        title_lower = title.lower()
-        
-        relevant_keywords = [
-            'intern', 'internship', 'graduate', 'trainee', 'entry level', 'junior',
-            'fresher', 'associate', 'apprentice', 'campus', 'new grad'
-        ]
-        
-        exclude_keywords = [
-            'senior', 'lead', 'manager', 'director', 'head', 'chief', 'principal',
-            'experienced', '5+ years', '3+ years'
-        ]
-        
         # Check exclusions first
-        for keyword in exclude_keywords:
-            if keyword in title_lower:
-                return False
+        if EXCLUDED_JOB_MATCHER.search(title):
+            return False
         
         # Check relevant keywords
-        for keyword in relevant_keywords:
-            if keyword in title_lower:
-                return True
-        
-        return False
+        return RELEVANT_JOB_MATCHER.search(title) is not None
 
     def scrape_all_company_opportunities(self):
         """Main method to scrape all company opportunities"""
@@ -13,7 +13,8 @@ SMTP_CONFIG = {
     "host": "smtp.gmail.com",
     "port": 587,
     "user": os.getenv("SMTP_USER", "your-email@gmail.com"),        # Replace with your Gmail
-    "pass": os.getenv("SMTP_PASS", "your-app-password-here")       # Replace with your Gmail app password
+    "pass": os.getenv("SMTP_PASS", "your-app-password-here"),      # Replace with your Gmail app password
+    "starttls": os.getenv("SMTP_STARTTLS", "1") != "0"             # Upgrade to TLS before logging in
 }
 
 # Dynamic Subscriber Management System
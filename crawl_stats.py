@@ -0,0 +1,119 @@
+"""
+Crawl Statistics
+Persisted per-URL yield statistics (new jobs, duplicates, latency, errors)
+and a UCB bandit that uses them to choose which category pages to fetch
+each run, so the request budget goes to the pages that turn up new jobs
+"""
+import json
+import math
+import os
+import threading
+from datetime import datetime
+
+STATS_FILE = os.getenv("CRAWL_STATS_FILE", "crawl_stats.json")
+
+# Category pages fetched per run; the rest wait for a later run
+CRAWL_BUDGET = int(os.getenv("CRAWL_BUDGET", "12"))
+
+# Weight of the exploration bonus against the mean new jobs per fetch
+EXPLORATION = float(os.getenv("CRAWL_EXPLORATION", "2.0"))
+
+# Older observations count for less: every fetch scales a URL's history by this
+DECAY = 0.9
+
+COUNTERS = ('fetches', 'errors', 'listings', 'new', 'duplicates', 'latency')
+
+
+class CrawlStats:
+    def __init__(self, path=STATS_FILE):
+        self.path = path
+        self.urls = {}
+        # The Internshala source thread records fetches while collect records outcomes
+        self._lock = threading.Lock()
+        if os.path.exists(path):
+            with open(path, 'r') as f:
+                self.urls = json.load(f).get('urls', {})
+
+    def _entry(self, url):
+        """url's counters; call with the lock held"""
+        if url not in self.urls:
+            self.urls[url] = {counter: 0.0 for counter in COUNTERS}
+            self.urls[url]['last_fetched'] = None
+        return self.urls[url]
+
+    def record_fetch(self, url, latency=None, listings=0, error=False):
+        """Record one fetch of url: its latency in seconds, listings parsed, or an error"""
+        with self._lock:
+            entry = self._entry(url)
+            for counter in COUNTERS:
+                entry[counter] *= DECAY
+            entry['fetches'] += 1
+            entry['errors'] += 1 if error else 0
+            entry['listings'] += listings
+            entry['latency'] += latency or 0.0
+            entry['last_fetched'] = datetime.now().isoformat()
+
+    def record_outcome(self, url, new):
+        """Record whether a job found on url was new or a duplicate"""
+        if not url:
+            return
+        with self._lock:
+            self._entry(url)['new' if new else 'duplicates'] += 1
+
+    def summary(self, url):
+        """Rates derived from url's counters"""
+        with self._lock:
+            entry = dict(self.urls.get(url) or {counter: 0.0 for counter in COUNTERS})
+        fetches = entry['fetches']
+        found = entry['new'] + entry['duplicates']
+        return {
+            'fetches': fetches,
+            'yield': entry['new'] / fetches if fetches else 0.0,
+            'duplicate_ratio': entry['duplicates'] / found if found else 0.0,
+            'error_rate': entry['errors'] / fetches if fetches else 0.0,
+            'latency': entry['latency'] / fetches if fetches else 0.0,
+            'last_fetched': entry.get('last_fetched'),
+        }
+
+    def score(self, url, total_fetches):
+        """UCB1 score: mean new jobs per fetch plus an exploration bonus.
+
+        URLs never fetched score infinity so each gets tried once.
+        """
+        summary = self.summary(url)
+        if summary['fetches'] <= 0:
+            return float('inf')
+        bonus = EXPLORATION * math.sqrt(2 * math.log(max(total_fetches, 1)) / summary['fetches'])
+        return summary['yield'] + bonus
+
+    def plan(self, urls, budget=None):
+        """Order urls by score and keep the top budget of them"""
+        if budget is None:
+            budget = CRAWL_BUDGET
+        total = sum(self.summary(url)['fetches'] for url in urls)
+        # Ties (e.g. all unexplored) keep the configured order
+        ranked = sorted(urls, key=lambda url: -self.score(url, total))
+        return ranked[:budget]
+
+    def save(self):
+        # Serialized under the lock, so a source thread still recording
+        # can't change the counters mid-dump; written outside it
+        with self._lock:
+            data = json.dumps({'urls': self.urls}, indent=2)
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w') as f:
+            f.write(data)
+        os.replace(tmp_path, self.path)
+
+
+_stats = None
+_stats_lock = threading.Lock()
+
+
+def get_crawl_stats():
+    """Return the crawl statistics shared by the scrapers and collect"""
+    global _stats
+    with _stats_lock:
+        if _stats is None:
+            _stats = CrawlStats()
+        return _stats
@@ -24,7 +24,8 @@ def show_main_menu():
     print("3. 📧 Email Tracking & Reports")
     print("4.  Export Data to Excel")
     print("5. ⚙️  System Status")
-    print("6. 🚪 Exit")
+    print("6. 🕸️  Crawl Statistics")
+    print("7. 🚪 Exit")
     print("="*60)
 
 def show_analytics():
@@ -200,8 +201,9 @@ def show_system_status():
     
     # Check data files
     data_files = [
-        'seen.json', 'unsubscribed_emails.json',
-        'email_tracking.csv', 'internship_data.csv'
+        'seen.json', 'seen.idx', 'batch.json', 'internbot.db', 'crawl_stats.json', 'circuit_state.json',
+        'selector_cache.json', 'parse_cache.json', 'email_quota.json', 'outbox.db', 'unsubscribed_emails.json', 'email_tracking.csv',
+        'internship_data.csv'
     ]
     
     print("\n📊 DATA FILES:")
@@ -214,6 +216,8 @@ def show_system_status():
     
     # Check configuration
     print("\n⚙️  CONFIGURATION:")
+    from storage import STORAGE_BACKEND
+    print(f"   🗄️  Storage backend: {STORAGE_BACKEND}")
     try:
         from config import SMTP_CONFIG, SUBSCRIBERS
         print(f"   ✅ SMTP Config loaded")
@@ -223,13 +227,46 @@ def show_system_status():
     
     print(f"\n🕒 Last updated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
 
+def show_crawl_stats():
+    """Show per-URL crawl yield and the order the next run will fetch in"""
+    from crawl_stats import get_crawl_stats, CRAWL_BUDGET
+    from scraper import INTERNSHALA_URLS
+    
+    print("\n🕸️  CRAWL STATISTICS (Internshala categories)")
+    print("="*40)
+    
+    stats = get_crawl_stats()
+    planned = stats.plan(INTERNSHALA_URLS, budget=len(INTERNSHALA_URLS))
+    total = sum(stats.summary(url)['fetches'] for url in INTERNSHALA_URLS)
+    
+    print(f"{'#':>3} {'category':<28} {'fetches':>7} {'new/fetch':>9} {'dup %':>6} "
+          f"{'err %':>6} {'latency':>8} {'score':>7}")
+    for rank, url in enumerate(planned, 1):
+        summary = stats.summary(url)
+        score = stats.score(url, total)
+        marker = ' ' if rank <= CRAWL_BUDGET else '-'  # '-': outside the next run's budget
+        category = url.rstrip('/').rsplit('/', 1)[-1]
+        print(f"{rank:>3}{marker}{category:<28} {summary['fetches']:>7.1f} {summary['yield']:>9.2f} "
+              f"{summary['duplicate_ratio'] * 100:>5.0f}% {summary['error_rate'] * 100:>5.0f}% "
+              f"{summary['latency']:>7.2f}s {score:>7.2f}")
+    print(f"\n   Budget: {CRAWL_BUDGET} of {len(INTERNSHALA_URLS)} categories per run")
+    
+    from circuit_breaker import get_circuits
+    broken = get_circuits().not_closed()
+    if broken:
+        print("\n⛔ Circuit breakers not closed:")
+        for breaker in broken:
+            print(f"   {breaker.name}: {breaker.describe()}")
+    else:
+        print("\n✅ All circuit breakers closed")
+
 def main():
     """Main dashboard loop"""
     print("🚀 Starting InternBot Management Dashboard...")
     
     while True:
         show_main_menu()
-        choice = input("\nEnter your choice (1-6): ").strip()
+        choice = input("\nEnter your choice (1-7): ").strip()
         
         if choice == "1":
             show_analytics()
@@ -250,11 +287,14 @@ def main():
             show_system_status()
         
         elif choice == "6":
+            show_crawl_stats()
+        
+        elif choice == "7":
             print("👋 Goodbye! Thank you for using InternBot Dashboard.")
             break
         
         else:
-            print("❌ Invalid choice. Please enter 1-6.")
+            print("❌ Invalid choice. Please enter 1-7.")
         
         input("\nPress Enter to continue...")
 
@@ -0,0 +1,191 @@
+"""
+Date Normalization
+Turns the free-text dates scraped from listings ("3 days ago", "Apply by
+15 Jan", RSS published values) into absolute UTC timestamps, using
+patterns compiled once at import
+"""
+import re
+import calendar
+from datetime import datetime, timedelta, timezone
+from email.utils import parsedate_to_datetime
+
+MONTHS = {name.lower(): index for index, name in enumerate(calendar.month_abbr) if name}
+
+# Month names, abbreviated or in full, but not words like "marketing"
+_MONTH = (r"(jan(?:uary)?|feb(?:ruary)?|mar(?:ch)?|apr(?:il)?|may|june?|july?|aug(?:ust)?"
+          r"|sep(?:t(?:ember)?)?|oct(?:ober)?|nov(?:ember)?|dec(?:ember)?)\b\.?")
+
+# "3 days ago", "an hour ago", "2 weeks ago", "30+ days ago"
+RELATIVE_RE = re.compile(
+    r'\b(\d+|an?|one|few)\+?\s*(minute|min|hour|hr|day|week|month|year)s?\s+ago\b',
+    re.IGNORECASE
+)
+TODAY_RE = re.compile(r'\b(just now|today|moments ago)\b', re.IGNORECASE)
+YESTERDAY_RE = re.compile(r'\byesterday\b', re.IGNORECASE)
+
+# "15 Jan", "15th Jan' 26", "15 January 2026"
+DAY_MONTH_RE = re.compile(
+    r"\b(\d{1,2})(?:st|nd|rd|th)?\s*[-\s]?\s*" + _MONTH + r"(?:\s*[',]?\s*(\d{4}|\d{2})\b)?",
+    re.IGNORECASE
+)
+# "Jan 15", "January 15, 2026"
+MONTH_DAY_RE = re.compile(
+    r"\b" + _MONTH + r"\s+(\d{1,2})(?:st|nd|rd|th)?(?:\s*,?\s*(\d{4}))?\b",
+    re.IGNORECASE
+)
+# "2026-01-15" (ISO, as in <time datetime="...">)
+ISO_DATE_RE = re.compile(r'\b(\d{4})-(\d{2})-(\d{2})\b')
+# "15/01/2026", "15-01-26", "15/01" (day first, as on Indian job boards)
+NUMERIC_DATE_RE = re.compile(r'\b(\d{1,2})[/-](\d{1,2})(?:[/-](\d{4}|\d{2}))?\b')
+
+# A yearless deadline up to this many days in the past is read as already
+# expired rather than as next year's date
+DEADLINE_LOOKBACK_DAYS = 90
+
+UNIT_DAYS = {
+    'minute': 1 / 1440, 'min': 1 / 1440,
+    'hour': 1 / 24, 'hr': 1 / 24,
+    'day': 1, 'week': 7, 'month': 30, 'year': 365,
+}
+
+
+def utc_now():
+    return datetime.now(timezone.utc)
+
+
+def to_timestamp(dt):
+    """Serialize a datetime as an ISO 8601 UTC string, or None"""
+    if dt is None:
+        return None
+    return dt.astimezone(timezone.utc).isoformat(timespec='seconds')
+
+
+def parse_timestamp(value):
+    """Parse a timestamp written by to_timestamp back into a datetime, or None"""
+    if not value:
+        return None
+    try:
+        dt = datetime.fromisoformat(value)
+    except (TypeError, ValueError):
+        return None
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt
+
+
+def parse_relative(text, now=None):
+    """Resolve "N units ago" style text against now"""
+    if not text:
+        return None
+    now = now or utc_now()
+
+    match = RELATIVE_RE.search(text)
+    if match:
+        amount = match.group(1).lower()
+        if amount in ('a', 'an', 'one'):
+            number = 1
+        elif amount == 'few':
+            number = 3
+        else:
+            number = int(amount)
+        return now - timedelta(days=number * UNIT_DAYS[match.group(2).lower()])
+
+    if TODAY_RE.search(text):
+        return now
+    if YESTERDAY_RE.search(text):
+        return now - timedelta(days=1)
+    return None
+
+
+def _resolve_year(day, month, year, now, prefer_future):
+    """Build a date, guessing the year when the listing leaves it out"""
+    if year is not None:
+        year = int(year)
+        if year < 100:
+            year += 2000
+        candidates = [year]
+    elif prefer_future:
+        candidates = [now.year, now.year + 1]
+    else:
+        candidates = [now.year, now.year - 1]
+
+    for candidate in candidates:
+        try:
+            dt = datetime(candidate, month, day, tzinfo=timezone.utc)
+        except ValueError:
+            continue
+        if year is not None:
+            return dt
+        # Without a year, a deadline is the next such date and a posting the last one
+        if prefer_future and dt >= now - timedelta(days=DEADLINE_LOOKBACK_DAYS):
+            return dt
+        if not prefer_future and dt <= now + timedelta(days=1):
+            return dt
+    return None
+
+
+def parse_absolute(text, now=None, prefer_future=False):
+    """Parse a calendar date out of text"""
+    if not text:
+        return None
+    now = now or utc_now()
+
+    match = ISO_DATE_RE.search(text)
+    if match:
+        try:
+            return datetime(int(match.group(1)), int(match.group(2)), int(match.group(3)), tzinfo=timezone.utc)
+        except ValueError:
+            pass
+
+    match = DAY_MONTH_RE.search(text)
+    if match:
+        return _resolve_year(int(match.group(1)), MONTHS[match.group(2)[:3].lower()],
+                             match.group(3), now, prefer_future)
+
+    match = MONTH_DAY_RE.search(text)
+    if match:
+        return _resolve_year(int(match.group(2)), MONTHS[match.group(1)[:3].lower()],
+                             match.group(3), now, prefer_future)
+
+    match = NUMERIC_DATE_RE.search(text)
+    if match and 1 <= int(match.group(2)) <= 12:
+        return _resolve_year(int(match.group(1)), int(match.group(2)),
+                             match.group(3), now, prefer_future)
+    return None
+
+
+def normalize_posted(text, now=None):
+    """Absolute UTC time a listing was posted, from its posted_date text"""
+    return parse_relative(text, now) or parse_absolute(text, now, prefer_future=False)
+
+
+def normalize_deadline(text, now=None):
+    """Absolute UTC application deadline, from its deadline text"""
+    return parse_absolute(text, now, prefer_future=True)
+
+
+def normalize_rss_published(entry):
+    """Absolute UTC publish time of a feedparser entry"""
+    parsed = getattr(entry, 'published_parsed', None)
+    if parsed:
+        return datetime(*parsed[:6], tzinfo=timezone.utc)
+
+    published = getattr(entry, 'published', None)
+    if published:
+        try:
+            dt = parsedate_to_datetime(published)
+        except (TypeError, ValueError):
+            return normalize_posted(published)
+        if dt.tzinfo is None:
+            dt = dt.replace(tzinfo=timezone.utc)
+        return dt.astimezone(timezone.utc)
+    return None
+
+
+def add_timestamps(job, now=None):
+    """Set posted_at/deadline_at on a job from its posted_date/deadline text"""
+    if not job.get('posted_at'):
+        job['posted_at'] = to_timestamp(normalize_posted(job.get('posted_date'), now))
+    if not job.get('deadline_at'):
+        job['deadline_at'] = to_timestamp(normalize_deadline(job.get('deadline'), now))
+    return job
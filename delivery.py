@@ -0,0 +1,226 @@
+"""
+Email Delivery Engine
+Sends one digest to many recipients from DELIVERY_WORKERS threads, each
+with its own SMTP session. A shared token bucket keeps the whole engine
+under EMAIL_SEND_RATE messages per second and a persisted counter under
+EMAIL_DAILY_LIMIT per day, inside Gmail's sending quotas. A temporary
+refusal (421, 450, 451, 452) halves the send rate, pauses every worker and puts
+the recipient back for a later attempt; each success wins some rate back
+"""
+import json
+import os
+import queue
+import smtplib
+import threading
+import time
+from collections import namedtuple
+from datetime import date
+
+from rate_limiter import TokenBucket
+from retry import backoff_delay
+from smtp_pool import SMTPConnection
+
+DELIVERY_WORKERS = int(os.getenv("DELIVERY_WORKERS", "4"))
+
+# Messages per second across all workers, and per calendar day
+SEND_RATE = float(os.getenv("EMAIL_SEND_RATE", "2"))
+DAILY_LIMIT = int(os.getenv("EMAIL_DAILY_LIMIT", "500"))
+QUOTA_FILE = os.getenv("EMAIL_QUOTA_FILE", "email_quota.json")
+
+# Sends tried per recipient before it counts as failed
+MAX_ATTEMPTS = int(os.getenv("EMAIL_MAX_ATTEMPTS", "3"))
+
+# Server replies meaning "slow down, try again later"
+TEMPORARY_CODES = {421, 450, 451, 452}
+
+# The adaptive rate never drops below this fraction of SEND_RATE
+MIN_RATE_FRACTION = 0.1
+
+# Pause after a temporary refusal and wait before a retry, in seconds
+BACKOFF_BASE = 1.0
+BACKOFF_MAX = 60.0
+
+SENT = 'sent'
+FAILED = 'failed'
+DEFERRED = 'deferred'  # not attempted: the daily limit was reached
+
+# refused: the server rejected this recipient outright, so resending won't help
+DeliveryResult = namedtuple('DeliveryResult', ['recipient', 'status', 'attempts', 'error', 'refused'],
+                            defaults=(False,))
+
+
+def smtp_code(error):
+    """The SMTP reply code behind an smtplib error, or None"""
+    if isinstance(error, smtplib.SMTPRecipientsRefused):
+        codes = [code for code, _ in error.recipients.values()]
+        return codes[0] if codes else None
+    return getattr(error, 'smtp_code', None)
+
+
+def is_temporary(error):
+    """Whether a failed send is worth retrying later"""
+    code = smtp_code(error)
+    if code is not None:
+        return code in TEMPORARY_CODES
+    # Dropped or unreachable server, as opposed to a refusal
+    return isinstance(error, (smtplib.SMTPServerDisconnected, OSError))
+
+
+def is_refusal(error):
+    """Whether the server permanently rejected the recipient (5xx on RCPT)"""
+    code = smtp_code(error)
+    return isinstance(error, smtplib.SMTPRecipientsRefused) and code is not None and code >= 500
+
+
+class DailyQuota:
+    """Messages sent today, persisted so separate runs share the limit"""
+
+    def __init__(self, limit=DAILY_LIMIT, path=QUOTA_FILE):
+        self.limit = limit
+        self.path = path
+        self.day = date.today().isoformat()
+        self.sent = 0
+        self._lock = threading.Lock()
+        if path and os.path.exists(path):
+            with open(path, 'r') as f:
+                data = json.load(f)
+            if data.get('date') == self.day:
+                self.sent = data.get('sent', 0)
+
+    def take(self):
+        """Count one message against today's limit; False once it is used up"""
+        with self._lock:
+            today = date.today().isoformat()
+            if today != self.day:
+                self.day, self.sent = today, 0
+            if self.sent >= self.limit:
+                return False
+            self.sent += 1
+            return True
+
+    @property
+    def remaining(self):
+        return max(0, self.limit - self.sent)
+
+    def save(self):
+        if not self.path:
+            return
+        with self._lock:
+            data = {'date': self.day, 'sent': self.sent}
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(data, f)
+        os.replace(tmp_path, self.path)
+
+
+class DeliveryEngine:
+    def __init__(self, smtp_cfg, workers=DELIVERY_WORKERS, rate=SEND_RATE, quota=None,
+                 max_attempts=MAX_ATTEMPTS, connection_factory=SMTPConnection):
+        self.smtp_cfg = smtp_cfg
+        self.workers = max(1, workers)
+        self.max_rate = rate
+        self.rate = rate
+        self.quota = quota or DailyQuota()
+        self.max_attempts = max_attempts
+        self.connection_factory = connection_factory
+        self.limiter = TokenBucket(rate, burst=self.workers)
+        self._lock = threading.Lock()
+        self._paused_until = 0.0
+        self._backoffs = 0
+
+    def _slow_down(self):
+        """Halve the rate and pause every worker after a temporary refusal"""
+        with self._lock:
+            self.rate = max(self.max_rate * MIN_RATE_FRACTION, self.rate / 2)
+            self.limiter.set_rate(self.rate)
+            delay = backoff_delay(self._backoffs, base=BACKOFF_BASE, cap=BACKOFF_MAX)
+            self._backoffs += 1
+            self._paused_until = max(self._paused_until, time.monotonic() + delay)
+        print(f"🐢 Server asked to slow down: {self.rate:.2f} emails/s, pausing {delay:.1f}s")
+
+    def _speed_up(self):
+        with self._lock:
+            self._backoffs = 0
+            if self.rate < self.max_rate:
+                self.rate = min(self.max_rate, self.rate + self.max_rate * MIN_RATE_FRACTION)
+                self.limiter.set_rate(self.rate)
+
+    def _wait_turn(self):
+        while True:
+            with self._lock:
+                pause = self._paused_until - time.monotonic()
+            if pause <= 0:
+                break
+            time.sleep(pause)
+        self.limiter.acquire()
+
+    def deliver(self, recipients, make_message, on_result=None):
+        """Send make_message(recipient) to every recipient; returns {recipient: DeliveryResult}.
+
+        on_result(result) is called once per recipient as its outcome is
+        final, one call at a time.
+        """
+        recipients = list(dict.fromkeys(r.strip() for r in recipients if r and r.strip()))
+        results = {}
+        todo = queue.Queue()
+        for recipient in recipients:
+            todo.put((recipient, 1, 0.0))
+        total = len(recipients)
+        finish_lock = threading.Lock()
+        report_every = max(1, total // 10)
+        start = time.monotonic()
+
+        def finish(result):
+            with self._lock:
+                results[result.recipient] = result
+                done = len(results)
+            if on_result:
+                with finish_lock:
+                    on_result(result)
+            if done % report_every == 0 or done == total:
+                sent = sum(1 for r in list(results.values()) if r.status == SENT)
+                print(f"📤 {done}/{total} done: {sent} sent, {done - sent} not sent "
+                      f"({done / max(time.monotonic() - start, 1e-9):.1f}/s)")
+
+        def work():
+            with self.connection_factory(self.smtp_cfg) as smtp:
+                while True:
+                    try:
+                        recipient, attempt, not_before = todo.get_nowait()
+                    except queue.Empty:
+                        if len(results) >= total:
+                            return
+                        time.sleep(0.05)  # a retry may still be put back
+                        continue
+                    if time.monotonic() < not_before:
+                        todo.put((recipient, attempt, not_before))
+                        time.sleep(0.05)
+                        continue
+                    # Every attempt counts: the provider's quota sees retries too
+                    if not self.quota.take():
+                        finish(DeliveryResult(recipient, DEFERRED, attempt - 1, "daily limit reached"))
+                        continue
+                    self._wait_turn()
+                    try:
+                        smtp.send(make_message(recipient))
+                    except Exception as e:
+                        temporary = is_temporary(e)
+                        if temporary and smtp_code(e) is not None:
+                            self._slow_down()
+                        if temporary and attempt < self.max_attempts:
+                            retry_at = time.monotonic() + backoff_delay(attempt, base=BACKOFF_BASE, cap=BACKOFF_MAX)
+                            todo.put((recipient, attempt + 1, retry_at))
+                        else:
+                            finish(DeliveryResult(recipient, FAILED, attempt, str(e), is_refusal(e)))
+                        continue
+                    self._speed_up()
+                    finish(DeliveryResult(recipient, SENT, attempt, None))
+
+        threads = [threading.Thread(target=work, name=f"delivery-{i}", daemon=True)
+                   for i in range(min(self.workers, total))]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.quota.save()
+        return results
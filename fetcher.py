@@ -0,0 +1,129 @@
+"""
+Concurrent Fetch Engine
+Runs HTTP fetches for all scrapers on one shared thread pool, with a global
+worker cap and, per host, a concurrency limit and a token-bucket request
+rate taken from the source registry. Hosts whose circuit breaker is open
+are refused without a request
+"""
+import os
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+import http_fixtures
+from circuit_breaker import CircuitOpenError, get_circuits, is_failed_response
+from http_cache import served_without_request
+from http_client import http_get
+from rate_limiter import HostRateLimiter
+from sources import host_rate, source_for_host
+
+# Global cap on simultaneous fetches across every source
+MAX_WORKERS = int(os.getenv("SCRAPER_MAX_WORKERS", "16"))
+
+# Cap on simultaneous fetches against a host whose source doesn't set one
+PER_HOST_LIMIT = int(os.getenv("SCRAPER_PER_HOST_LIMIT", "4"))
+
+
+def host_of(url):
+    """Return the lowercased host name of a URL"""
+    return urlsplit(url).netloc.lower()
+
+
+def _fetch_succeeded(future):
+    """Whether a finished fetch counts as a success for its host's circuit,
+    or None when it never reached the host (a cache TTL hit)"""
+    if future.exception() is not None:
+        return False
+    response = future.result()
+    if served_without_request(response):
+        return None
+    return not is_failed_response(response)
+
+
+def _record_fetch(breaker, future):
+    succeeded = _fetch_succeeded(future)
+    if succeeded is None:
+        breaker.release()
+    else:
+        breaker.record(succeeded)
+
+
+class FetchEngine:
+    def __init__(self, max_workers=MAX_WORKERS, per_host_limit=PER_HOST_LIMIT, host_limits=None,
+                 rate_policy=host_rate, circuits=None):
+        self.max_workers = max_workers
+        self.circuits = circuits
+        self.per_host_limit = per_host_limit
+        self.host_limits = dict(host_limits or {})
+        self.rate_limiter = HostRateLimiter(rate_policy or (lambda host: None))
+        self._executor = None
+        self._semaphores = {}
+        self._lock = threading.Lock()
+
+    def _get_executor(self):
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers,
+                                                    thread_name_prefix="fetch")
+            return self._executor
+
+    def _host_semaphore(self, host):
+        with self._lock:
+            if host not in self._semaphores:
+                source = source_for_host(host)
+                limit = (self.host_limits.get(host) or (source and source.concurrency) or
+                         self.per_host_limit)
+                self._semaphores[host] = threading.BoundedSemaphore(limit)
+            return self._semaphores[host]
+
+    def submit(self, url, fetch_fn=None, **kwargs):
+        """Schedule a fetch of url and return a future for its response.
+
+        The host slot and rate token are acquired by the submitting thread,
+        so callers that target a busy or rate-limited host wait here instead
+        of tying up a pool worker, and other hosts are unaffected.
+        """
+        fetch_fn = fetch_fn or http_get
+        host = host_of(url)
+        breaker = self.circuits.host(host) if self.circuits else None
+        if breaker and not breaker.allow():
+            refused = Future()
+            refused.set_exception(CircuitOpenError(f"Circuit open for {host}, not fetching {url}"))
+            return refused
+
+        semaphore = self._host_semaphore(host)
+        semaphore.acquire()
+        try:
+            self.rate_limiter.acquire(host)
+            future = self._get_executor().submit(fetch_fn, url, **kwargs)
+        except Exception:
+            semaphore.release()
+            if breaker:
+                breaker.record(False)
+            raise
+        future.add_done_callback(lambda _: semaphore.release())
+        if breaker:
+            future.add_done_callback(lambda done: _record_fetch(breaker, done))
+        return future
+
+    def shutdown(self):
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=True)
+                self._executor = None
+
+
+_engine = None
+_engine_lock = threading.Lock()
+
+
+def get_engine():
+    """Return the process-wide fetch engine shared by all scrapers"""
+    global _engine
+    with _engine_lock:
+        if _engine is None:
+            # Replayed responses come from disk, so there is no site to pace
+            replaying = http_fixtures.FIXTURES_MODE == 'replay'
+            _engine = FetchEngine(rate_policy=None if replaying else host_rate,
+                                  circuits=None if replaying else get_circuits())
+        return _engine
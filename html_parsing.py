@@ -0,0 +1,83 @@
+"""
+HTML Parsing Layer
+Builds only the listing subtrees of a results page instead of the whole DOM,
+parsing straight from response bytes. Uses lxml when it is installed and
+falls back to Python's html.parser otherwise
+"""
+import os
+
+from bs4 import BeautifulSoup, SoupStrainer
+
+try:
+    import lxml  # noqa: F401
+    DEFAULT_PARSER = 'lxml'
+except ImportError:
+    DEFAULT_PARSER = 'html.parser'
+
+# Override with HTML_PARSER=html.parser to force the pure-Python parser
+HTML_PARSER = os.getenv("HTML_PARSER", DEFAULT_PARSER)
+
+# Classes of the elements that contain a source's listing cards. Only these
+# subtrees are built; everything else on the page is skipped while parsing.
+LISTING_CLASSES = {
+    'internshala': ['individual_internship'],
+    'linkedin': ['job-search-card', 'jobs-search__results-list', 'job-card-container', 'job-card'],
+    'timesjobs': ['srp-jobtitle-wrap', 'job-bx', 'joblist-comp-name'],
+}
+
+
+def _has_any_class(classes):
+    """Strainer filter for a class attribute containing any of classes.
+
+    While parsing, the strainer sees the raw attribute string
+    ("container-fluid individual_internship"), not the split list.
+    """
+    wanted = set(classes)
+
+    def matches(value):
+        if not value:
+            return False
+        names = value.split() if isinstance(value, str) else value
+        return not wanted.isdisjoint(names)
+
+    return matches
+
+
+_STRAINERS = {
+    source: SoupStrainer(attrs={'class': _has_any_class(classes)})
+    for source, classes in LISTING_CLASSES.items()
+}
+
+
+class ParsedPage(list):
+    """The jobs parsed from a page, plus found: how many listing cards the page
+    had before the relevance filter. A page with cards but no relevant jobs
+    is healthy; one without any cards looks like a block or a layout change
+    """
+
+    def __init__(self, jobs=(), found=None):
+        super().__init__(jobs)
+        self.found = len(self) if found is None else found
+
+
+def parse_document(content, parser=None):
+    """Parse a whole page (bytes or str) into a soup"""
+    return BeautifulSoup(content, parser or HTML_PARSER)
+
+
+def parse_listings(content, source, parser=None, fallback=False):
+    """Parse only the listing subtrees of a page for source.
+
+    content can be raw response bytes, which lets the parser sniff the
+    encoding itself instead of decoding via response.text first. With
+    fallback=True a page where nothing matched the strainer is parsed in
+    full, for selectors that can't be expressed as a class filter.
+    """
+    strainer = _STRAINERS.get(source)
+    if strainer is None:
+        return parse_document(content, parser)
+
+    soup = BeautifulSoup(content, parser or HTML_PARSER, parse_only=strainer)
+    if fallback and soup.find(True) is None:
+        return parse_document(content, parser)
+    return soup
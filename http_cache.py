@@ -0,0 +1,208 @@
+"""
+HTTP Response Cache
+Persistent on-disk cache of listing pages and feeds keyed by URL. Stores
+ETag/Last-Modified validators so unchanged pages come back as a cheap 304
+"""
+import hashlib
+import json
+import os
+import threading
+import time
+
+CACHE_DIR = os.getenv("HTTP_CACHE_DIR", ".http_cache")
+CACHE_MAX_BYTES = int(float(os.getenv("HTTP_CACHE_MAX_MB", "50")) * 1024 * 1024)
+CACHE_ENABLED = os.getenv("HTTP_CACHE_ENABLED", "1") != "0"
+
+# Seconds a cached page is trusted without asking the server again, per
+# header profile. 0 means always revalidate with a conditional GET.
+CACHE_TTLS = {
+    'default': 0,
+    'internshala': 30 * 60,
+    'linkedin': 60 * 60,
+    'timesjobs': 60 * 60,
+    'freshersworld': 30 * 60,
+}
+
+INDEX_FILE = 'index.json'
+
+
+class CachedResponse:
+    """Minimal stand-in for requests.Response served from the cache.
+
+    not_modified is True when the server confirmed (or the TTL implies) the
+    page is unchanged since it was cached. The cached body is still served
+    and should still be parsed: a page fetched on an earlier run may never
+    have been processed, and the seen set drops the listings that were.
+    revalidated is True when the server answered a conditional GET with 304,
+    and False for a TTL hit that never reached the server.
+    """
+
+    def __init__(self, url, body_path, headers, not_modified=True, revalidated=False):
+        self.url = url
+        self.status_code = 200
+        self.headers = headers
+        self.from_cache = True
+        self.not_modified = not_modified
+        self.revalidated = revalidated
+        self._body_path = body_path
+        self._content = None
+
+    @property
+    def content(self):
+        if self._content is None:
+            with open(self._body_path, 'rb') as f:
+                self._content = f.read()
+        return self._content
+
+    @property
+    def text(self):
+        encoding = 'utf-8'
+        content_type = self.headers.get('Content-Type', '')
+        if 'charset=' in content_type:
+            encoding = content_type.split('charset=')[-1].split(';')[0].strip()
+        return self.content.decode(encoding, errors='replace')
+
+    def close(self):
+        pass
+
+
+def served_without_request(response):
+    """Whether response came from the cache on a TTL hit, without asking the server"""
+    return getattr(response, 'from_cache', False) and not getattr(response, 'revalidated', False)
+
+
+class HttpCache:
+    def __init__(self, cache_dir=CACHE_DIR, max_bytes=CACHE_MAX_BYTES, ttls=None):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.ttls = dict(CACHE_TTLS if ttls is None else ttls)
+        self._lock = threading.Lock()
+        self._index = self._load_index()
+        # Hits only touch timestamps, which save() writes once per run
+        self._dirty = False
+
+    def _index_path(self):
+        return os.path.join(self.cache_dir, INDEX_FILE)
+
+    def _body_path(self, key):
+        return os.path.join(self.cache_dir, key + '.body')
+
+    def _load_index(self):
+        try:
+            with open(self._index_path(), 'r') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _save_index(self):
+        """Write the index; call with the lock held"""
+        os.makedirs(self.cache_dir, exist_ok=True)
+        tmp_path = self._index_path() + '.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(self._index, f)
+        os.replace(tmp_path, self._index_path())
+        self._dirty = False
+
+    def save(self):
+        """Write the index if hits changed it since it was last written"""
+        with self._lock:
+            if self._dirty:
+                self._save_index()
+
+    def lookup(self, url):
+        """Return the cache entry for url, or None if it is missing on disk"""
+        with self._lock:
+            entry = self._index.get(url)
+            if entry and not os.path.exists(self._body_path(entry['key'])):
+                del self._index[url]
+                self._dirty = True
+                return None
+            return dict(entry) if entry else None
+
+    def ttl_for(self, profile):
+        return self.ttls.get(profile, self.ttls.get('default', 0))
+
+    def is_fresh(self, entry, profile='default'):
+        ttl = self.ttl_for(profile)
+        return ttl > 0 and time.time() - entry['validated_at'] < ttl
+
+    def conditional_headers(self, entry):
+        headers = {}
+        if entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    def hit(self, url, revalidated=False):
+        """Record a cache hit and return the cached response (None if evicted meanwhile)"""
+        with self._lock:
+            entry = self._index.get(url)
+            if entry is None:
+                return None
+            now = time.time()
+            entry['last_used'] = now
+            if revalidated:
+                entry['validated_at'] = now
+            self._dirty = True
+            return CachedResponse(url, self._body_path(entry['key']), entry['headers'],
+                                  revalidated=revalidated)
+
+    def store(self, url, response, profile='default'):
+        """Cache a 200 response if it can be revalidated or has a TTL"""
+        etag = response.headers.get('ETag')
+        last_modified = response.headers.get('Last-Modified')
+        if not (etag or last_modified or self.ttl_for(profile) > 0):
+            return
+
+        key = hashlib.sha1(url.encode('utf-8')).hexdigest()
+        body = response.content
+        with self._lock:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            tmp_path = self._body_path(key) + '.tmp'
+            with open(tmp_path, 'wb') as f:
+                f.write(body)
+            os.replace(tmp_path, self._body_path(key))
+
+            now = time.time()
+            self._index[url] = {
+                'key': key,
+                'etag': etag,
+                'last_modified': last_modified,
+                'headers': {'Content-Type': response.headers.get('Content-Type', '')},
+                'size': len(body),
+                'validated_at': now,
+                'last_used': now,
+            }
+            self._evict()
+            self._save_index()
+
+    def _evict(self):
+        """Drop least recently used entries until the cache fits max_bytes"""
+        total = sum(entry['size'] for entry in self._index.values())
+        if total <= self.max_bytes:
+            return
+        for url, entry in sorted(self._index.items(), key=lambda item: item[1]['last_used']):
+            try:
+                os.remove(self._body_path(entry['key']))
+            except OSError:
+                pass
+            del self._index[url]
+            total -= entry['size']
+            if total <= self.max_bytes:
+                break
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_cache():
+    """Return the shared response cache, or None when caching is disabled"""
+    global _cache
+    if not CACHE_ENABLED:
+        return None
+    with _cache_lock:
+        if _cache is None:
+            _cache = HttpCache()
+        return _cache
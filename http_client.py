@@ -0,0 +1,253 @@
+"""
+Shared HTTP Client
+One pooled requests session for every scraper, with per-source header
+profiles, configurable timeouts and retries with exponential backoff
+"""
+import os
+import socket
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from datetime import datetime, timezone
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.util import connection as urllib3_connection
+
+import http_fixtures
+import run_metrics
+from http_cache import get_cache
+from retry import backoff_delay
+
+DEFAULT_TIMEOUT = float(os.getenv("HTTP_TIMEOUT", "15"))
+MAX_RETRIES = int(os.getenv("HTTP_MAX_RETRIES", "3"))
+BACKOFF_BASE = float(os.getenv("HTTP_BACKOFF_BASE", "0.5"))   # seconds
+BACKOFF_MAX = float(os.getenv("HTTP_BACKOFF_MAX", "30"))      # seconds
+
+# Keep-alive connections kept per host, and number of hosts with a pool
+POOL_MAXSIZE = int(os.getenv("HTTP_POOL_MAXSIZE", "8"))
+POOL_CONNECTIONS = int(os.getenv("HTTP_POOL_CONNECTIONS", "10"))
+
+# Transient statuses worth retrying
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+_BROWSER_ACCEPT = 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8'
+
+# Request headers used by each source
+HEADER_PROFILES = {
+    'default': {
+        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+        'Accept': _BROWSER_ACCEPT,
+        'Accept-Language': 'en-US,en;q=0.5'
+    },
+    'internshala': {
+        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+    },
+    'linkedin': {
+        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+        'Accept': _BROWSER_ACCEPT,
+        'Accept-Language': 'en-US,en;q=0.5',
+        'Accept-Encoding': 'gzip, deflate, br'
+    },
+    'timesjobs': {
+        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+        'Accept': _BROWSER_ACCEPT,
+        'Accept-Language': 'en-US,en;q=0.5'
+    },
+    'freshersworld': {
+        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
+        'Accept': 'application/rss+xml,application/xml;q=0.9,*/*;q=0.8'
+    },
+}
+
+
+def parse_retry_after(value):
+    """Convert a Retry-After header (seconds or HTTP date) to seconds, or None"""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+class _TimedResolver:
+    """Stands in for the socket module inside urllib3.util.connection, so the
+    lookup create_connection makes is added to the fetch on this thread"""
+
+    def __getattr__(self, name):
+        return getattr(socket, name)
+
+    def getaddrinfo(self, *args, **kwargs):
+        timing = run_metrics.current_fetch()
+        if timing is None:
+            return socket.getaddrinfo(*args, **kwargs)
+        start = time.perf_counter()
+        try:
+            return socket.getaddrinfo(*args, **kwargs)
+        finally:
+            timing.dns += time.perf_counter() - start
+
+
+# Every urllib3 connection resolves through here; untimed calls pass straight through
+urllib3_connection.socket = _TimedResolver()
+
+
+class TimedConnectionMixin:
+    """Adds the connect time of new connections to the fetch on this thread"""
+
+    def connect(self):
+        timing = run_metrics.current_fetch()
+        if timing is None:
+            return super().connect()
+        dns_before = timing.dns
+        start = time.perf_counter()
+        try:
+            super().connect()
+        finally:
+            # TCP plus, for HTTPS, the TLS handshake; the DNS lookup inside it
+            # is counted by _TimedResolver
+            timing.connect += time.perf_counter() - start - (timing.dns - dns_before)
+
+
+class TimedHTTPConnection(TimedConnectionMixin, HTTPConnection):
+    pass
+
+
+class TimedHTTPSConnection(TimedConnectionMixin, HTTPSConnection):
+    pass
+
+
+class TimedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = TimedHTTPConnection
+
+
+class TimedHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = TimedHTTPSConnection
+
+
+class TimedAdapter(HTTPAdapter):
+    """HTTPAdapter whose connections report DNS and connect timings"""
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            'http': TimedHTTPConnectionPool,
+            'https': TimedHTTPSConnectionPool,
+        }
+
+
+class HttpClient:
+    def __init__(self, timeout=DEFAULT_TIMEOUT, max_retries=MAX_RETRIES,
+                 pool_connections=POOL_CONNECTIONS, pool_maxsize=POOL_MAXSIZE):
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.session = requests.Session()
+
+        # Retries are handled in get() so Retry-After and jitter apply uniformly
+        adapter = TimedAdapter(pool_connections=pool_connections,
+                              pool_maxsize=pool_maxsize, max_retries=0)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+
+        # With HTTP_FIXTURES set, responses are recorded to or replayed from disk
+        self.fixtures = http_fixtures.install(self.session, pool_connections=pool_connections,
+                                              pool_maxsize=pool_maxsize, max_retries=0)
+
+    def get(self, url, profile='default', timeout=None, headers=None, use_cache=True, **kwargs):
+        """GET url with the source's header profile, retrying transient failures.
+
+        With the response cache enabled, a page within its profile's TTL or
+        answered with 304 comes back as a CachedResponse with the cached body
+        and not_modified set.
+        The fetch's timings are recorded on the current run's metrics.
+        """
+        with run_metrics.timed_fetch(url, profile) as timing:
+            response = self._get(url, profile, timeout, headers, use_cache, **kwargs)
+            if getattr(response, 'from_cache', False):
+                timing.cached = True
+                timing.status = response.status_code
+            return response
+
+    def _get(self, url, profile, timeout, headers, use_cache, **kwargs):
+        request_headers = dict(HEADER_PROFILES.get(profile, HEADER_PROFILES['default']))
+        if headers:
+            request_headers.update(headers)
+        timeout = timeout or self.timeout
+
+        # Fixtures need every request to reach the transport
+        cache = get_cache() if use_cache and self.fixtures is None else None
+        entry = cache.lookup(url) if cache else None
+        if entry:
+            if cache.is_fresh(entry, profile):
+                cached = cache.hit(url)
+                if cached:
+                    return cached
+            request_headers.update(cache.conditional_headers(entry))
+
+        response = self._get_with_retries(url, request_headers, timeout, **kwargs)
+
+        if cache:
+            if response.status_code == 304 and entry:
+                cached = cache.hit(url, revalidated=True)
+                if cached:
+                    response.close()
+                    return cached
+            elif response.status_code == 200:
+                cache.store(url, response, profile)
+        return response
+
+    def _get_with_retries(self, url, request_headers, timeout, **kwargs):
+        attempt = 0
+        while True:
+            timing = run_metrics.current_fetch()
+            if timing:
+                timing.begin_attempt()
+            try:
+                response = self.session.get(url, headers=request_headers, timeout=timeout, **kwargs)
+            except (requests.ConnectionError, requests.Timeout):
+                if attempt >= self.max_retries:
+                    raise
+                time.sleep(backoff_delay(attempt, base=BACKOFF_BASE, cap=BACKOFF_MAX))
+                attempt += 1
+                continue
+            if timing:
+                timing.end_attempt(response)
+
+            if response.status_code in RETRY_STATUSES and attempt < self.max_retries:
+                retry_after = parse_retry_after(response.headers.get('Retry-After'))
+                response.close()
+                time.sleep(backoff_delay(attempt, retry_after, BACKOFF_BASE, BACKOFF_MAX))
+                attempt += 1
+                continue
+
+            return response
+
+    def close(self):
+        self.session.close()
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_client():
+    """Return the process-wide HTTP client shared by all scrapers"""
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = HttpClient()
+        return _client
+
+
+def http_get(url, profile='default', **kwargs):
+    """GET through the shared client"""
+    return get_client().get(url, profile=profile, **kwargs)
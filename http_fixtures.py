@@ -0,0 +1,159 @@
+"""
+HTTP Fixtures
+Record/replay transport for the shared HTTP client. In record mode every
+response (status, headers, body) is saved per URL into a fixture store; in
+replay mode the saved responses are served back instead of touching the
+network, so scrapers can be tested and benchmarked offline.
+
+Select with HTTP_FIXTURES=record|replay and HTTP_FIXTURES_DIR (default
+fixtures). Record a full scrape with: python http_fixtures.py [dir]
+"""
+import hashlib
+import json
+import os
+import threading
+from datetime import timedelta
+
+import requests
+from requests.adapters import BaseAdapter, HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+FIXTURES_MODE = os.getenv("HTTP_FIXTURES", "")
+FIXTURES_DIR = os.getenv("HTTP_FIXTURES_DIR", "fixtures")
+
+INDEX_NAME = 'index.json'
+
+
+class FixtureMissing(requests.RequestException):
+    """Replay mode was asked for a URL that was never recorded"""
+
+
+def fixture_name(url):
+    return hashlib.sha256(url.encode('utf-8')).hexdigest()[:20] + '.body'
+
+
+class FixtureStore:
+    """Directory of response bodies plus an index of URL -> status, headers, file"""
+
+    def __init__(self, path=FIXTURES_DIR):
+        self.path = path
+        self.index = {}
+        self._lock = threading.Lock()
+        index_path = os.path.join(path, INDEX_NAME)
+        if os.path.exists(index_path):
+            with open(index_path, 'r') as f:
+                self.index = json.load(f)
+
+    def __len__(self):
+        return len(self.index)
+
+    def __contains__(self, url):
+        return url in self.index
+
+    def save(self, url, status, headers, body, final_url=None):
+        os.makedirs(self.path, exist_ok=True)
+        name = fixture_name(url)
+        with open(os.path.join(self.path, name), 'wb') as f:
+            f.write(body)
+        with self._lock:
+            self.index[url] = {
+                'status': status,
+                'headers': dict(headers),
+                'url': final_url or url,
+                'file': name,
+            }
+            self._write_index()
+
+    def load(self, url):
+        """Return (entry, body) for url, or None"""
+        entry = self.index.get(url)
+        if entry is None:
+            return None
+        with open(os.path.join(self.path, entry['file']), 'rb') as f:
+            return entry, f.read()
+
+    def _write_index(self):
+        tmp_path = os.path.join(self.path, INDEX_NAME + '.tmp')
+        with open(tmp_path, 'w') as f:
+            json.dump(self.index, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, os.path.join(self.path, INDEX_NAME))
+
+
+class RecordingAdapter(HTTPAdapter):
+    """Sends requests normally and saves each response to the store"""
+
+    def __init__(self, store, **kwargs):
+        super().__init__(**kwargs)
+        self.store = store
+
+    def send(self, request, **kwargs):
+        response = super().send(request, **kwargs)
+        # Bodies are stored decoded, so drop the transfer headers that no longer apply
+        headers = {key: value for key, value in response.headers.items()
+                   if key.lower() not in ('content-encoding', 'transfer-encoding', 'content-length')}
+        self.store.save(request.url, response.status_code, headers, response.content, response.url)
+        return response
+
+
+class ReplayAdapter(BaseAdapter):
+    """Serves responses from the store; unrecorded URLs raise FixtureMissing"""
+
+    def __init__(self, store):
+        super().__init__()
+        self.store = store
+
+    def send(self, request, **kwargs):
+        found = self.store.load(request.url)
+        if found is None:
+            raise FixtureMissing(f"No fixture recorded for {request.url}", request=request)
+        entry, body = found
+
+        response = requests.Response()
+        response.status_code = entry['status']
+        response.headers = CaseInsensitiveDict(entry['headers'])
+        response.encoding = get_encoding_from_headers(response.headers)
+        response.url = entry['url']
+        response.reason = 'Replayed'
+        response.request = request
+        response.elapsed = timedelta(0)
+        response._content = body
+        return response
+
+    def close(self):
+        pass
+
+
+def fixtures_active(mode=None):
+    return (mode or FIXTURES_MODE) in ('record', 'replay')
+
+
+def install(session, mode=None, path=None, **adapter_kwargs):
+    """Mount the record or replay adapter on session; returns the store (None when off)"""
+    mode = mode or FIXTURES_MODE
+    if not fixtures_active(mode):
+        return None
+    store = FixtureStore(path or FIXTURES_DIR)
+    if mode == 'record':
+        adapter = RecordingAdapter(store, **adapter_kwargs)
+    else:
+        adapter = ReplayAdapter(store)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return store
+
+
+if __name__ == "__main__":
+    import sys
+
+    # Set before the client module reads them
+    os.environ['HTTP_FIXTURES'] = 'record'
+    if len(sys.argv) > 1:
+        os.environ['HTTP_FIXTURES_DIR'] = sys.argv[1]
+
+    from http_client import get_client
+    from scraper import iter_all
+
+    client = get_client()
+    jobs = sum(1 for _ in iter_all())
+    print(f"✅ Recorded {len(client.fixtures)} responses into {client.fixtures.path} ({jobs} jobs)")
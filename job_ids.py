@@ -0,0 +1,117 @@
+"""
+Stable Job IDs
+Job IDs derived from a keyed BLAKE2 digest of the listing's canonical URL,
+or of its normalized title + company + source when there is no URL. Unlike
+Python's hash(), the same listing gets the same ID in every process
+"""
+import hashlib
+import os
+import re
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+# Changing the key changes every ID, so only set it once per deployment
+JOB_ID_KEY = os.getenv("JOB_ID_KEY", "internship-bot").encode('utf-8')
+
+# Query parameters that vary per visit and don't identify the listing
+TRACKING_PARAMS = {
+    'refid', 'trackingid', 'position', 'pagenum', 'ref', 'src', 'source',
+    'trk', 'tracking_id', 'utm_source', 'utm_medium', 'utm_campaign',
+    'utm_term', 'utm_content', 'gclid', 'fbclid',
+}
+
+NEW_ID_RE = re.compile(r'^[a-z_]+_[0-9a-f]{16}$')
+
+# IDs from the old scheme that came from hash() or datetime.now() and can
+# never be produced again, so they are dropped from seen.json
+UNSTABLE_LEGACY_ID_RE = re.compile(
+    r'^(?:linkedin_\d+|timesjobs_\d+|freshers_-?\d+_\d{8}|company_mock_\d{8}_\d+)$'
+)
+INTERNSHALA_LEGACY_ID_RE = re.compile(r'^internshala_(.+)$')
+
+# Company every parser records for a listing that doesn't name one
+NO_COMPANY = "Company Name Not Listed"
+
+# NO_COMPANY and the other placeholders found in stored and sent listings,
+# normalized with normalize_text
+PLACEHOLDER_COMPANIES = {
+    '', 'company name not listed', 'unknown company', 'company not specified',
+    'unknown', 'confidential', 'not specified', 'not disclosed',
+}
+
+_NON_WORD_RE = re.compile(r'[^\w]+')
+
+
+def canonical_url(url):
+    """Normalize a listing URL so tracking parameters and host variants don't change its ID"""
+    parts = urlsplit(url.strip())
+    host = parts.netloc.lower()
+    if host.endswith('linkedin.com'):
+        host = 'www.linkedin.com'  # in.linkedin.com and www.linkedin.com serve the same job
+
+    query = sorted(
+        (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if key.lower() not in TRACKING_PARAMS
+    )
+    path = parts.path.rstrip('/') or '/'
+    return urlunsplit(('https', host, path, urlencode(query), ''))
+
+
+def normalize_text(text):
+    """Lowercase and collapse punctuation/whitespace for ID purposes"""
+    return _NON_WORD_RE.sub(' ', (text or '').lower()).strip()
+
+
+def is_placeholder_company(name):
+    """Whether name stands in for a missing company rather than naming one"""
+    return normalize_text(name) in PLACEHOLDER_COMPANIES
+
+
+def job_digest(value):
+    """64-bit keyed BLAKE2b digest of value as 16 hex characters"""
+    return hashlib.blake2b(value.encode('utf-8'), digest_size=8, key=JOB_ID_KEY).hexdigest()
+
+
+def has_listing_url(url):
+    return bool(url) and url.startswith('http')
+
+
+def make_job_id(source, url=None, title='', company=''):
+    """Stable ID for a listing: source prefix plus a digest of its identity"""
+    if has_listing_url(url):
+        basis = 'url:' + canonical_url(url)
+    else:
+        basis = 'job:' + '|'.join([normalize_text(title), normalize_text(company), source])
+    return f"{source}_{job_digest(basis)}"
+
+
+def is_legacy_id(job_id):
+    """True for IDs from the old scheme that migrate_seen_ids rewrites or drops"""
+    if NEW_ID_RE.match(job_id):
+        return False
+    return bool(UNSTABLE_LEGACY_ID_RE.match(job_id) or INTERNSHALA_LEGACY_ID_RE.match(job_id))
+
+
+def needs_migration(seen_ids):
+    return any(is_legacy_id(job_id) for job_id in seen_ids)
+
+
+def migrate_seen_ids(seen_ids):
+    """Convert a seen set from the old ID scheme.
+
+    Internshala IDs were the listing's URL slug, so they are rebuilt from
+    the detail URL. hash()/date based IDs are dropped since no future run
+    can produce them. Returns (migrated_ids, converted_count, dropped_count).
+    """
+    migrated = set()
+    converted = dropped = 0
+    for job_id in seen_ids:
+        if not is_legacy_id(job_id):
+            migrated.add(job_id)
+        elif UNSTABLE_LEGACY_ID_RE.match(job_id):
+            dropped += 1
+        else:
+            slug = INTERNSHALA_LEGACY_ID_RE.match(job_id).group(1)
+            url = f"https://internshala.com/internship/detail/{slug}"
+            migrated.add(make_job_id('internshala', url=url))
+            converted += 1
+    return migrated, converted, dropped
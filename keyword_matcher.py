@@ -0,0 +1,104 @@
+"""
+Keyword Matcher
+Aho-Corasick multi-pattern matcher used to decide whether a listing is
+relevant. Built once from a keyword list, then scans each text in one pass
+no matter how many keywords there are
+"""
+from collections import deque, namedtuple
+
+# Keywords this short only match whole words, so 'it', 'hr' and 'api'
+# no longer fire inside 'with', 'three' or 'rapid'
+WHOLE_WORD_MAX_LEN = 3
+
+KeywordMatch = namedtuple('KeywordMatch', ['keyword', 'category', 'start', 'end'])
+
+
+class KeywordMatcher:
+    """Precompiled automaton over a set of lowercased, deduplicated keywords.
+
+    keywords is either a mapping of keyword -> category or an iterable of
+    keywords (category None). Every keyword must start at a word boundary;
+    keywords up to whole_word_max_len characters must also end at one.
+    Longer keywords may still match a word prefix ('intern' in 'internship').
+    """
+
+    def __init__(self, keywords, whole_word_max_len=WHOLE_WORD_MAX_LEN):
+        if not hasattr(keywords, 'items'):
+            keywords = {keyword: None for keyword in keywords}
+
+        self.whole_word_max_len = whole_word_max_len
+        self.categories = {}
+        for keyword, category in keywords.items():
+            keyword = keyword.strip().lower()
+            if keyword and keyword not in self.categories:
+                self.categories[keyword] = category
+
+        # Trie as parallel lists: child transitions, failure links, outputs
+        self._goto = [{}]
+        self._fail = [0]
+        self._out = [[]]
+        for keyword in self.categories:
+            self._add(keyword)
+        self._build_failure_links()
+
+    def __len__(self):
+        return len(self.categories)
+
+    def _add(self, keyword):
+        state = 0
+        for char in keyword:
+            next_state = self._goto[state].get(char)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto[state][char] = next_state
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+            state = next_state
+        self._out[state].append(keyword)
+
+    def _build_failure_links(self):
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fail = self._fail[state]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[next_state] = self._goto[fail].get(char, 0)
+                # Inherit matches that end here via the failure state
+                self._out[next_state] = self._out[next_state] + self._out[self._fail[next_state]]
+
+    def _at_boundary(self, text, start, end, keyword):
+        if start > 0 and text[start - 1].isalnum():
+            return False
+        if len(keyword) <= self.whole_word_max_len and end < len(text) and text[end].isalnum():
+            return False
+        return True
+
+    def _scan(self, text):
+        text = text.lower()
+        goto, fail, out = self._goto, self._fail, self._out
+        state = 0
+        for index, char in enumerate(text):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            for keyword in out[state]:
+                end = index + 1
+                start = end - len(keyword)
+                if self._at_boundary(text, start, end, keyword):
+                    yield KeywordMatch(keyword, self.categories[keyword], start, end)
+
+    def search(self, text):
+        """Return the first KeywordMatch in text, or None"""
+        if not text:
+            return None
+        return next(self._scan(text), None)
+
+    def find_all(self, text):
+        """Return every KeywordMatch in text, in order of where they end"""
+        if not text:
+            return []
+        return list(self._scan(text))
@@ -0,0 +1,190 @@
+"""
+Near-Duplicate Detection
+Finds the same listing posted on several boards, or with "Pvt. Ltd."
+suffixes, different casing or tracking parameters. Jobs match on their
+canonical URL, or on the normalized company plus a similar title, found
+through MinHash signatures of title words and LSH buckets so each check
+costs the same no matter how many jobs are indexed. Similar titles only
+match across sources: one board listing two roles at two URLs means two
+listings, however alike their titles
+"""
+import csv
+import os
+import re
+import zlib
+from datetime import datetime, timedelta
+
+from job_ids import canonical_url, has_listing_url, is_placeholder_company, normalize_text
+
+# Titles of the same company this similar (Jaccard over title words) are one listing
+SIMILARITY_THRESHOLD = float(os.getenv("NEAR_DUP_THRESHOLD", "0.75"))
+
+# Sent listings from this many days back are matched against too
+HISTORY_DAYS = int(os.getenv("NEAR_DUP_HISTORY_DAYS", "14"))
+HISTORY_FILE = 'internship_data.csv'
+
+# Title words that name the same thing
+WORD_VARIANTS = {'internship': 'intern', 'internships': 'intern', 'interns': 'intern'}
+
+# 16 bands of 2 rows: titles with Jaccard similarity 0.75 share a band
+# bucket with probability ~1.0, ones at 0.3 about 0.8 (then rejected exactly)
+BANDS = 16
+ROWS = 2
+NUM_HASHES = BANDS * ROWS
+
+_PRIME = (1 << 61) - 1
+_HASH_PARAMS = [
+    (zlib.crc32(f"a{i}".encode()) | 1, zlib.crc32(f"b{i}".encode()))
+    for i in range(NUM_HASHES)
+]
+
+# Legal-form words that don't distinguish one company from another
+COMPANY_SUFFIXES = {
+    'pvt', 'private', 'ltd', 'limited', 'inc', 'incorporated', 'llp', 'llc',
+    'corp', 'corporation', 'co', 'company', 'plc', 'gmbh', 'the',
+}
+
+_TRAILING_PAREN_RE = re.compile(r'\([^)]*\)\s*$')
+
+
+def normalize_company(name):
+    """Company name without case, punctuation or legal-form suffixes"""
+    name = _TRAILING_PAREN_RE.sub('', name or '')
+    words = normalize_text(name).split()
+    while words and words[-1] in COMPANY_SUFFIXES:
+        words.pop()
+    while words and words[0] == 'the':
+        words.pop(0)
+    return ' '.join(words)
+
+
+def shingles(title):
+    """Word shingles of the normalized title.
+
+    Whole words, so titles differing in one word ("Web Development Intern",
+    "App Development Intern") stay apart where character shingles would
+    mostly overlap.
+    """
+    return {WORD_VARIANTS.get(word, word) for word in normalize_text(title).split()}
+
+
+def minhash(shingle_set):
+    """MinHash signature of a shingle set, NUM_HASHES values"""
+    hashes = [zlib.crc32(shingle.encode('utf-8')) for shingle in shingle_set]
+    if not hashes:
+        return (0,) * NUM_HASHES
+    return tuple(min((a * h + b) % _PRIME for h in hashes) for a, b in _HASH_PARAMS)
+
+
+def jaccard(first, second):
+    if not first or not second:
+        return 0.0
+    return len(first & second) / len(first | second)
+
+
+def same_source(job, other):
+    """Whether both jobs come from the same board, which lists a role only once"""
+    source = job.get('source')
+    return bool(source) and source == other.get('source')
+
+
+def job_url(job):
+    link = job.get('link')
+    return canonical_url(link) if has_listing_url(link) else None
+
+
+class DuplicateIndex:
+    """LSH index of jobs for near-duplicate lookups"""
+
+    def __init__(self, threshold=SIMILARITY_THRESHOLD):
+        self.threshold = threshold
+        self._urls = {}
+        self._buckets = {}
+        self._entries = []
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _bands(self, company, signature):
+        for band in range(BANDS):
+            yield (company, band, signature[band * ROWS:(band + 1) * ROWS])
+
+    def add(self, job):
+        url = job_url(job)
+        if url:
+            self._urls.setdefault(url, job)
+        title_shingles = shingles(job.get('title'))
+        if not title_shingles:
+            return
+        entry = (job, title_shingles)
+        self._entries.append(entry)
+        company = normalize_company(job.get('company'))
+        for key in self._bands(company, minhash(title_shingles)):
+            self._buckets.setdefault(key, []).append(entry)
+
+    def alias(self, job, existing):
+        """Make job's URL find existing too, once job was merged into it"""
+        url = job_url(job)
+        if url:
+            self._urls.setdefault(url, existing)
+
+    def find(self, job):
+        """Return (indexed job, reason) for a duplicate of job, or None"""
+        url = job_url(job)
+        if url and url in self._urls:
+            return self._urls[url], 'same listing URL'
+
+        title_shingles = shingles(job.get('title'))
+        if not title_shingles:
+            return None
+        company = normalize_company(job.get('company'))
+        # Without a real company only an identical title counts as the same listing
+        threshold = 1.0 if is_placeholder_company(job.get('company')) else self.threshold
+        best, best_score = None, threshold
+        checked = set()
+        for key in self._bands(company, minhash(title_shingles)):
+            for entry in self._buckets.get(key, ()):
+                if id(entry) in checked:
+                    continue
+                checked.add(id(entry))
+                if same_source(job, entry[0]):
+                    continue
+                score = jaccard(title_shingles, entry[1])
+                if score >= best_score:
+                    best, best_score = entry[0], score
+        if best is None:
+            return None
+        return best, f"similar title at the same company ({best_score:.2f})"
+
+
+def merge_listing(existing, job):
+    """Record job's link on the existing listing it duplicates; True if existing changed"""
+    link = job.get('link')
+    if not has_listing_url(link) or link == existing.get('link'):
+        return False
+    also_listed = existing.setdefault('also_listed', [])
+    if any(other.get('link') == link for other in also_listed):
+        return False
+    also_listed.append({'source': job.get('source'), 'link': link})
+    return True
+
+
+def describe_merge(job, existing, reason):
+    """One report line for a merged duplicate"""
+    return (f"{job.get('title')} at {job.get('company')} ({job.get('source')}) -> "
+            f"{existing.get('title')} ({existing.get('source')}): {reason}")
+
+
+def load_recent_history(days=HISTORY_DAYS, path=HISTORY_FILE):
+    """Jobs sent in the last days days, from the internship tracking log"""
+    if not os.path.exists(path):
+        return []
+    cutoff = (datetime.now() - timedelta(days=days)).isoformat()
+    recent = []
+    with open(path, 'r', newline='', encoding='utf-8') as f:
+        for row in csv.DictReader(f):
+            if (row.get('timestamp') or '') >= cutoff:
+                recent.append({'title': row.get('title'), 'company': row.get('company'),
+                               'link': row.get('link'), 'source': row.get('source_site'),
+                               'sent_at': row.get('timestamp')})
+    return recent
@@ -0,0 +1,208 @@
+"""
+Email Outbox
+Durable per-recipient delivery state for batch digests. Each digest is
+stored with its jobs and message, and each (digest, recipient) pair is a
+row that is pending, sent or failed, with its attempt count and next retry
+time. A run sends only the rows that are due, so a crash or SMTP outage
+costs a retry of the remaining rows rather than a full resend, and a
+digest's jobs leave the batch only once every recipient is settled
+"""
+import hashlib
+import json
+import os
+import sqlite3
+from datetime import datetime, timedelta
+
+OUTBOX_DB = os.getenv("OUTBOX_DB", "outbox.db")
+
+# Runs that may try a recipient before it is given up on
+OUTBOX_MAX_ATTEMPTS = int(os.getenv("OUTBOX_MAX_ATTEMPTS", "5"))
+
+# Wait before retrying a failed recipient, doubling per attempt up to the cap
+RETRY_SECONDS = int(os.getenv("OUTBOX_RETRY_SECONDS", "600"))
+RETRY_MAX_SECONDS = int(os.getenv("OUTBOX_RETRY_MAX_SECONDS", str(12 * 3600)))
+
+PENDING = 'pending'
+SENT = 'sent'
+FAILED = 'failed'
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS digests (
+    digest TEXT PRIMARY KEY,
+    created_at TEXT NOT NULL,
+    bot_run_id TEXT,
+    jobs TEXT NOT NULL,
+    body TEXT NOT NULL,
+    completed_at TEXT
+);
+
+CREATE TABLE IF NOT EXISTS outbox (
+    digest TEXT NOT NULL,
+    recipient TEXT NOT NULL,
+    state TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    next_retry TEXT,
+    last_error TEXT,
+    updated_at TEXT NOT NULL,
+    PRIMARY KEY (digest, recipient)
+);
+CREATE INDEX IF NOT EXISTS outbox_state ON outbox (digest, state, next_retry);
+"""
+
+# Rows still owed a delivery: pending, or failed with a retry scheduled.
+# A failed row without next_retry has been given up on
+UNSETTLED = "(state = 'pending' OR (state = 'failed' AND next_retry IS NOT NULL))"
+
+
+def job_key(job):
+    return job.get('id') or job.get('link')
+
+
+def digest_key(jobs):
+    """Stable key for a set of jobs, whatever order they are in"""
+    keys = sorted(str(job_key(job)) for job in jobs)
+    return hashlib.sha256('\n'.join(keys).encode('utf-8')).hexdigest()[:16]
+
+
+def retry_delay(attempts):
+    return min(RETRY_MAX_SECONDS, RETRY_SECONDS * 2 ** max(0, attempts - 1))
+
+
+class Outbox:
+    def __init__(self, path=OUTBOX_DB, max_attempts=OUTBOX_MAX_ATTEMPTS):
+        self.path = path
+        self.max_attempts = max_attempts
+        # Delivery workers report results from their own threads
+        self.conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    def add_digest(self, jobs, body, recipients, bot_run_id=None):
+        """Queue body (about jobs) for every recipient; returns the digest key.
+
+        Adding a digest that already exists only queues recipients it
+        doesn't have yet (reopening it if it was complete), so rows already
+        sent stay sent.
+        """
+        digest = digest_key(jobs)
+        now = datetime.now().isoformat()
+        recipients = [r.strip() for r in recipients if r and r.strip()]
+        with self.conn:
+            self.conn.execute(
+                "INSERT OR IGNORE INTO digests (digest, created_at, bot_run_id, jobs, body) VALUES (?, ?, ?, ?, ?)",
+                (digest, now, bot_run_id, json.dumps(jobs), body)
+            )
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO outbox (digest, recipient, state, updated_at) VALUES (?, ?, ?, ?)",
+                [(digest, recipient, PENDING, now) for recipient in recipients]
+            )
+            self.conn.execute(
+                "UPDATE digests SET completed_at = NULL WHERE digest = ? AND completed_at IS NOT NULL "
+                f"AND EXISTS (SELECT 1 FROM outbox WHERE digest = ? AND {UNSETTLED})",
+                (digest, digest)
+            )
+        return digest
+
+    def _digests(self, where, params=()):
+        rows = self.conn.execute(
+            f"SELECT digest, created_at, bot_run_id, jobs, body FROM digests WHERE {where} ORDER BY created_at",
+            params
+        )
+        return [{'digest': digest, 'created_at': created_at, 'bot_run_id': bot_run_id,
+                 'jobs': json.loads(jobs), 'body': body}
+                for digest, created_at, bot_run_id, jobs, body in rows]
+
+    def open_digests(self):
+        """Digests with recipients still unsettled, oldest first, as dicts"""
+        return self._digests("completed_at IS NULL")
+
+    def completed_digests(self, since=''):
+        """Completed digests created at or after since (an ISO timestamp), oldest first"""
+        return self._digests("completed_at IS NOT NULL AND created_at >= ?", (since or '',))
+
+    def due(self, digest, now=None):
+        """Recipients of digest whose next delivery may happen now"""
+        now = now or datetime.now().isoformat()
+        rows = self.conn.execute(
+            f"SELECT recipient FROM outbox WHERE digest = ? AND {UNSETTLED} "
+            "AND (next_retry IS NULL OR next_retry <= ?) ORDER BY recipient",
+            (digest, now)
+        )
+        return [recipient for (recipient,) in rows]
+
+    def cancel(self, digest, keep):
+        """Drop unsettled rows whose recipient is not in keep (e.g. unsubscribed)"""
+        keep = {r.strip() for r in keep if r and r.strip()}
+        rows = self.conn.execute(
+            f"SELECT recipient FROM outbox WHERE digest = ? AND {UNSETTLED}", (digest,)
+        ).fetchall()
+        dropped = [(digest, recipient) for (recipient,) in rows if recipient not in keep]
+        with self.conn:
+            self.conn.executemany("DELETE FROM outbox WHERE digest = ? AND recipient = ?", dropped)
+        return len(dropped)
+
+    def record(self, digest, result):
+        """Store a delivery.DeliveryResult for one recipient of digest"""
+        now = datetime.now()
+        row = self.conn.execute(
+            "SELECT attempts FROM outbox WHERE digest = ? AND recipient = ?", (digest, result.recipient)
+        ).fetchone()
+        # One attempt per run that tried the recipient, however many sends the
+        # engine made; a recipient deferred by the daily limit wasn't tried
+        attempts = (row[0] if row else 0) + (1 if result.attempts else 0)
+        error = result.error
+        if result.status == SENT:
+            state, next_retry, error = SENT, None, None
+        elif result.status == FAILED:
+            state = FAILED
+            if result.refused or attempts >= self.max_attempts:
+                next_retry = None  # given up
+            else:
+                next_retry = (now + timedelta(seconds=retry_delay(attempts))).isoformat()
+        else:
+            # Not attempted (daily limit): try again tomorrow
+            state = PENDING
+            tomorrow = (now + timedelta(days=1)).replace(hour=0, minute=0, second=0, microsecond=0)
+            next_retry = tomorrow.isoformat()
+        with self.conn:
+            self.conn.execute(
+                "UPDATE outbox SET state = ?, attempts = ?, next_retry = ?, last_error = ?, updated_at = ? "
+                "WHERE digest = ? AND recipient = ?",
+                (state, attempts, next_retry, error, now.isoformat(), digest, result.recipient)
+            )
+
+    def unsettled(self, digest):
+        return self.conn.execute(
+            f"SELECT COUNT(*) FROM outbox WHERE digest = ? AND {UNSETTLED}", (digest,)
+        ).fetchone()[0]
+
+    def counts(self, digest):
+        """{state: rows} for digest"""
+        rows = self.conn.execute("SELECT state, COUNT(*) FROM outbox WHERE digest = ? GROUP BY state", (digest,))
+        return dict(rows.fetchall())
+
+    def complete(self, digest):
+        """Mark digest done once none of its recipients is unsettled; returns whether it was"""
+        if self.unsettled(digest):
+            return False
+        with self.conn:
+            self.conn.execute(
+                "UPDATE digests SET completed_at = ? WHERE digest = ? AND completed_at IS NULL",
+                (datetime.now().isoformat(), digest)
+            )
+        return True
+
+
+_outbox = None
+
+
+def get_outbox(path=OUTBOX_DB):
+    """Return the shared outbox, opening it on first use"""
+    global _outbox
+    if _outbox is None:
+        _outbox = Outbox(path)
+    return _outbox
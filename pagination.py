@@ -0,0 +1,132 @@
+"""
+Incremental Pagination
+Walks each category or search newest page first and stops as soon as a
+page is mostly listings that were already seen, so crawl depth follows how
+many new listings there are. Pages are yielded as they arrive. Each page
+counts towards its source's circuit breaker, and an open circuit stops
+the fetching
+"""
+import os
+from collections import deque, namedtuple
+
+from circuit_breaker import CircuitOpenError
+from fetcher import get_engine
+from http_cache import served_without_request
+from parse_pool import ParsePoolError, get_parse_pool
+
+# Pages fetched at most per category or search
+MAX_PAGES = int(os.getenv("PAGINATION_MAX_PAGES", "3"))
+
+# Stop paginating once this fraction of a page's listings has been seen before
+SEEN_STOP_RATIO = float(os.getenv("PAGINATION_SEEN_RATIO", "0.8"))
+
+PageResult = namedtuple('PageResult', ['page', 'url', 'response', 'error', 'jobs'])
+
+
+def seen_ratio(jobs, seen_ids):
+    """Fraction of jobs whose ID is in seen_ids"""
+    if not jobs:
+        return 1.0
+    return sum(1 for job in jobs if job['id'] in seen_ids) / len(jobs)
+
+
+def _has_more(result, seen_ids, stop_ratio):
+    """Whether the page after result is worth fetching"""
+    if result.error or not result.jobs:
+        return False
+    if result.response.status_code != 200:
+        return False
+    # Without a seen set there's no telling new pages from old ones
+    return seen_ids is not None and seen_ratio(result.jobs, seen_ids) < stop_ratio
+
+
+def page_healthy(result):
+    """Whether a page counts as a success for its source's circuit, or None when it says nothing.
+
+    A failed fetch or parse fails; so does a first page without a single
+    listing card, which is what a site block or a layout change looks like.
+    Cards that are all filtered out as irrelevant are a healthy page. A page
+    served from the cache without a request says nothing about the site.
+    """
+    if isinstance(result.error, CircuitOpenError):
+        return None  # the host's circuit already knows
+    if isinstance(result.error, ParsePoolError):
+        return None  # a local failure, not the site's
+    if result.error or result.response.status_code != 200:
+        return False
+    if served_without_request(result.response):
+        return None
+    if not getattr(result.jobs, 'found', len(result.jobs)):
+        return False if result.page == 1 else None
+    return True
+
+
+def _finish(page, url, future):
+    """Wait for a fetched and parsed page and wrap it in a PageResult"""
+    response, error, jobs = None, None, []
+    try:
+        response, jobs, error = future.result()
+    except Exception as e:
+        error = e
+    return PageResult(page, url, response, error, jobs)
+
+
+def iter_pages(keys, page_url, parse, seen_ids=None, max_pages=None, stop_ratio=None,
+               source=None, **fetch_kwargs):
+    """Fetch and parse pages of every key, yielding (key, PageResult) pairs.
+
+    page_url(key, page) builds the URL of a key's page (page numbers start
+    at 1) and parse(content), a module-level function run on the parse
+    pool, returns its jobs. Each round fetches the next page of every key
+    still going concurrently, yielding pages in key order as soon as each
+    is fetched and parsed. Stop iterating to stop fetching.
+
+    Pages count towards the circuit breaker of source (a registry key):
+    nothing is fetched while it is open, and while it is half-open a single
+    probe page is fetched and waited for first.
+    """
+    max_pages = max_pages or MAX_PAGES
+    stop_ratio = SEEN_STOP_RATIO if stop_ratio is None else stop_ratio
+    engine = get_engine()
+    parse_pool = get_parse_pool()
+    circuit = engine.circuits.source(source) if source and engine.circuits else None
+
+    active = list(keys)
+    for page in range(1, max_pages + 1):
+        if not active:
+            break
+        still_active = []
+        pending = deque()
+
+        def finished(key, url, future):
+            result = _finish(page, url, future)
+            if circuit:
+                healthy = page_healthy(result)
+                if healthy is None:
+                    circuit.release()
+                else:
+                    circuit.record(healthy)
+            if _has_more(result, seen_ids, stop_ratio):
+                still_active.append(key)
+            return key, result
+
+        for key in active:
+            if circuit and not circuit.allow():
+                print(f"⛔ Circuit {circuit.name} is {circuit.describe()}, skipping its remaining pages")
+                active = []
+                break
+            url = page_url(key, page)
+            fetched = engine.submit(url, **fetch_kwargs)
+            pending.append((key, url, parse_pool.parse_fetched(fetched, parse, source)))
+            # A probe's verdict decides whether anything else is fetched
+            if circuit and circuit.probing:
+                while pending:
+                    yield finished(*pending.popleft())
+            # Hand over pages that are already done while the rest are submitted
+            while pending and pending[0][2].done():
+                yield finished(*pending.popleft())
+        while pending:
+            yield finished(*pending.popleft())
+        if not active:
+            break
+        active = still_active
@@ -0,0 +1,102 @@
+"""
+Parse Cache
+Jobs extracted from a page, keyed by source, the source's parser version
+and a hash of the page body. A page that comes back byte-identical (sites
+that ignore conditional GETs send the same page again) reuses the stored
+jobs without being parsed. Least recently used pages are dropped past
+PARSE_CACHE_MAX_PAGES; bumping a source's parser_version in the registry
+makes its old entries unreachable, and they are purged on the next store
+"""
+import copy
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+
+from html_parsing import ParsedPage
+
+PARSE_CACHE_FILE = os.getenv("PARSE_CACHE_FILE", "parse_cache.json")
+PARSE_CACHE_MAX_PAGES = int(os.getenv("PARSE_CACHE_MAX_PAGES", "500"))
+PARSE_CACHE_ENABLED = os.getenv("PARSE_CACHE_ENABLED", "1") != "0"
+
+
+def body_hash(content):
+    if isinstance(content, str):
+        content = content.encode('utf-8')
+    return hashlib.sha256(content).hexdigest()
+
+
+class ParseCache:
+    def __init__(self, path=PARSE_CACHE_FILE, max_pages=PARSE_CACHE_MAX_PAGES):
+        self.path = path
+        self.max_pages = max_pages
+        self.entries = OrderedDict()  # least recently used first: key -> {'jobs', 'found'}
+        self._purged = set()
+        self._dirty = False
+        self._lock = threading.Lock()
+        if os.path.exists(path):
+            with open(path, 'r') as f:
+                for key, entry in json.load(f).get('entries', []):
+                    # Entries stored before found was kept are a bare jobs list
+                    if isinstance(entry, list):
+                        entry = {'jobs': entry, 'found': len(entry)}
+                    self.entries[key] = entry
+
+    @staticmethod
+    def key(source, version, content):
+        return f"{source}:{version}:{body_hash(content)}"
+
+    def get(self, source, version, content):
+        """A ParsedPage of copies of the jobs cached for this page body, or None"""
+        key = self.key(source, version, content)
+        with self._lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                return None
+            self.entries.move_to_end(key)
+            self._dirty = True
+            return ParsedPage(copy.deepcopy(entry['jobs']), found=entry['found'])
+
+    def put(self, source, version, content, jobs):
+        key = self.key(source, version, content)
+        with self._lock:
+            if source not in self._purged:
+                # Entries of the source's other parser versions can never hit again
+                prefix, current = f"{source}:", f"{source}:{version}:"
+                stale = [k for k in self.entries if k.startswith(prefix) and not k.startswith(current)]
+                for k in stale:
+                    del self.entries[k]
+                self._purged.add(source)
+            self.entries[key] = {'jobs': copy.deepcopy(list(jobs)),
+                                 'found': getattr(jobs, 'found', len(jobs))}
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_pages:
+                self.entries.popitem(last=False)
+            self._dirty = True
+
+    def save(self):
+        with self._lock:
+            if not self._dirty:
+                return
+            data = {'entries': [[key, jobs] for key, jobs in self.entries.items()]}
+            self._dirty = False
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(data, f)
+        os.replace(tmp_path, self.path)
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_parse_cache():
+    """Return the shared parse cache, or None when it is disabled"""
+    global _cache
+    if not PARSE_CACHE_ENABLED:
+        return None
+    with _cache_lock:
+        if _cache is None:
+            _cache = ParseCache()
+        return _cache
@@ -0,0 +1,180 @@
+"""
+Parse Pool
+Second stage of the scrape pipeline: as each fetch finishes, its page body
+goes to a process pool that turns it into plain job dicts, so BeautifulSoup
+work runs on every core instead of queueing behind the GIL. At most
+PARSE_QUEUE_SIZE pages wait to be parsed; past that the fetch workers block,
+so fetching can't run ahead of parsing. The first PARSE_INLINE_PAGES pages
+are parsed in-process, so small runs never pay for starting processes, and
+pages whose body was parsed before are not parsed at all
+"""
+import multiprocessing
+import os
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from parse_cache import get_parse_cache
+from run_metrics import get_run_metrics, start_run
+from selector_cache import get_selector_cache
+from sources import get_source
+
+# Parser processes; 0 parses every page in-process
+PARSE_WORKERS = int(os.getenv("PARSE_WORKERS", str(min(4, os.cpu_count() or 1))))
+
+# Pages parsed in-process before the pool is started
+PARSE_INLINE_PAGES = int(os.getenv("PARSE_INLINE_PAGES", "10"))
+
+# Page bodies queued for or being parsed before fetch workers wait
+PARSE_QUEUE_SIZE = int(os.getenv("PARSE_QUEUE_SIZE", str(max(1, PARSE_WORKERS) * 2)))
+
+
+class ParsePoolError(Exception):
+    """The parse pool itself failed, which says nothing about the page or its site"""
+
+
+def _parse_in_worker(parse, content):
+    """Runs in a pool process: returns parse(content) with the metrics and selectors it recorded"""
+    metrics = start_run()
+    jobs = parse(content)
+    return jobs, metrics.record(), get_selector_cache().learned
+
+
+class ParsePool:
+    def __init__(self, workers=PARSE_WORKERS, inline_pages=PARSE_INLINE_PAGES, queue_size=PARSE_QUEUE_SIZE):
+        self.workers = workers
+        self.inline_pages = inline_pages
+        self._slots = threading.BoundedSemaphore(max(1, queue_size))
+        self._executor = None
+        self._pages = 0
+        self._lock = threading.Lock()
+
+    def _get_executor(self):
+        """The process pool, or None while pages are still parsed in-process"""
+        with self._lock:
+            self._pages += 1
+            if self.workers <= 0 or (self._executor is None and self._pages <= self.inline_pages):
+                return None
+            if self._executor is None:
+                # Spawned, since forking while fetch threads hold locks can hang the children
+                self._executor = ProcessPoolExecutor(self.workers,
+                                                     mp_context=multiprocessing.get_context('spawn'))
+            return self._executor
+
+    def _discard(self, executor):
+        """Forget a broken executor so the next page starts a fresh one"""
+        with self._lock:
+            if self._executor is executor:
+                self._executor = None
+        executor.shutdown(wait=False)
+
+    def submit(self, parse, content):
+        """Future of parse(content). parse must be a module-level function so it pickles.
+
+        A failure of the pool rather than of parse raises ParsePoolError.
+        """
+        executor = self._get_executor()
+        result = Future()
+        if executor is None:
+            try:
+                result.set_result(parse(content))
+            except Exception as e:
+                result.set_exception(e)
+            return result
+
+        self._slots.acquire()  # backpressure: wait while the queue is full
+        try:
+            pooled = executor.submit(_parse_in_worker, parse, content)
+        except Exception as e:
+            self._slots.release()
+            if isinstance(e, BrokenProcessPool):
+                self._discard(executor)
+            raise ParsePoolError(f"Parse pool unavailable: {e}") from e
+
+        def unpack(done):
+            self._slots.release()
+            try:
+                jobs, record, learned = done.result()
+                get_run_metrics().merge(record)
+                get_selector_cache().merge(learned)
+            except BrokenProcessPool as e:
+                self._discard(executor)
+                result.set_exception(ParsePoolError(f"Parse worker died: {e}"))
+                return
+            except Exception as e:
+                result.set_exception(e)
+                return
+            result.set_result(jobs)
+
+        pooled.add_done_callback(unpack)
+        return result
+
+    def parse_fetched(self, fetch_future, parse, source=None):
+        """Future of (response, jobs, parse error) for a page being fetched.
+
+        Only 200 responses are parsed, including unchanged ones served from
+        the HTTP cache. With a source key, a body parsed before is answered
+        from the parse cache. A failed fetch makes the future raise its
+        exception. The future is always resolved, whatever goes wrong.
+        """
+        page = Future()
+        cache = get_parse_cache() if source else None
+        version = get_source(source).parser_version if cache else None
+
+        def parsed(response, content, done):
+            try:
+                error = done.exception()
+                jobs = [] if error else done.result()
+            except Exception as e:
+                page.set_result((response, [], e))
+                return
+            if cache and error is None:
+                try:
+                    cache.put(source, version, content, jobs)
+                except Exception as e:
+                    print(f"⚠️ Could not cache parsed page for {source}: {e}")
+            page.set_result((response, jobs, error))
+
+        def fetched(done):
+            try:
+                response = done.result()
+                if response.status_code != 200:
+                    page.set_result((response, [], None))
+                    return
+                # Reading the body can still fail, like the fetch itself
+                content = response.content
+            except Exception as e:
+                page.set_exception(e)
+                return
+            try:
+                jobs = cache.get(source, version, content) if cache else None
+                if jobs is not None:
+                    get_run_metrics().record_parse_reused(source)
+                    page.set_result((response, jobs, None))
+                    return
+                self.submit(parse, content).add_done_callback(
+                    lambda done: parsed(response, content, done))
+            except Exception as e:
+                page.set_result((response, [], e))
+
+        fetch_future.add_done_callback(fetched)
+        return page
+
+    def shutdown(self):
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=True)
+                self._executor = None
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_parse_pool():
+    """Return the process-wide parse pool shared by the scrapers"""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ParsePool()
+        return _pool
@@ -0,0 +1,77 @@
+"""
+Rate Limiter
+Token buckets keyed by host. A caller waits only for its own host's next
+token, so a slow site never holds up requests to the others
+"""
+import threading
+import time
+
+
+class TokenBucket:
+    """Allows rate requests per second on average, with bursts of up to burst"""
+
+    def __init__(self, rate, burst=1):
+        self.rate = float(rate)
+        self.burst = max(1, burst)
+        self.tokens = float(self.burst)
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now):
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def reserve(self):
+        """Take a token and return how many seconds until it may be used"""
+        with self._lock:
+            self._refill(time.monotonic())
+            self.tokens -= 1
+            if self.tokens >= 0 or self.rate <= 0:
+                return 0.0
+            return -self.tokens / self.rate
+
+    def acquire(self):
+        """Block until a token is available; returns the seconds waited"""
+        wait = self.reserve()
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    def set_rate(self, rate):
+        """Change the rate from now on; tokens already earned are kept"""
+        with self._lock:
+            self._refill(time.monotonic())
+            self.rate = float(rate)
+
+    def try_acquire(self):
+        """Take a token if one is available right now, without waiting"""
+        with self._lock:
+            self._refill(time.monotonic())
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return True
+            return False
+
+
+class HostRateLimiter:
+    """One token bucket per host, created from policy(host) on first use.
+
+    policy returns (rate, burst) for a host, or None for no limit.
+    """
+
+    def __init__(self, policy):
+        self.policy = policy
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def bucket(self, host):
+        with self._lock:
+            if host not in self._buckets:
+                limits = self.policy(host)
+                self._buckets[host] = TokenBucket(*limits) if limits else None
+            return self._buckets[host]
+
+    def acquire(self, host):
+        """Wait for host's next request slot; returns the seconds waited"""
+        bucket = self.bucket(host)
+        return bucket.acquire() if bucket else 0.0
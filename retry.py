@@ -0,0 +1,17 @@
+"""
+Retry Backoff
+Exponential backoff with full jitter, shared by the HTTP client and the
+email delivery engine
+"""
+import random
+
+
+def backoff_delay(attempt, retry_after=None, base=0.5, cap=30.0):
+    """Seconds to wait before retry number attempt (0-based).
+
+    A server-supplied Retry-After wins; otherwise exponential backoff with
+    full jitter so parallel workers don't retry in lockstep.
+    """
+    if retry_after is not None:
+        return min(retry_after, cap)
+    return random.uniform(0, min(cap, base * (2 ** attempt)))
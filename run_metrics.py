@@ -0,0 +1,303 @@
+"""
+Run Metrics
+Instruments each scrape run: per HTTP fetch the DNS, connect, time to first
+byte and download time and bytes received, per source the parse time,
+listings found and kept after relevance filtering, errors and wall time.
+A run's numbers are appended as one JSON line keyed by bot_run_id and
+written in Prometheus text exposition format (for node_exporter's textfile
+collector), so the slowest source and yield over time are easy to see
+"""
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+
+METRICS_FILE = os.getenv("RUN_METRICS_FILE", "run_metrics.jsonl")
+PROM_FILE = os.getenv("RUN_METRICS_PROM", "run_metrics.prom")
+
+PROM_PREFIX = 'internship_bot'
+
+# Per-source totals: (field, Prometheus name, help text)
+SOURCE_METRICS = [
+    ('seconds', 'source_seconds', "Wall time the source ran for"),
+    ('fetches', 'source_fetches', "HTTP fetches made"),
+    ('fetch_errors', 'source_fetch_errors', "Fetches that raised or returned a 4xx/5xx status"),
+    ('cached', 'source_cached_responses', "Fetches answered by the response cache"),
+    ('bytes', 'source_received_bytes', "Response body bytes received"),
+    ('dns_seconds', 'source_dns_seconds', "Time spent resolving host names"),
+    ('connect_seconds', 'source_connect_seconds', "Time spent opening TCP/TLS connections"),
+    ('ttfb_seconds', 'source_ttfb_seconds', "Time from sending requests to their response headers"),
+    ('download_seconds', 'source_download_seconds', "Time spent reading response bodies"),
+    ('parse_seconds', 'source_parse_seconds', "Time spent parsing pages"),
+    ('pages_parsed', 'source_pages_parsed', "Pages parsed"),
+    ('parses_reused', 'source_parses_reused', "Pages whose jobs came from the parse cache"),
+    ('listings_found', 'source_listings_found', "Listings found on parsed pages"),
+    ('listings_kept', 'source_listings_kept', "Listings on parsed pages kept after relevance filtering"),
+    ('jobs', 'source_jobs', "Unique jobs the source contributed to the run"),
+    ('errors', 'source_errors', "Fetch errors plus failures of the source itself"),
+    ('timed_out', 'source_timed_out', "1 if the source was abandoned after its timeout"),
+]
+
+# Per source and field, from the selector cache: (field, Prometheus name, help text)
+SELECTOR_METRICS = [
+    ('hits', 'selector_hits', "Lookups answered by the first selector tried"),
+    ('misses', 'selector_misses', "Lookups where the first selector tried found nothing usable"),
+]
+
+_local = threading.local()
+
+
+def new_run_id():
+    """Run ID in the format the email logs use"""
+    return datetime.now().strftime('%Y%m%d_%H%M%S')
+
+
+class FetchTiming:
+    """Timings of one client fetch, filled in by the client and its connections"""
+
+    def __init__(self, url, source):
+        self.url = url
+        self.source = source
+        self.status = None
+        self.error = None
+        self.cached = False
+        self.attempts = 0
+        self.bytes = 0
+        self.dns = 0.0
+        self.connect = 0.0
+        self.ttfb = 0.0
+        self.download = 0.0
+        self.seconds = 0.0
+        self._attempt_start = None
+
+    def begin_attempt(self):
+        self.attempts += 1
+        self._attempt_start = (time.perf_counter(), self.dns + self.connect)
+
+    def end_attempt(self, response):
+        """Split an attempt's time using the response's elapsed (send to headers)"""
+        start, setup_before = self._attempt_start
+        wall = time.perf_counter() - start
+        elapsed = response.elapsed.total_seconds() if getattr(response, 'elapsed', None) else wall
+        setup = self.dns + self.connect - setup_before
+        self.ttfb += max(0.0, elapsed - setup)
+        self.download += max(0.0, wall - elapsed)
+        self.bytes += len(response.content)
+        self.status = response.status_code
+
+    @property
+    def failed(self):
+        return self.error is not None or (self.status is not None and self.status >= 400)
+
+    def as_dict(self):
+        return {
+            'url': self.url,
+            'source': self.source,
+            'status': self.status,
+            'error': self.error,
+            'cached': self.cached,
+            'attempts': self.attempts,
+            'bytes': self.bytes,
+            'dns_seconds': round(self.dns, 4),
+            'connect_seconds': round(self.connect, 4),
+            'ttfb_seconds': round(self.ttfb, 4),
+            'download_seconds': round(self.download, 4),
+            'seconds': round(self.seconds, 4),
+        }
+
+
+def current_fetch():
+    """The FetchTiming of the fetch running on this thread, or None"""
+    return getattr(_local, 'fetch', None)
+
+
+@contextmanager
+def timed_fetch(url, source):
+    """Time the fetch of url made inside the block and record it on the current run"""
+    timing = FetchTiming(url, source)
+    _local.fetch = timing
+    start = time.perf_counter()
+    try:
+        yield timing
+    except Exception as e:
+        timing.error = f"{type(e).__name__}: {e}"
+        raise
+    finally:
+        _local.fetch = None
+        timing.seconds = time.perf_counter() - start
+        get_run_metrics().record_fetch(timing)
+
+
+def _escape_label(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+class RunMetrics:
+    def __init__(self, bot_run_id=None):
+        self.bot_run_id = bot_run_id or new_run_id()
+        self.started_at = datetime.now().isoformat()
+        self.sources = {}
+        self.fetches = []
+        self.selectors = {}
+        self._start = time.perf_counter()
+        self._lock = threading.Lock()
+
+    def _source(self, source):
+        """Totals of source, created on first use (call with the lock held)"""
+        source = source or 'default'
+        if source not in self.sources:
+            self.sources[source] = {field: 0 for field, _, _ in SOURCE_METRICS}
+        return self.sources[source]
+
+    def record_fetch(self, timing):
+        with self._lock:
+            self.fetches.append(timing.as_dict())
+            totals = self._source(timing.source)
+            totals['fetches'] += 1
+            totals['cached'] += timing.cached
+            totals['bytes'] += timing.bytes
+            totals['dns_seconds'] += timing.dns
+            totals['connect_seconds'] += timing.connect
+            totals['ttfb_seconds'] += timing.ttfb
+            totals['download_seconds'] += timing.download
+            if timing.failed:
+                totals['fetch_errors'] += 1
+                totals['errors'] += 1
+
+    def record_parse(self, source, seconds, found, kept):
+        """One parsed page: listings on it and how many passed the relevance filter"""
+        with self._lock:
+            totals = self._source(source)
+            totals['parse_seconds'] += seconds
+            totals['pages_parsed'] += 1
+            totals['listings_found'] += found
+            totals['listings_kept'] += kept
+
+    def record_parse_reused(self, source):
+        """A page whose jobs came from the parse cache instead of being parsed"""
+        with self._lock:
+            self._source(source)['parses_reused'] += 1
+
+    def record_error(self, source):
+        with self._lock:
+            self._source(source)['errors'] += 1
+
+    def record_selector(self, source, field, hit):
+        """One selector-cache lookup for field of source"""
+        with self._lock:
+            counts = self.selectors.setdefault(f"{source}:{field}", {'hits': 0, 'misses': 0})
+            counts['hits' if hit else 'misses'] += 1
+
+    def record_source(self, source, seconds, jobs, timed_out=False):
+        """A source finished (or was abandoned) after seconds with jobs unique jobs"""
+        with self._lock:
+            totals = self._source(source)
+            totals['seconds'] = seconds
+            totals['jobs'] = jobs
+            totals['timed_out'] = int(timed_out)
+
+    def merge(self, record):
+        """Add the parse totals and selector counts of another process's record"""
+        with self._lock:
+            for source, totals in record['sources'].items():
+                mine = self._source(source)
+                for field in ('parse_seconds', 'pages_parsed', 'listings_found', 'listings_kept', 'errors'):
+                    mine[field] += totals[field]
+            for key, counts in record['selectors'].items():
+                mine = self.selectors.setdefault(key, {'hits': 0, 'misses': 0})
+                mine['hits'] += counts['hits']
+                mine['misses'] += counts['misses']
+
+    def record(self):
+        """The run as one JSON-serializable dict"""
+        with self._lock:
+            sources = {
+                source: {field: round(value, 4) if isinstance(value, float) else value
+                         for field, value in totals.items()}
+                for source, totals in self.sources.items()
+            }
+            return {
+                'bot_run_id': self.bot_run_id,
+                'started_at': self.started_at,
+                'seconds': round(time.perf_counter() - self._start, 4),
+                'sources': sources,
+                'selectors': {key: dict(counts) for key, counts in self.selectors.items()},
+                'fetches': list(self.fetches),
+            }
+
+    def prometheus(self, record=None):
+        """The run's totals in Prometheus text exposition format"""
+        record = record or self.record()
+        lines = [
+            f"# HELP {PROM_PREFIX}_run_info Scrape run the other metrics belong to",
+            f"# TYPE {PROM_PREFIX}_run_info gauge",
+            f'{PROM_PREFIX}_run_info{{bot_run_id="{_escape_label(record["bot_run_id"])}"}} 1',
+            f"# HELP {PROM_PREFIX}_run_seconds Wall time of the scrape run",
+            f"# TYPE {PROM_PREFIX}_run_seconds gauge",
+            f"{PROM_PREFIX}_run_seconds {record['seconds']}",
+        ]
+        for field, name, help_text in SOURCE_METRICS:
+            lines.append(f"# HELP {PROM_PREFIX}_{name} {help_text}")
+            lines.append(f"# TYPE {PROM_PREFIX}_{name} gauge")
+            for source, totals in sorted(record['sources'].items()):
+                lines.append(f'{PROM_PREFIX}_{name}{{source="{_escape_label(source)}"}} {totals[field]}')
+        for field, name, help_text in SELECTOR_METRICS:
+            lines.append(f"# HELP {PROM_PREFIX}_{name} {help_text}")
+            lines.append(f"# TYPE {PROM_PREFIX}_{name} gauge")
+            for key, counts in sorted(record['selectors'].items()):
+                source, selector_field = key.split(':', 1)
+                lines.append(f'{PROM_PREFIX}_{name}{{source="{_escape_label(source)}",'
+                             f'field="{_escape_label(selector_field)}"}} {counts[field]}')
+        return '\n'.join(lines) + '\n'
+
+    def save(self, path=METRICS_FILE, prom_path=PROM_FILE):
+        """Append the run to the JSON lines file and replace the Prometheus file"""
+        record = self.record()
+        with open(path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(record) + '\n')
+        if prom_path:
+            # Written aside and renamed, so a collector never reads half a file
+            tmp_path = prom_path + '.tmp'
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                f.write(self.prometheus(record))
+            os.replace(tmp_path, prom_path)
+        return record
+
+    def summary_lines(self):
+        """One line per source, slowest first"""
+        record = self.record()
+        lines = []
+        for source, totals in sorted(record['sources'].items(), key=lambda item: -item[1]['seconds']):
+            lines.append(f"{source}: {totals['seconds']:.1f}s, {totals['fetches']} fetches "
+                         f"({totals['bytes'] / 1024:.0f} KiB, {totals['errors']} errors), "
+                         f"parse {totals['parse_seconds']:.2f}s ({totals['parses_reused']} pages reused), "
+                         f"{totals['listings_kept']}/{totals['listings_found']} listings kept, "
+                         f"{totals['jobs']} jobs")
+        for key, counts in sorted(record['selectors'].items()):
+            if counts['misses']:
+                lines.append(f"{key} selector: {counts['misses']} misses, {counts['hits']} hits")
+        return lines
+
+
+_metrics = None
+_metrics_lock = threading.Lock()
+
+
+def start_run(bot_run_id=None):
+    """Begin recording a new run and return its RunMetrics"""
+    global _metrics
+    with _metrics_lock:
+        _metrics = RunMetrics(bot_run_id)
+        return _metrics
+
+
+def get_run_metrics():
+    """Return the metrics of the current run, starting one if needed"""
+    global _metrics
+    with _metrics_lock:
+        if _metrics is None:
+            _metrics = RunMetrics()
+        return _metrics
+
@@ -1,589 +1,781 @@
-from bs4 import BeautifulSoup
-import requests
 import re
 import time
 import json
+import queue
+import threading
 from urllib.parse import urljoin, quote
+from pagination import iter_pages
+from fetcher import get_engine
+from keyword_matcher import KeywordMatcher
+from html_parsing import ParsedPage, parse_listings
+from selector_cache import get_selector_cache
+from parse_cache import get_parse_cache
+from http_cache import get_cache
+from date_normalizer import add_timestamps, parse_absolute, to_timestamp
+from job_ids import NO_COMPANY, make_job_id
+from sources import SOURCES, SOURCE_TIMEOUT, register_source, get_source
+from crawl_stats import get_crawl_stats
+from run_metrics import get_run_metrics
 
-# Comprehensive keywords for filtering (including tech and non-tech roles)
-TECH_KEYWORDS = [
-    # Software Engineering
-    'software engineer', 'software developer', 'programming', 'coding', 'python', 'java', 
-    'javascript', 'react', 'node', 'web development', 'app development', 'mobile app', 
-    'android', 'ios', 'flutter', 'backend', 'frontend', 'fullstack', 'devops', 'cloud', 
-    'aws', 'database', 'sql', 'mongodb', 'api', 'tech', 'technology', 'IT', 'computer science',
-    'cybersecurity', 'blockchain', 'qa', 'testing', 'automation', 'selenium', 'framework', 
-    'git', 'docker', 'kubernetes', 'microservices', 'rest api', 'graphql',
-    
-    # AI/ML & Data Analytics
-    'artificial intelligence', 'machine learning', 'deep learning', 'neural network',
-    'data science', 'data analyst', 'data analytics', 'big data', 'statistics', 
-    'predictive analytics', 'business intelligence', 'tableau', 'power bi', 'excel',
-    'r programming', 'pandas', 'numpy', 'tensorflow', 'pytorch', 'scikit-learn',
-    'nlp', 'computer vision', 'opencv', 'keras', 'jupyter', 'spark', 'hadoop',
-    
-    # UI/UX Design
-    'ui/ux', 'ui designer', 'ux designer', 'user interface', 'user experience',
-    'graphic design', 'web design', 'figma', 'adobe', 'sketch', 'wireframe',
-    'prototype', 'user research', 'usability', 'interaction design',
-    
-    # Business Development & Marketing
-    'business development', 'business analyst', 'business intelligence', 'strategy',
-    'market research', 'sales', 'marketing', 'product management', 'product manager',
-    'digital marketing', 'social media', 'content marketing', 'growth hacking',
-    'brand management', 'advertising', 'promotion', 'campaign', 'lead generation',
-    'customer acquisition', 'business strategy', 'market analysis', 'competitive analysis',
-    
-    # Finance & Accounting
-    'finance', 'financial analyst', 'accounting', 'investment', 'banking', 'equity research',
-    'financial modeling', 'portfolio management', 'risk management', 'audit', 'taxation',
-    'corporate finance', 'financial planning', 'budget', 'cost analysis', 'valuation',
-    'trading', 'wealth management', 'insurance', 'credit analysis', 'financial services',
-    
-    # Human Resources
-    'human resource', 'hr', 'talent acquisition', 'recruitment', 'hiring', 'staffing',
-    'employee relations', 'compensation', 'benefits', 'training', 'learning development',
-    'organizational development', 'performance management', 'payroll', 'hr analytics',
-    
-    # Operations & Supply Chain
-    'operations', 'supply chain', 'logistics', 'procurement', 'vendor management',
-    'process improvement', 'quality assurance', 'production', 'manufacturing',
-    'project management', 'program management', 'operations research', 'lean', 'six sigma',
-    
-    # Consulting & Strategy
-    'consulting', 'strategy consulting', 'management consulting', 'business consulting',
-    'strategy', 'strategic planning', 'business transformation', 'change management',
-    'process consulting', 'operational consulting', 'advisory', 'client engagement',
-    
-    # Sales & Customer Success
-    'sales', 'sales development', 'account management', 'customer success', 'customer service',
-    'client relations', 'business development', 'partnership', 'channel sales',
-    'inside sales', 'field sales', 'retail', 'customer experience', 'crm',
-    
-    # Content & Communications
-    'content', 'content writing', 'copywriting', 'communications', 'public relations',
-    'journalism', 'editorial', 'blogging', 'social media management', 'community management',
-    'marketing communications', 'internal communications', 'corporate communications',
-    
-    # Legal & Compliance
-    'legal', 'law', 'compliance', 'regulatory', 'contract', 'legal research',
-    'paralegal', 'corporate law', 'intellectual property', 'litigation', 'legal affairs',
-    
-    # Research & Analytics (Non-Tech)
-    'research', 'market research', 'policy research', 'economic research', 'survey research',
-    'primary research', 'secondary research', 'research analyst', 'insights', 'analytics',
-    
-    # Non-Tech Specialized Roles
-    'esg', 'environmental social governance', 'sustainability', 'ccass', 'compliance',
-    'environment engineer', 'environmental engineering', 'climate', 'carbon',
-    'renewable energy', 'green technology', 'corporate social responsibility',
-    'risk management', 'audit', 'finance', 'consulting', 'research', 'policy',
-    
-    # General Business & Admin
-    'business', 'administration', 'office', 'coordinator', 'assistant', 'associate',
-    'analyst', 'specialist', 'executive', 'manager', 'trainee', 'graduate',
-    'entry level', 'fresher', 'junior', 'intern', 'internship'
-]
+# Comprehensive keywords for filtering (including tech and non-tech roles), by category
+KEYWORD_CATEGORIES = {
+    'Software Engineering': [
+        'software engineer', 'software developer', 'programming', 'coding', 'python', 'java',
+        'javascript', 'react', 'node', 'web development', 'app development', 'mobile app',
+        'android', 'ios', 'flutter', 'backend', 'frontend', 'fullstack', 'devops', 'cloud',
+        'aws', 'database', 'sql', 'mongodb', 'api', 'tech', 'technology', 'IT', 'computer science',
+        'cybersecurity', 'blockchain', 'qa', 'testing', 'automation', 'selenium', 'framework',
+        'git', 'docker', 'kubernetes', 'microservices', 'rest api', 'graphql'
+    ],
+    'AI/ML & Data Analytics': [
+        'artificial intelligence', 'machine learning', 'deep learning', 'neural network',
+        'data science', 'data analyst', 'data analytics', 'big data', 'statistics',
+        'predictive analytics', 'business intelligence', 'tableau', 'power bi', 'excel',
+        'r programming', 'pandas', 'numpy', 'tensorflow', 'pytorch', 'scikit-learn',
+        'nlp', 'computer vision', 'opencv', 'keras', 'jupyter', 'spark', 'hadoop'
+    ],
+    'UI/UX Design': [
+        'ui/ux', 'ui designer', 'ux designer', 'user interface', 'user experience',
+        'graphic design', 'web design', 'figma', 'adobe', 'sketch', 'wireframe',
+        'prototype', 'user research', 'usability', 'interaction design'
+    ],
+    'Business Development & Marketing': [
+        'business development', 'business analyst', 'business intelligence', 'strategy',
+        'market research', 'sales', 'marketing', 'product management', 'product manager',
+        'digital marketing', 'social media', 'content marketing', 'growth hacking',
+        'brand management', 'advertising', 'promotion', 'campaign', 'lead generation',
+        'customer acquisition', 'business strategy', 'market analysis', 'competitive analysis'
+    ],
+    'Finance & Accounting': [
+        'finance', 'financial analyst', 'accounting', 'investment', 'banking', 'equity research',
+        'financial modeling', 'portfolio management', 'risk management', 'audit', 'taxation',
+        'corporate finance', 'financial planning', 'budget', 'cost analysis', 'valuation',
+        'trading', 'wealth management', 'insurance', 'credit analysis', 'financial services'
+    ],
+    'Human Resources': [
+        'human resource', 'hr', 'talent acquisition', 'recruitment', 'hiring', 'staffing',
+        'employee relations', 'compensation', 'benefits', 'training', 'learning development',
+        'organizational development', 'performance management', 'payroll', 'hr analytics'
+    ],
+    'Operations & Supply Chain': [
+        'operations', 'supply chain', 'logistics', 'procurement', 'vendor management',
+        'process improvement', 'quality assurance', 'production', 'manufacturing',
+        'project management', 'program management', 'operations research', 'lean', 'six sigma'
+    ],
+    'Consulting & Strategy': [
+        'consulting', 'strategy consulting', 'management consulting', 'business consulting',
+        'strategy', 'strategic planning', 'business transformation', 'change management',
+        'process consulting', 'operational consulting', 'advisory', 'client engagement'
+    ],
+    'Sales & Customer Success': [
+        'sales', 'sales development', 'account management', 'customer success', 'customer service',
+        'client relations', 'business development', 'partnership', 'channel sales',
+        'inside sales', 'field sales', 'retail', 'customer experience', 'crm'
+    ],
+    'Content & Communications': [
+        'content', 'content writing', 'copywriting', 'communications', 'public relations',
+        'journalism', 'editorial', 'blogging', 'social media management', 'community management',
+        'marketing communications', 'internal communications', 'corporate communications'
+    ],
+    'Legal & Compliance': [
+        'legal', 'law', 'compliance', 'regulatory', 'contract', 'legal research',
+        'paralegal', 'corporate law', 'intellectual property', 'litigation', 'legal affairs'
+    ],
+    'Research & Analytics (Non-Tech)': [
+        'research', 'market research', 'policy research', 'economic research', 'survey research',
+        'primary research', 'secondary research', 'research analyst', 'insights', 'analytics'
+    ],
+    'Non-Tech Specialized Roles': [
+        'esg', 'environmental social governance', 'sustainability', 'ccass', 'compliance',
+        'environment engineer', 'environmental engineering', 'climate', 'carbon',
+        'renewable energy', 'green technology', 'corporate social responsibility',
+        'risk management', 'audit', 'finance', 'consulting', 'research', 'policy'
+    ],
+    'General Business & Admin': [
+        'business', 'administration', 'office', 'coordinator', 'assistant', 'associate',
+        'analyst', 'specialist', 'executive', 'manager', 'trainee', 'graduate',
+        'entry level', 'fresher', 'junior', 'intern', 'internship'
+    ]
+}
+
+# Flat keyword list kept for existing callers
+TECH_KEYWORDS = [keyword for keywords in KEYWORD_CATEGORIES.values() for keyword in keywords]
+
+def _keyword_categories():
+    """Map each keyword to the first category it is listed under"""
+    categories = {}
+    for category, keywords in KEYWORD_CATEGORIES.items():
+        for keyword in keywords:
+            categories.setdefault(keyword.lower(), category)
+    return categories
+
+# Built once at import from the deduplicated, lowercased keywords
+RELEVANCE_MATCHER = KeywordMatcher(_keyword_categories())
+
+def match_relevant_keyword(title, company=""):
+    """Return the KeywordMatch (keyword, category) that makes a listing relevant, or None"""
+    return RELEVANCE_MATCHER.search(f"{title} {company}")
 
 def is_relevant_internship(title, company=""):
     """Check if internship is relevant based on title and company (includes both tech and non-tech roles)"""
-    text_to_check = f"{title} {company}".lower()
-    
-    for keyword in TECH_KEYWORDS:
-        if keyword.lower() in text_to_check:
-            return True
-    return False
+    return match_relevant_keyword(title, company) is not None
+
+# Date text patterns found in listing cards, compiled once
+INTERNSHALA_POSTED_RE = re.compile(r'(\d+\s+(?:day|week|month)s?\s+ago)', re.IGNORECASE)
+INTERNSHALA_DEADLINE_RE = re.compile(r'(?:apply\s+by|last\s+date|deadline)[:\s]*([^a-z]*(?:\d{1,2}[^\w]*(?:jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)|\d{1,2}[/-]\d{1,2}[/-]?\d{0,4}))', re.IGNORECASE)
+TIMESJOBS_POSTED_RE = re.compile(r'posted:?\s*([^|]*(?:ago|[0-9]{1,2}[/-][0-9]{1,2}))', re.IGNORECASE)
+TIMESJOBS_DEADLINE_RE = re.compile(r'(?:apply by|last date|deadline):?\s*([^|]*(?:[0-9]{1,2}[/-][0-9]{1,2}|[a-z]{3,}))', re.IGNORECASE)
 
-def scrape_internshala():
-    """Scrape tech internships from Internshala"""
+# Search for specific categories on Internshala (both tech and non-tech)
+INTERNSHALA_URLS = [
+    # Tech categories
+    "https://internshala.com/internships/computer-science",
+    "https://internshala.com/internships/web-development", 
+    "https://internshala.com/internships/software-development",
+    "https://internshala.com/internships/data-science",
+    "https://internshala.com/internships/android-app-development",
+    "https://internshala.com/internships/python",
+    "https://internshala.com/internships/machine-learning",
+    "https://internshala.com/internships/artificial-intelligence",
+    "https://internshala.com/internships/ui-ux-design",
+    
+    # Non-tech categories
+    "https://internshala.com/internships/business-development",
+    "https://internshala.com/internships/marketing",
+    "https://internshala.com/internships/finance",
+    "https://internshala.com/internships/human-resources",
+    "https://internshala.com/internships/sales",
+    "https://internshala.com/internships/content-writing",
+    "https://internshala.com/internships/consulting",
+    "https://internshala.com/internships/operations",
+    "https://internshala.com/internships/research",
+    "https://internshala.com/internships/analytics",
+    "https://internshala.com/internships/administration",
+    "https://internshala.com/internships/business-analyst",
+    
+    "https://internshala.com/internships"  # General search as fallback
+]
+
+# LinkedIn job search terms for internships (both tech and non-tech)
+LINKEDIN_SEARCHES = [
+    # Tech searches
+    "software%20engineer%20internship",
+    "data%20science%20internship", 
+    "python%20internship",
+    "machine%20learning%20internship",
+    
+    # Non-tech searches
+    "business%20development%20internship",
+    "marketing%20internship",
+    "finance%20internship",
+    "consulting%20internship",
+    "sales%20internship",
+    "human%20resources%20internship",
+    "operations%20internship",
+    "research%20internship"
+]
+
+# TimesJobs search terms (both tech and non-tech)
+TIMESJOBS_SEARCHES = [
+    # Tech searches
+    "software+developer+intern",
+    "data+science+intern",
+    "python+intern",
+    
+    # Non-tech searches
+    "business+development+intern",
+    "marketing+intern",
+    "finance+intern", 
+    "sales+intern",
+    "hr+intern",
+    "consulting+intern",
+    "operations+intern"
+]
+
+
+def internshala_page_url(url, page=1):
+    """URL of page number page of an Internshala category"""
+    if page <= 1:
+        return url
+    return f"{url.rstrip('/')}/page-{page}"
+
+
+def linkedin_search_url(search_term, page=1):
+    """Build LinkedIn's public job search URL for a search term (25 results per page)"""
+    url = f"https://www.linkedin.com/jobs/search?keywords={search_term}&location=India&distance=25&f_JT=I&f_E=1%2C2"
+    if page > 1:
+        url += f"&start={(page - 1) * 25}"
+    return url
+
+
+def timesjobs_search_url(search_term, page=1):
+    """Build the TimesJobs search URL for a search term"""
+    url = f"https://www.timesjobs.com/candidate/job-search.html?searchType=personalizedSearch&from=submit&txtKeywords={search_term}&txtLocation=India"
+    if page > 1:
+        url += f"&sequence={page}&startPage=1"
+    return url
+
+
+def is_new_job(job, seen_ids):
+    """Whether job counts towards a source's result cap"""
+    return seen_ids is None or job['id'] not in seen_ids
+
+
+def response_latency(response):
+    """Seconds the request took, when the response knows"""
+    elapsed = getattr(response, 'elapsed', None)
+    return elapsed.total_seconds() if elapsed else None
+
+
+def parse_internshala_page(content, limit=None):
+    """Extract relevant internships from one Internshala category page"""
+    start = time.perf_counter()
+    if limit is None:
+        limit = get_source('internshala').per_page
+    soup = parse_listings(content, 'internshala')
+    
+    jobs = []
+    listings = soup.select(".individual_internship")[:limit]
+    
+    for listing in listings:
+        # Get title using correct selector
+        title_tag = listing.select_one(".job-title-href")
+        if not title_tag:
+            continue
+        title = title_tag.get_text(strip=True)
+
+        # Company name selector
+        company_tag = listing.select_one(".company-name")
+        company = (company_tag.get_text(strip=True) if company_tag else '') or NO_COMPANY
+
+        # Include relevant internships (broader criteria now)
+        if not (is_relevant_internship(title, company) or 'intern' in title.lower() or 'trainee' in title.lower()):
+            continue
+
+        # Link
+        link_tag = listing.select_one("a")
+        link = "https://internshala.com" + link_tag['href'] if link_tag else "#"
+
+        # Extract dates
+        posted_date = "Not specified"
+        deadline = "Not specified"
+        
+        try:
+            # Get all text from the listing for pattern matching
+            listing_text = listing.get_text()
+            
+            # Pattern for "X days ago", "X weeks ago", "X months ago"
+            posted_pattern = INTERNSHALA_POSTED_RE.search(listing_text)
+            if posted_pattern:
+                posted_date = posted_pattern.group(1)
+            
+            # Pattern for "Apply by" or "Last date" with dates
+            deadline_pattern = INTERNSHALA_DEADLINE_RE.search(listing_text)
+            if deadline_pattern:
+                deadline = deadline_pattern.group(1).strip()
+            
+            # Alternative: look for specific selectors
+            date_elements = listing.select(".date, .posted_date, .apply_by, .deadline, .posted-date")
+            for date_elem in date_elements:
+                date_text = date_elem.get_text(strip=True)
+                if 'ago' in date_text.lower():
+                    posted_date = date_text
+                elif any(word in date_text.lower() for word in ['apply by', 'deadline', 'last date']):
+                    deadline = date_text
+            
+        except Exception as e:
+            pass
+
+        # Unique job ID (digest of the canonical listing URL)
+        job_id = make_job_id('internshala', url=link, title=title, company=company)
+
+        jobs.append(add_timestamps({
+            "id": job_id,
+            "title": title,
+            "company": company,
+            "link": link,
+            "source": "Internshala",
+            "posted_date": posted_date,
+            "deadline": deadline
+        }))
+    
+    get_run_metrics().record_parse('internshala', time.perf_counter() - start,
+                                   len(listings[:limit]), len(jobs))
+    return ParsedPage(jobs, found=len(listings))
+
+
+@register_source('internshala', "Internshala", host='internshala.com',
+                 rate=2.0, burst=4, concurrency=4, max_results=20)
+def scrape_internshala(seen_ids=None):
+    """Scrape tech internships from Internshala, yielding each as it is parsed"""
     print("Scraping Internshala...")
     
-    # Search for specific categories on Internshala (both tech and non-tech)
-    tech_urls = [
-        # Tech categories
-        "https://internshala.com/internships/computer-science",
-        "https://internshala.com/internships/web-development", 
-        "https://internshala.com/internships/software-development",
-        "https://internshala.com/internships/data-science",
-        "https://internshala.com/internships/android-app-development",
-        "https://internshala.com/internships/python",
-        "https://internshala.com/internships/machine-learning",
-        "https://internshala.com/internships/artificial-intelligence",
-        "https://internshala.com/internships/ui-ux-design",
+    source = get_source('internshala')
+    found_ids = set()
+    new_count = 0
+    
+    # The crawl budget goes to the categories that have yielded the most new
+    # jobs per fetch. Their pages are fetched concurrently, going deeper only
+    # while pages are mostly unseen
+    stats = get_crawl_stats()
+    urls = stats.plan(INTERNSHALA_URLS)
+    pages = iter_pages(urls, internshala_page_url, parse_internshala_page, seen_ids,
+                       max_pages=source.max_pages, source=source.key, profile='internshala', timeout=10)
+    
+    for url, page in pages:
+        latency = response_latency(page.response)
+        if page.error:
+            stats.record_fetch(url, latency, error=True)
+            print(f"⚠️ Error scraping {page.url}: {page.error}")
+            continue
         
-        # Non-tech categories
-        "https://internshala.com/internships/business-development",
-        "https://internshala.com/internships/marketing",
-        "https://internshala.com/internships/finance",
-        "https://internshala.com/internships/human-resources",
-        "https://internshala.com/internships/sales",
-        "https://internshala.com/internships/content-writing",
-        "https://internshala.com/internships/consulting",
-        "https://internshala.com/internships/operations",
-        "https://internshala.com/internships/research",
-        "https://internshala.com/internships/analytics",
-        "https://internshala.com/internships/administration",
-        "https://internshala.com/internships/business-analyst",
+        if page.response.status_code != 200:
+            stats.record_fetch(url, latency, error=True)
+            print(f"   Status code {page.response.status_code}: {page.url}")
+            continue
+        stats.record_fetch(url, latency, listings=len(page.jobs))
         
-        "https://internshala.com/internships"  # General search as fallback
-    ]
-    
-    results = []
-    
-    for url in tech_urls:
+        for internship_data in page.jobs:
+            # Avoid duplicates
+            if internship_data['id'] in found_ids:
+                stats.record_outcome(url, new=False)
+                continue
+            found_ids.add(internship_data['id'])
+            # Remembered so collect can credit new jobs to this category
+            internship_data['page_url'] = url
+            new_count += is_new_job(internship_data, seen_ids)
+            print(f"✅ Found: {internship_data['title']} at {internship_data['company']}")
+            yield internship_data
+        
+        # Limit total results to avoid overwhelming. Stopping here also stops
+        # the fetching, so no page goes unused or counts against its category
+        if new_count >= source.max_results:
+            break
+
+    print(f"📦 Internshala: Found {len(found_ids)} internships")
+
+
+# Fallback selectors, in order; the selector cache tries the last one that worked first
+LINKEDIN_LISTING_SELECTORS = [
+    ".job-search-card",
+    ".jobs-search__results-list li",
+    "[data-job-id]",
+    ".job-card-container",
+    ".job-card"
+]
+
+LINKEDIN_TITLE_SELECTORS = [
+    ".job-search-card__title a",
+    ".sr-only",
+    "h3 a",
+    ".job-title",
+    "a[data-tracking-control-name='public_jobs_jserp-result_search-card']"
+]
+
+LINKEDIN_COMPANY_SELECTORS = [
+    ".job-search-card__subtitle-link",
+    ".job-card-container__company-name",
+    "h4 a",
+    ".company-name"
+]
+
+
+def is_linkedin_title(elem):
+    """Whether elem holds a real title rather than a screen-reader or "Show more" label"""
+    title = elem.get_text(strip=True)
+    return bool(title) and len(title) > 5 and not title.startswith('Show more')
+
+
+def parse_linkedin_page(content, limit=None):
+    """Extract relevant internships from one LinkedIn search results page"""
+    start = time.perf_counter()
+    if limit is None:
+        limit = get_source('linkedin').per_page
+    # [data-job-id] cards aren't covered by the class strainer, hence the fallback
+    soup = parse_listings(content, 'linkedin', fallback=True)
+    
+    selectors = get_selector_cache()
+    selectors.begin_page('linkedin')
+    listings = selectors.select('linkedin', 'listing', soup, LINKEDIN_LISTING_SELECTORS)
+    if listings:
+        print(f"   Found {len(listings)} listings")
+    
+    jobs = []
+    for listing in listings[:limit]:
         try:
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-            }
-            response = requests.get(url, headers=headers, timeout=10)
-            soup = BeautifulSoup(response.text, 'html.parser')
-            
-            listings = soup.select(".individual_internship")[:10]  # Get more listings
-            
-            for listing in listings:
-                # Get title using correct selector
-                title_tag = listing.select_one(".job-title-href")
-                if not title_tag:
-                    continue
-                title = title_tag.get_text(strip=True)
-
-                # Company name selector
-                company_tag = listing.select_one(".company-name")
-                company = company_tag.get_text(strip=True) if company_tag else "Unknown Company"
-
-                # Include relevant internships (broader criteria now)
-                if not (is_relevant_internship(title, company) or 'intern' in title.lower() or 'trainee' in title.lower()):
-                    continue
-
-                # Link
-                link_tag = listing.select_one("a")
-                link = "https://internshala.com" + link_tag['href'] if link_tag else "#"
-
-                # Extract dates
-                posted_date = "Not specified"
-                deadline = "Not specified"
+            # Extract title
+            title_elem = selectors.select_one('linkedin', 'title', listing, LINKEDIN_TITLE_SELECTORS,
+                                              accept=is_linkedin_title)
+            title = title_elem.get_text(strip=True) if title_elem else None
+            
+            if not title:
+                continue
+            
+            # Extract company
+            company_elem = selectors.select_one('linkedin', 'company', listing, LINKEDIN_COMPANY_SELECTORS,
+                                                accept=lambda elem: elem.get_text(strip=True))
+            company = company_elem.get_text(strip=True) if company_elem else None
+            
+            company = company or NO_COMPANY
+            
+            # Check relevance
+            if not (is_relevant_internship(title, company) or 'intern' in title.lower()):
+                continue
+            
+            # Extract link
+            link_elem = listing.select_one("a") or listing.select_one(".job-search-card__title a")
+            link = link_elem.get('href', '#') if link_elem else '#'
+            
+            if link.startswith('/'):
+                link = "https://www.linkedin.com" + link
+            
+            # Stable ID from the listing URL, or from title + company without one
+            job_id = make_job_id('linkedin', url=link, title=title, company=company)
+            
+            if not link.startswith('http'):
+                link = f"https://www.linkedin.com/jobs/view/{job_id.rsplit('_', 1)[-1]}"
+            
+            # Extract dates
+            posted_date = "Not specified"
+            posted_at = None
+            deadline = "Not specified"
+            
+            try:
+                # Look for LinkedIn date elements
+                date_elements = listing.select(".job-search-card__listitem time, .job-posting-date, time")
+                for date_elem in date_elements:
+                    date_text = date_elem.get_text(strip=True)
+                    if date_text and len(date_text) > 2:
+                        posted_date = date_text
+                        # <time datetime="2026-01-15"> is exact, unlike "2 weeks ago"
+                        posted_at = to_timestamp(parse_absolute(date_elem.get('datetime')))
+                        break
                 
-                try:
-                    # Get all text from the listing for pattern matching
-                    listing_text = listing.get_text()
-                    
-                    # Look for Internshala-specific date patterns
-                    import re
-                    
-                    # Pattern for "X days ago", "X weeks ago", "X months ago"
-                    posted_pattern = re.search(r'(\d+\s+(?:day|week|month)s?\s+ago)', listing_text, re.IGNORECASE)
-                    if posted_pattern:
-                        posted_date = posted_pattern.group(1)
-                    
-                    # Pattern for "Apply by" or "Last date" with dates
-                    deadline_pattern = re.search(r'(?:apply\s+by|last\s+date|deadline)[:\s]*([^a-z]*(?:\d{1,2}[^\w]*(?:jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)|\d{1,2}[/-]\d{1,2}[/-]?\d{0,4}))', listing_text, re.IGNORECASE)
-                    if deadline_pattern:
-                        deadline = deadline_pattern.group(1).strip()
-                    
-                    # Alternative: look for specific selectors
-                    date_elements = listing.select(".date, .posted_date, .apply_by, .deadline, .posted-date")
-                    for date_elem in date_elements:
-                        date_text = date_elem.get_text(strip=True)
-                        if 'ago' in date_text.lower():
-                            posted_date = date_text
-                        elif any(word in date_text.lower() for word in ['apply by', 'deadline', 'last date']):
-                            deadline = date_text
-                    
-                except Exception as e:
-                    pass
-
-                # Unique job ID (using last part of URL)
-                job_id = link.split('/')[-1]
-
-                internship_data = {
-                    "id": "internshala_" + job_id,
-                    "title": title,
-                    "company": company,
-                    "link": link,
-                    "source": "Internshala",
-                    "posted_date": posted_date,
-                    "deadline": deadline
-                }
+                # Look for any time-related text
+                time_texts = listing.find_all(string=True)
+                for text in time_texts:
+                    text = text.strip()
+                    if any(keyword in text.lower() for keyword in ['ago', 'posted', 'days', 'hours', 'weeks']):
+                        if 'ago' in text.lower() or 'posted' in text.lower():
+                            posted_date = text
+                            break
+            except:
+                pass
+            
+            jobs.append(add_timestamps({
+                "id": job_id,
+                "title": title,
+                "company": company,
+                "link": link,
+                "source": "LinkedIn",
+                "posted_date": posted_date,
+                "posted_at": posted_at,
+                "deadline": deadline
+            }))
                 
-                # Avoid duplicates
-                if not any(existing['id'] == internship_data['id'] for existing in results):
-                    results.append(internship_data)
-                    print(f"✅ Found: {title} at {company}")
-                    
         except Exception as e:
-            print(f"⚠️ Error scraping {url}: {e}")
             continue
-            
-        # Limit total results to avoid overwhelming
-        if len(results) >= 20:
-            break
-
-    print(f"📦 Internshala: Found {len(results)} internships")
-    return results
+    
+    selectors.end_page('linkedin')
+    get_run_metrics().record_parse('linkedin', time.perf_counter() - start,
+                                   len(listings[:limit]), len(jobs))
+    return ParsedPage(jobs, found=len(listings))
 
 
-def scrape_linkedin_jobs():
-    """Scrape publicly available job listings from LinkedIn"""
+@register_source('linkedin', "LinkedIn", host='www.linkedin.com',
+                 rate=0.5, burst=2, concurrency=2, max_results=6)
+def scrape_linkedin_jobs(seen_ids=None):
+    """Scrape publicly available job listings from LinkedIn, yielding each as it is parsed"""
     print("🔍 Scraping LinkedIn Jobs...")
     
-    results = []
+    source = get_source('linkedin')
+    found_ids = set()
+    new_count = 0
     
     try:
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
-            'Accept-Language': 'en-US,en;q=0.5',
-            'Accept-Encoding': 'gzip, deflate, br',
-            'Connection': 'keep-alive'
-        }
+        # Searches run concurrently, paced at the registered rate, each going
+        # deeper only while its pages are mostly unseen
+        pages = iter_pages(LINKEDIN_SEARCHES, linkedin_search_url, parse_linkedin_page, seen_ids,
+                           max_pages=source.max_pages, source=source.key, profile='linkedin', timeout=15)
         
-        # LinkedIn job search URLs for internships (both tech and non-tech)
-        linkedin_searches = [
-            # Tech searches
-            "software%20engineer%20internship",
-            "data%20science%20internship", 
-            "python%20internship",
-            "machine%20learning%20internship",
-            
-            # Non-tech searches
-            "business%20development%20internship",
-            "marketing%20internship",
-            "finance%20internship",
-            "consulting%20internship",
-            "sales%20internship",
-            "human%20resources%20internship",
-            "operations%20internship",
-            "research%20internship"
-        ]
-        
-        for search_term in linkedin_searches:
-            try:
-                # Use LinkedIn's public job search
-                url = f"https://www.linkedin.com/jobs/search?keywords={search_term}&location=India&distance=25&f_JT=I&f_E=1%2C2"
-                print(f"   Checking LinkedIn for: {search_term.replace('%20', ' ')}")
-                
-                response = requests.get(url, headers=headers, timeout=15)
-                
-                if response.status_code != 200:
-                    print(f"   Status code: {response.status_code}")
-                    continue
-                
-                soup = BeautifulSoup(response.text, 'html.parser')
-                
-                # LinkedIn job listing selectors
-                selectors_to_try = [
-                    ".job-search-card",
-                    ".jobs-search__results-list li",
-                    "[data-job-id]",
-                    ".job-card-container",
-                    ".job-card"
-                ]
-                
-                listings = []
-                for selector in selectors_to_try:
-                    listings = soup.select(selector)
-                    if listings:
-                        print(f"   Found {len(listings)} listings with selector: {selector}")
-                        break
-                
-                for listing in listings[:6]:
-                    try:
-                        # Extract title
-                        title = None
-                        title_selectors = [
-                            ".job-search-card__title a",
-                            ".sr-only",
-                            "h3 a",
-                            ".job-title",
-                            "a[data-tracking-control-name='public_jobs_jserp-result_search-card']"
-                        ]
-                        
-                        for selector in title_selectors:
-                            title_elem = listing.select_one(selector)
-                            if title_elem:
-                                title = title_elem.get_text(strip=True)
-                                if title and len(title) > 5 and not title.startswith('Show more'):
-                                    break
-                        
-                        if not title:
-                            continue
-                        
-                        # Extract company
-                        company = None
-                        company_selectors = [
-                            ".job-search-card__subtitle-link",
-                            ".job-card-container__company-name",
-                            "h4 a",
-                            ".company-name"
-                        ]
-                        
-                        for selector in company_selectors:
-                            company_elem = listing.select_one(selector)
-                            if company_elem:
-                                company = company_elem.get_text(strip=True)
-                                if company:
-                                    break
-                        
-                        company = company or "Company Name Not Listed"
-                        
-                        # Check relevance
-                        if not (is_relevant_internship(title, company) or 'intern' in title.lower()):
-                            continue
-                        
-                        # Extract link
-                        link_elem = listing.select_one("a") or listing.select_one(".job-search-card__title a")
-                        link = link_elem.get('href', '#') if link_elem else '#'
-                        
-                        if link.startswith('/'):
-                            link = "https://www.linkedin.com" + link
-                        elif not link.startswith('http'):
-                            link = f"https://www.linkedin.com/jobs/view/{abs(hash(title + company)) % 1000000}"
-                        
-                        # Extract dates
-                        posted_date = "Not specified"
-                        deadline = "Not specified"
-                        
-                        try:
-                            # Look for LinkedIn date elements
-                            date_elements = listing.select(".job-search-card__listitem time, .job-posting-date, time")
-                            for date_elem in date_elements:
-                                date_text = date_elem.get_text(strip=True)
-                                if date_text and len(date_text) > 2:
-                                    posted_date = date_text
-                                    break
-                            
-                            # Look for any time-related text
-                            time_texts = listing.find_all(string=True)
-                            for text in time_texts:
-                                text = text.strip()
-                                if any(keyword in text.lower() for keyword in ['ago', 'posted', 'days', 'hours', 'weeks']):
-                                    if 'ago' in text.lower() or 'posted' in text.lower():
-                                        posted_date = text
-                                        break
-                        except:
-                            pass
-                        
-                        job_id = abs(hash(title + company + "linkedin")) % 1000000
-                        
-                        internship_data = {
-                            "id": f"linkedin_{job_id}",
-                            "title": title,
-                            "company": company,
-                            "link": link,
-                            "source": "LinkedIn",
-                            "posted_date": posted_date,
-                            "deadline": deadline
-                        }
-                        
-                        if not any(existing['id'] == internship_data['id'] for existing in results):
-                            results.append(internship_data)
-                            print(f"✅ Found: {title} at {company}")
-                            
-                    except Exception as e:
-                        continue
-                
-                time.sleep(2)  # LinkedIn is strict about rate limiting
-                        
-            except Exception as e:
-                print(f"⚠️ Error with LinkedIn search {search_term}: {e}")
+        for search_term, page in pages:
+            print(f"   Checking LinkedIn for: {search_term.replace('%20', ' ')} (page {page.page})")
+            
+            if page.error:
+                print(f"⚠️ Error with LinkedIn search {search_term}: {page.error}")
+                continue
+            
+            if page.response.status_code != 200:
+                print(f"   Status code: {page.response.status_code}")
                 continue
+            
+            for internship_data in page.jobs:
+                if internship_data['id'] not in found_ids:
+                    found_ids.add(internship_data['id'])
+                    new_count += is_new_job(internship_data, seen_ids)
+                    print(f"✅ Found: {internship_data['title']} at {internship_data['company']}")
+                    yield internship_data
                 
-            if len(results) >= 6:
+            if new_count >= source.max_results:
                 break
                 
     except Exception as e:
         print(f"⚠️ Error scraping LinkedIn: {e}")
     
-    print(f"📦 LinkedIn: Found {len(results)} internships")
-    return results
+    print(f"📦 LinkedIn: Found {len(found_ids)} internships")
+
 
+TIMESJOBS_LISTING_SELECTORS = [".srp-jobtitle-wrap", ".job-bx", ".joblist-comp-name"]
+TIMESJOBS_TITLE_SELECTORS = ["h2 a", ".joblist-comp-name a", "a"]
+TIMESJOBS_COMPANY_SELECTORS = [".joblist-comp-name", ".comp-name"]
 
-def scrape_timesjobs():
-    """Scrape internships from TimesJobs"""
+
+def parse_timesjobs_page(content, limit=None):
+    """Extract relevant internships from one TimesJobs search results page"""
+    start = time.perf_counter()
+    if limit is None:
+        limit = get_source('timesjobs').per_page
+    soup = parse_listings(content, 'timesjobs')
+    
+    # TimesJobs listing selectors
+    selectors = get_selector_cache()
+    selectors.begin_page('timesjobs')
+    listings = selectors.select('timesjobs', 'listing', soup, TIMESJOBS_LISTING_SELECTORS)
+    
+    jobs = []
+    for listing in listings[:limit]:
+        try:
+            # Extract title
+            title_elem = selectors.select_one('timesjobs', 'title', listing, TIMESJOBS_TITLE_SELECTORS)
+            if not title_elem:
+                continue
+            
+            title = title_elem.get_text(strip=True)
+            if not title or len(title) < 5:
+                continue
+            
+            # Extract company
+            company_elem = selectors.select_one('timesjobs', 'company', listing, TIMESJOBS_COMPANY_SELECTORS)
+            company = (company_elem.get_text(strip=True) if company_elem else '') or NO_COMPANY
+            
+            # Check relevance
+            if not (is_relevant_internship(title, company) or 'intern' in title.lower()):
+                continue
+            
+            # Extract link
+            link = title_elem.get('href', '#')
+            if link.startswith('/'):
+                link = f"https://www.timesjobs.com{link}"
+            
+            # Stable ID from the listing URL, or from title + company without one
+            job_id = make_job_id('timesjobs', url=link, title=title, company=company)
+            
+            if not link.startswith('http'):
+                link = f"https://www.timesjobs.com/job-detail/{job_id.rsplit('_', 1)[-1]}"
+            
+            # Extract dates
+            posted_date = "Not specified"
+            deadline = "Not specified"
+            
+            try:
+                # Look for TimesJobs date elements
+                date_elements = listing.select(".date, .posted-date, .last-date, .apply-by")
+                for date_elem in date_elements:
+                    date_text = date_elem.get_text(strip=True)
+                    if 'posted' in date_text.lower() or 'ago' in date_text.lower():
+                        posted_date = date_text
+                    elif 'last date' in date_text.lower() or 'apply by' in date_text.lower():
+                        deadline = date_text
+                
+                # Look for text patterns in the listing
+                all_text = listing.get_text()
+                # Look for patterns like "Posted: 2 days ago" or "Apply by: 15 Jan"
+                posted_match = TIMESJOBS_POSTED_RE.search(all_text)
+                if posted_match:
+                    posted_date = posted_match.group(1).strip()
+                
+                deadline_match = TIMESJOBS_DEADLINE_RE.search(all_text)
+                if deadline_match:
+                    deadline = deadline_match.group(1).strip()
+            except:
+                pass
+            
+            jobs.append(add_timestamps({
+                "id": job_id,
+                "title": title,
+                "company": company,
+                "link": link,
+                "source": "TimesJobs",
+                "posted_date": posted_date,
+                "deadline": deadline
+            }))
+                
+        except Exception as e:
+            continue
+    
+    selectors.end_page('timesjobs')
+    get_run_metrics().record_parse('timesjobs', time.perf_counter() - start,
+                                   len(listings[:limit]), len(jobs))
+    return ParsedPage(jobs, found=len(listings))
+
+
+@register_source('timesjobs', "TimesJobs", host='www.timesjobs.com',
+                 rate=1.0, burst=2, concurrency=2, max_results=5)
+def scrape_timesjobs(seen_ids=None):
+    """Scrape internships from TimesJobs, yielding each as it is parsed"""
     print("🔍 Scraping TimesJobs...")
     
-    results = []
+    source = get_source('timesjobs')
+    found_ids = set()
+    new_count = 0
     
     try:
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
-            'Accept-Language': 'en-US,en;q=0.5'
-        }
-        
-        # TimesJobs search URLs (both tech and non-tech)
-        timesjobs_searches = [
-            # Tech searches
-            "software+developer+intern",
-            "data+science+intern",
-            "python+intern",
-            
-            # Non-tech searches
-            "business+development+intern",
-            "marketing+intern",
-            "finance+intern", 
-            "sales+intern",
-            "hr+intern",
-            "consulting+intern",
-            "operations+intern"
-        ]
+        # Each search goes deeper only while its pages are mostly unseen
+        pages = iter_pages(TIMESJOBS_SEARCHES, timesjobs_search_url, parse_timesjobs_page, seen_ids,
+                           max_pages=source.max_pages, source=source.key, profile='timesjobs', timeout=15)
         
-        for search_term in timesjobs_searches:
-            try:
-                url = f"https://www.timesjobs.com/candidate/job-search.html?searchType=personalizedSearch&from=submit&txtKeywords={search_term}&txtLocation=India"
-                print(f"   Checking TimesJobs for: {search_term.replace('+', ' ')}")
-                
-                response = requests.get(url, headers=headers, timeout=15)
-                
-                if response.status_code != 200:
-                    print(f"   Status code: {response.status_code}")
-                    continue
-                
-                soup = BeautifulSoup(response.text, 'html.parser')
-                
-                # TimesJobs listing selectors
-                listings = soup.select(".srp-jobtitle-wrap") or soup.select(".job-bx") or soup.select(".joblist-comp-name")
-                
-                for listing in listings[:5]:
-                    try:
-                        # Extract title
-                        title_elem = listing.select_one("h2 a") or listing.select_one(".joblist-comp-name a") or listing.select_one("a")
-                        if not title_elem:
-                            continue
-                        
-                        title = title_elem.get_text(strip=True)
-                        if not title or len(title) < 5:
-                            continue
-                        
-                        # Extract company
-                        company_elem = listing.select_one(".joblist-comp-name") or listing.select_one(".comp-name")
-                        company = company_elem.get_text(strip=True) if company_elem else "Company Name Not Listed"
-                        
-                        # Check relevance
-                        if not (is_relevant_internship(title, company) or 'intern' in title.lower()):
-                            continue
-                        
-                        # Extract link
-                        link = title_elem.get('href', '#')
-                        if not link.startswith('http'):
-                            link = f"https://www.timesjobs.com/{link}" if link.startswith('/') else f"https://www.timesjobs.com/job-detail/{abs(hash(title + company)) % 100000}"
-                        
-                        # Extract dates
-                        posted_date = "Not specified"
-                        deadline = "Not specified"
-                        
-                        try:
-                            # Look for TimesJobs date elements
-                            date_elements = listing.select(".date, .posted-date, .last-date, .apply-by")
-                            for date_elem in date_elements:
-                                date_text = date_elem.get_text(strip=True)
-                                if 'posted' in date_text.lower() or 'ago' in date_text.lower():
-                                    posted_date = date_text
-                                elif 'last date' in date_text.lower() or 'apply by' in date_text.lower():
-                                    deadline = date_text
-                            
-                            # Look for text patterns in the listing
-                            all_text = listing.get_text()
-                            import re
-                            # Look for patterns like "Posted: 2 days ago" or "Apply by: 15 Jan"
-                            posted_match = re.search(r'posted:?\s*([^|]*(?:ago|[0-9]{1,2}[/-][0-9]{1,2}))', all_text, re.IGNORECASE)
-                            if posted_match:
-                                posted_date = posted_match.group(1).strip()
-                            
-                            deadline_match = re.search(r'(?:apply by|last date|deadline):?\s*([^|]*(?:[0-9]{1,2}[/-][0-9]{1,2}|[a-z]{3,}))', all_text, re.IGNORECASE)
-                            if deadline_match:
-                                deadline = deadline_match.group(1).strip()
-                        except:
-                            pass
-                        
-                        job_id = abs(hash(title + company + "timesjobs")) % 1000000
-                        
-                        internship_data = {
-                            "id": f"timesjobs_{job_id}",
-                            "title": title,
-                            "company": company,
-                            "link": link,
-                            "source": "TimesJobs",
-                            "posted_date": posted_date,
-                            "deadline": deadline
-                        }
-                        
-                        if not any(existing['id'] == internship_data['id'] for existing in results):
-                            results.append(internship_data)
-                            print(f"✅ Found: {title} at {company}")
-                            
-                    except Exception as e:
-                        continue
-                
-                time.sleep(1)
-                        
-            except Exception as e:
-                print(f"⚠️ Error with TimesJobs search {search_term}: {e}")
+        for search_term, page in pages:
+            print(f"   Checking TimesJobs for: {search_term.replace('+', ' ')} (page {page.page})")
+            
+            if page.error:
+                print(f"⚠️ Error with TimesJobs search {search_term}: {page.error}")
                 continue
+            
+            if page.response.status_code != 200:
+                print(f"   Status code: {page.response.status_code}")
+                continue
+            
+            for internship_data in page.jobs:
+                if internship_data['id'] not in found_ids:
+                    found_ids.add(internship_data['id'])
+                    new_count += is_new_job(internship_data, seen_ids)
+                    print(f"✅ Found: {internship_data['title']} at {internship_data['company']}")
+                    yield internship_data
                 
-            if len(results) >= 5:
+            if new_count >= source.max_results:
                 break
                 
     except Exception as e:
         print(f"⚠️ Error scraping TimesJobs: {e}")
     
-    print(f"📦 TimesJobs: Found {len(results)} internships")
-    return results
+    print(f"📦 TimesJobs: Found {len(found_ids)} internships")
 
 
-def scrape_all():
-    """Scrape from all working sources and combine results"""
-    print("\nStarting comprehensive internship search...")
-    
-    all_results = []
-    
-    # Scrape from working sources only (with error handling for each)
-    try:
-        all_results.extend(scrape_internshala())
-    except Exception as e:
-        print(f"⚠️ Internshala failed: {e}")
-    
+@register_source('freshersworld', "Company Careers", host='www.freshersworld.com',
+                 rate=1.0, burst=1, concurrency=1)
+def scrape_company_careers(seen_ids=None):
+    """Scrape company career opportunities (imported lazily like before)"""
+    from company_job_aggregator import scrape_company_careers as scrape_careers
+    career_jobs = scrape_careers()
+    print(f"✅ Company Careers: Found {len(career_jobs)} positions")
+    yield from career_jobs
+
+
+# Jobs buffered between the source threads and the consumer
+STREAM_BUFFER = 100
+
+_DONE = object()
+
+
+def _put(out, item, cancelled):
+    """Put item on out, giving up once the consumer has stopped listening"""
+    while not cancelled.is_set():
+        try:
+            out.put(item, timeout=0.5)
+            return True
+        except queue.Full:
+            continue
+    return False
+
+
+def _run_source(source, seen_ids, out, cancelled):
+    """Stream one source's jobs onto out, then a _DONE marker"""
     try:
-        all_results.extend(scrape_linkedin_jobs())
+        for job in source.scrape(seen_ids):
+            if not _put(out, (source.key, job), cancelled):
+                return
     except Exception as e:
-        print(f"⚠️ LinkedIn failed: {e}")
+        get_run_metrics().record_error(source.key)
+        print(f"⚠️ {source.name} failed: {e}")
+    _put(out, (source.key, _DONE), cancelled)
+
+
+def iter_all(seen_ids=None):
+    """Yield unique jobs from every registered source as soon as they are parsed.
+
+    Each source runs in its own thread. One that is still going after its
+    timeout is abandoned, so a hanging site doesn't hold up the others.
+    With seen_ids, paginated sources stop at pages of already-seen listings.
+    """
+    print("\nStarting comprehensive internship search...")
     
-    try:
-        all_results.extend(scrape_timesjobs())
-    except Exception as e:
-        print(f"⚠️ TimesJobs failed: {e}")
+    out = queue.Queue(maxsize=STREAM_BUFFER)
+    cancelled = threading.Event()
+    start = time.monotonic()
+    running = {}
+    for source in SOURCES:
+        running[source.key] = (source, start + (source.timeout or SOURCE_TIMEOUT))
+        threading.Thread(target=_run_source, args=(source, seen_ids, out, cancelled),
+                         name=f"source-{source.key}", daemon=True).start()
     
-    # NEW: Scrape company career opportunities
+    unique_ids = set()
+    source_counts = {}
+    key_counts = {}
+    metrics = get_run_metrics()
     try:
-        from company_job_aggregator import scrape_company_careers
-        career_jobs = scrape_company_careers()
-        all_results.extend(career_jobs)
-        print(f"✅ Company Careers: Found {len(career_jobs)} positions")
-    except Exception as e:
-        print(f"⚠️ Company Careers failed: {e}")
-    
-    # Remove duplicates by job id and similar titles
-    unique_results = {}
-    for job in all_results:
-        # Use ID as primary key
-        if job['id'] not in unique_results:
-            unique_results[job['id']] = job
-    
-    final_results = list(unique_results.values())
+        while running:
+            next_deadline = min(deadline for _, deadline in running.values())
+            try:
+                key, job = out.get(timeout=max(0, next_deadline - time.monotonic()))
+            except queue.Empty:
+                now = time.monotonic()
+                for key, (source, deadline) in list(running.items()):
+                    if deadline <= now:
+                        del running[key]
+                        metrics.record_source(key, now - start, key_counts.get(key, 0), timed_out=True)
+                        print(f"⏱️ {source.name} timed out, continuing without it")
+                continue
+            
+            if key not in running:
+                continue  # late output of a source that timed out
+            if job is _DONE:
+                del running[key]
+                metrics.record_source(key, time.monotonic() - start, key_counts.get(key, 0))
+                continue
+            
+            # Remove duplicates by job id
+            if job['id'] in unique_ids:
+                continue
+            unique_ids.add(job['id'])
+            key_counts[key] = key_counts.get(key, 0) + 1
+            source_name = job.get('source', 'Unknown')
+            source_counts[source_name] = source_counts.get(source_name, 0) + 1
+            yield job
+    finally:
+        cancelled.set()
     
     print(f"\n📊 SUMMARY:")
-    print(f"Total unique internships found: {len(final_results)}")
-    
-    # Group by source for summary
-    source_counts = {}
-    for job in final_results:
-        source = job.get('source', 'Unknown')
-        source_counts[source] = source_counts.get(source, 0) + 1
-    
-    for source, count in source_counts.items():
-        print(f"  {source}: {count} internships")
-    
-    # Sort by source for better organization
+    print(f"Total unique internships found: {len(unique_ids)}")
+    for source_name, count in source_counts.items():
+        print(f"  {source_name}: {count} internships")
+    
+    # Learned selectors, cached parses and responses and breaker states carry over to the next run
+    get_selector_cache().save()
+    parse_cache = get_parse_cache()
+    if parse_cache:
+        parse_cache.save()
+    http_cache = get_cache()
+    if http_cache:
+        http_cache.save()
+    circuits = get_engine().circuits
+    if circuits:
+        for breaker in circuits.not_closed():
+            print(f"  ⛔ Circuit {breaker.name}: {breaker.describe()}")
+        circuits.save()
+
+
+def scrape_all(seen_ids=None):
+    """Scrape from all working sources and return the combined list, sorted by source"""
+    final_results = list(iter_all(seen_ids))
     final_results.sort(key=lambda x: x.get('source', 'Unknown'))
-    
     return final_results
@@ -0,0 +1,206 @@
+"""
+Memory-Mapped Seen Index
+Seen-ID store for long histories, selected with STORAGE_BACKEND=mmap. Job
+IDs are kept as 64-bit keyed digests in a sorted array file that is
+memory-mapped and binary-searched, so opening it parses nothing. New IDs
+are appended to a small delta log that is merged into the array from time
+to time. The files use native byte order and are local to the machine
+"""
+import json
+import mmap
+import os
+import struct
+from array import array
+from bisect import bisect_left
+from datetime import date, datetime
+
+from job_ids import job_digest, needs_migration, migrate_seen_ids
+
+INDEX_FILE = os.getenv("SEEN_INDEX_FILE", "seen.idx")
+
+# Merge the delta log into the array once it holds this many IDs
+MERGE_THRESHOLD = int(os.getenv("SEEN_INDEX_MERGE_THRESHOLD", "50000"))
+
+# Header: magic + entry count. The array of sorted uint64 digests follows,
+# then one uint32 first-seen day (date ordinal) per digest.
+MAGIC = b'SEENIDX1'
+HEADER = struct.Struct('=8sQ')
+LOG_RECORD = struct.Struct('=QI')
+
+
+def id_key(job_id):
+    """64-bit digest of a job ID, the value stored in the index"""
+    return int(job_digest(job_id), 16)
+
+
+def day_number(timestamp=None):
+    """Date ordinal of an ISO timestamp (today when None)"""
+    if timestamp is None:
+        return date.today().toordinal()
+    return datetime.fromisoformat(timestamp).date().toordinal()
+
+
+class SeenIndex:
+    """Set-like seen store returned by storage.load_seen() for the mmap backend.
+
+    Holds digests rather than ID strings, so it answers membership but
+    can't list the IDs it contains.
+    """
+
+    def __init__(self, path=INDEX_FILE, merge_threshold=MERGE_THRESHOLD):
+        self.path = path
+        self.log_path = path + '.log'
+        self.merge_threshold = merge_threshold
+        self.pending = {}
+        self._mmap = None
+        self._keys = ()
+        self._open()
+        self.delta = self._read_log()
+
+    def _open(self):
+        self.close()
+        if not os.path.exists(self.path) or os.path.getsize(self.path) <= HEADER.size:
+            return
+        with open(self.path, 'rb') as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, count = HEADER.unpack_from(self._mmap)
+        if magic != MAGIC:
+            raise ValueError(f"{self.path} is not a seen index")
+        self._keys = memoryview(self._mmap)[HEADER.size:HEADER.size + 8 * count].cast('Q')
+
+    def _read_log(self):
+        """The delta log as {digest: first-seen day}"""
+        delta = {}
+        if os.path.exists(self.log_path):
+            with open(self.log_path, 'rb') as f:
+                data = f.read()
+            usable = len(data) - len(data) % LOG_RECORD.size  # ignore a torn last record
+            for key, day in LOG_RECORD.iter_unpack(data[:usable]):
+                delta.setdefault(key, day)
+        return delta
+
+    def close(self):
+        if self._mmap is not None:
+            self._keys.release()
+            self._keys = ()
+            self._mmap.close()
+            self._mmap = None
+
+    def _in_array(self, key):
+        keys = self._keys
+        index = bisect_left(keys, key)
+        return index < len(keys) and keys[index] == key
+
+    def __contains__(self, job_id):
+        key = id_key(job_id)
+        return key in self.pending or key in self.delta or self._in_array(key)
+
+    def __len__(self):
+        return len(self._keys) + len(self.delta) + len(self.pending)
+
+    def add(self, job_id):
+        key = id_key(job_id)
+        if not (key in self.delta or self._in_array(key)):
+            self.pending.setdefault(key, day_number())
+
+    def _append_pending(self):
+        if self.pending:
+            with open(self.log_path, 'ab') as f:
+                f.write(b''.join(LOG_RECORD.pack(key, day) for key, day in self.pending.items()))
+            self.delta.update(self.pending)
+            self.pending = {}
+
+    def flush(self):
+        """Append pending IDs to the delta log, merging when it has grown large"""
+        self._append_pending()
+        if len(self.delta) >= self.merge_threshold:
+            self.merge()
+
+    def _days(self):
+        """First-seen days of the array entries, in array order"""
+        count = len(self._keys)
+        days = array('I')
+        if count:
+            start = HEADER.size + 8 * count
+            days.frombytes(self._mmap[start:start + 4 * count])
+        return days
+
+    def _entries(self):
+        """(digest, day) pairs for everything in the array and delta log"""
+        entries = list(zip(self._keys, self._days()))
+        entries.extend(self.delta.items())
+        return entries
+
+    def _write(self, entries):
+        """Atomically replace the array with entries and empty the delta log"""
+        entries.sort()
+        # Keep one entry per digest, the earliest
+        entries = [entry for index, entry in enumerate(entries)
+                   if index == 0 or entry[0] != entries[index - 1][0]]
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            f.write(HEADER.pack(MAGIC, len(entries)))
+            f.write(array('Q', (key for key, _ in entries)).tobytes())
+            f.write(array('I', (day for _, day in entries)).tobytes())
+        self.close()
+        os.replace(tmp_path, self.path)
+        if os.path.exists(self.log_path):
+            os.remove(self.log_path)
+        self.delta = {}
+        self._open()
+
+    def merge(self):
+        """Fold the delta log into the sorted array"""
+        self._append_pending()
+        if self.delta:
+            self._write(self._entries())
+
+    def expire(self, cutoff):
+        """Drop IDs first seen before cutoff (ISO timestamp); returns how many"""
+        self._append_pending()
+        cutoff_day = day_number(cutoff)
+        oldest = min(self._days(), default=cutoff_day)
+        if oldest >= cutoff_day and all(day >= cutoff_day for day in self.delta.values()):
+            return 0
+        entries = self._entries()
+        kept = [entry for entry in entries if entry[1] >= cutoff_day]
+        evicted = len(entries) - len(kept)
+        if evicted:
+            self._write(kept)
+        return evicted
+
+    def import_ids(self, first_seen):
+        """Add {id: first_seen ISO} entries (or plain IDs) and merge them in"""
+        today = day_number()
+        if not hasattr(first_seen, 'items'):
+            first_seen = {job_id: None for job_id in first_seen}
+        for job_id, seen_at in first_seen.items():
+            self.pending.setdefault(id_key(job_id), day_number(seen_at) if seen_at else today)
+        self.merge()
+        return len(first_seen)
+
+
+_index = None
+
+
+def get_index(path=INDEX_FILE):
+    """Return the shared seen index, mapping it on first use"""
+    global _index
+    if _index is None:
+        _index = SeenIndex(path)
+    return _index
+
+
+if __name__ == "__main__":
+    first_seen = {}
+    if os.path.exists('seen.json'):
+        with open('seen.json', 'r') as f:
+            first_seen = json.load(f)
+    if isinstance(first_seen, list):
+        first_seen = {job_id: None for job_id in first_seen}
+    if needs_migration(first_seen):
+        migrated = migrate_seen_ids(first_seen)[0]
+        first_seen = {job_id: first_seen.get(job_id) for job_id in migrated}
+    index = get_index()
+    count = index.import_ids(first_seen)
+    print(f"✅ Imported {count} seen IDs into {index.path} ({len(index)} total)")
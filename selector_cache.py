@@ -0,0 +1,142 @@
+"""
+Selector Cache
+Remembers which of a field's fallback CSS selectors matched on the last
+page, per source, and tries that one first on later pages and runs. When it
+stops matching the others are tried in their listed order, and at the end
+of the page the selector that won on most cards is learned instead. Trying
+the learned selector first can pick a different element than the listed
+order would when several match. Hits and misses go to the run metrics, so
+a rising miss count shows a site changing its layout before the listings
+dry up
+"""
+import json
+import os
+import threading
+from collections import Counter
+from datetime import datetime
+
+from run_metrics import get_run_metrics
+
+SELECTOR_FILE = os.getenv("SELECTOR_CACHE_FILE", "selector_cache.json")
+
+
+class SelectorCache:
+    def __init__(self, path=SELECTOR_FILE):
+        self.path = path
+        self.learned = {}
+        self._dirty = False
+        self._lock = threading.Lock()
+        # Winning selectors of the page being parsed, per thread: key -> Counter
+        self._page = threading.local()
+        if os.path.exists(path):
+            with open(path, 'r') as f:
+                self.learned = json.load(f).get('selectors', {})
+
+    def _ordered(self, key, selectors):
+        """selectors with the learned one (if still listed) moved to the front"""
+        entry = self.learned.get(key)
+        best = entry and entry['selector']
+        if best in selectors and best != selectors[0]:
+            return [best] + [selector for selector in selectors if selector != best]
+        return selectors
+
+    def _tally(self):
+        tally = getattr(self._page, 'tally', None)
+        if tally is None:
+            tally = self._page.tally = {}
+        return tally
+
+    def _learn(self, source, field, key, selector, first_choice):
+        """Count one card's winning selector towards the page's verdict"""
+        hit = selector is not None and selector == first_choice
+        get_run_metrics().record_selector(source, field, hit)
+        if selector is not None:
+            self._tally().setdefault(key, Counter())[selector] += 1
+
+    def begin_page(self, source):
+        """Start a page of source, forgetting winners of a page that never ended"""
+        prefix = f"{source}:"
+        tally = self._tally()
+        for key in [key for key in tally if key.startswith(prefix)]:
+            del tally[key]
+
+    def end_page(self, source):
+        """Learn, per field of source, the selector that won on most of the page's cards"""
+        prefix = f"{source}:"
+        tally = self._tally()
+        for key in [key for key in tally if key.startswith(prefix)]:
+            selector = tally.pop(key).most_common(1)[0][0]
+            with self._lock:
+                previous = self.learned.get(key)
+                if previous and previous['selector'] == selector:
+                    continue
+                self.learned[key] = {'selector': selector, 'learned_at': datetime.now().isoformat()}
+                self._dirty = True
+            if previous:
+                print(f"🔁 {key.replace(':', ' ')} selector changed: {previous['selector']} -> {selector}")
+
+    def select(self, source, field, element, selectors):
+        """Elements matched by the first of selectors that matches any"""
+        key = f"{source}:{field}"
+        ordered = self._ordered(key, selectors)
+        for selector in ordered:
+            found = element.select(selector)
+            if found:
+                self._learn(source, field, key, selector, ordered[0])
+                return found
+        self._learn(source, field, key, None, ordered[0])
+        return []
+
+    def select_one(self, source, field, element, selectors, accept=None):
+        """First element whose selector matches and that accept(element) allows.
+
+        When nothing is accepted, the last element matched is returned, as
+        the scrapers' fallback loops did.
+        """
+        key = f"{source}:{field}"
+        ordered = self._ordered(key, selectors)
+        last = None
+        for selector in ordered:
+            found = element.select_one(selector)
+            if found is None:
+                continue
+            if accept is None or accept(found):
+                self._learn(source, field, key, selector, ordered[0])
+                return found
+            last = found
+        self._learn(source, field, key, None, ordered[0])
+        return last
+
+    def merge(self, learned):
+        """Adopt selectors another process learned more recently"""
+        with self._lock:
+            for key, entry in learned.items():
+                mine = self.learned.get(key)
+                if mine is None or (entry['selector'] != mine['selector'] and
+                                    entry['learned_at'] > mine['learned_at']):
+                    self.learned[key] = dict(entry)
+                    self._dirty = True
+
+    def save(self):
+        with self._lock:
+            if not self._dirty:
+                return
+            data = {'selectors': dict(self.learned)}
+            self._dirty = False
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(data, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, self.path)
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_selector_cache():
+    """Return the selector cache shared by the parsers"""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = SelectorCache()
+        return _cache
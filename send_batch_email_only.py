@@ -1,28 +1,13 @@
-from storage import load_batch, clear_batch
-from messenger import send_batch_email
+from storage import load_batch, remove_from_batch
+from messenger import batch_message
+from delivery import DeliveryEngine, SENT
+from outbox import get_outbox, job_key, FAILED
 from config import BATCH_MESSAGE_TEMPLATE, SMTP_CONFIG, SUBSCRIBERS
-from email_tracker import log_internship_data
+from email_tracker import log_internship_data, log_email_send
 from datetime import datetime
 
-def send_batch_email_only():
-    """Send batch via email only with enhanced formatting"""
-    batch = load_batch()
-    
-    if not batch:
-        print("📭 No new internships in batch to send.")
-        return False  # Return False when no email sent
-    
-    print(f"📮 Preparing to send {len(batch)} internships via email...")
-    
-    # Get email recipients from config
-    email_recipients = SUBSCRIBERS
-    
-    # Use SMTP config directly
-    smtp_config = SMTP_CONFIG
-    
-    # Generate bot run ID for tracking
-    bot_run_id = datetime.now().strftime('%Y%m%d_%H%M%S')
-    
+def format_digest(batch):
+    """The digest body for batch, grouped by source"""
     # Enhanced formatting for better readability
     formatted_internships = ""
     
@@ -59,31 +44,88 @@ def send_batch_email_only():
         internships_list=formatted_internships,
         total_count=len(batch)
     )
+    return final_message
+
+def send_batch_email_only():
+    """Send batch via email only with enhanced formatting.
+
+    New batch jobs become a digest in the outbox; every digest with
+    recipients still due is (re)sent, and its jobs leave the batch once all
+    of its recipients are settled.
+    """
+    batch = load_batch()
+    outbox = get_outbox()
+    
+    # Jobs of a digest that completed while removing them from the batch failed
+    if batch:
+        batch_keys = {job_key(job) for job in batch}
+        oldest = min(job.get('added_at') or '' for job in batch)
+        for digest in outbox.completed_digests(since=oldest):
+            delivered = [job for job in digest['jobs'] if job_key(job) in batch_keys]
+            if delivered:
+                remove_from_batch(delivered)
+                print(f"🧹 Removed {len(delivered)} already delivered internships (digest {digest['digest']}) from batch")
+                batch_keys -= {job_key(job) for job in delivered}
+        batch = [job for job in batch if job_key(job) in batch_keys]
+    queued = {job_key(job) for digest in outbox.open_digests() for job in digest['jobs']}
+    new_jobs = [job for job in batch if job_key(job) not in queued]
+    
+    if not new_jobs and not queued:
+        print("📭 No new internships in batch to send.")
+        return False  # Return False when no email sent
     
-    # Log internship data for tracking
-    log_internship_data(batch, email_recipients, bot_run_id)
+    # Get email recipients from config
+    email_recipients = SUBSCRIBERS
     
-    # Send email batch messages
-    success_count = 0
-    for email in email_recipients:
-        email = email.strip()
-        if email:
-            try:
-                send_batch_email(
-                    email, 
-                    batch, 
-                    final_message,  # Use the formatted message directly
-                    smtp_config,
-                    bot_run_id
-                )
-                success_count += 1
-            except Exception as e:
-                print(f"❌ Failed to send to {email}: {e}")
+    # Use SMTP config directly
+    smtp_config = SMTP_CONFIG
     
-    # Clear the batch after sending
-    clear_batch()
-    print(f"✅ Successfully sent to {success_count} recipients. Batch cleared.")
-    return True
+    if new_jobs:
+        print(f"📮 Preparing to send {len(new_jobs)} internships via email...")
+        
+        # Generate bot run ID for tracking
+        bot_run_id = datetime.now().strftime('%Y%m%d_%H%M%S')
+        
+        # Log internship data for tracking
+        log_internship_data(new_jobs, email_recipients, bot_run_id)
+        outbox.add_digest(new_jobs, format_digest(new_jobs), email_recipients, bot_run_id)
+    
+    # Send email batch messages from parallel workers, within the send quotas
+    engine = DeliveryEngine(smtp_config)
+    attempted = False
+    for digest in outbox.open_digests():
+        key, jobs = digest['digest'], digest['jobs']
+        outbox.cancel(key, email_recipients)
+        due = outbox.due(key)
+        if due:
+            attempted = True
+            print(f"📮 Sending digest {key} ({len(jobs)} internships) to {len(due)} recipients...")
+            
+            def record(result):
+                outbox.record(key, result)
+                if result.status == SENT:
+                    subject = f"🎯 New Internship Alert - {len(jobs)} Fresh Opportunities!"
+                else:
+                    subject = f"Failed: {result.error}"
+                    print(f"❌ Failed to send to {result.recipient}: {result.error}")
+                log_email_send(result.recipient, len(jobs), subject, result.status, digest['bot_run_id'])
+            
+            engine.deliver(
+                due,
+                lambda email: batch_message(email, jobs, digest['body'], smtp_config),
+                on_result=record
+            )
+        
+        counts = outbox.counts(key)
+        if outbox.complete(key):
+            # Only now is it safe to forget these jobs
+            remove_from_batch(jobs)
+            print(f"✅ Digest {key}: sent to {counts.get(SENT, 0)} recipients, "
+                  f"{counts.get(FAILED, 0)} failed. Removed from batch.")
+        else:
+            print(f"⏳ Digest {key}: sent to {counts.get(SENT, 0)} recipients, "
+                  f"{outbox.unsettled(key)} still to retry. Kept in batch.")
+    return attempted
 
 if __name__ == "__main__":
     send_batch_email_only()
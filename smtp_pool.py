@@ -0,0 +1,73 @@
+"""
+Pooled SMTP Client
+One connected, authenticated SMTP session reused for many messages instead
+of a TCP connect, TLS handshake and AUTH per email. A session the server
+dropped is reopened transparently, and sessions are rotated after
+SMTP_MAX_MESSAGES messages so no single connection outstays a provider's
+per-connection limits
+"""
+import os
+import smtplib
+
+# Messages sent over one session before it is replaced
+SMTP_MAX_MESSAGES = int(os.getenv("SMTP_MAX_MESSAGES", "50"))
+
+SMTP_TIMEOUT = float(os.getenv("SMTP_TIMEOUT", "30"))
+
+
+class SMTPConnection:
+    """Reusable SMTP session; use as a context manager or call close()"""
+
+    def __init__(self, smtp_cfg, max_messages=SMTP_MAX_MESSAGES, timeout=SMTP_TIMEOUT):
+        self.smtp_cfg = smtp_cfg
+        self.max_messages = max_messages
+        self.timeout = timeout
+        self.connects = 0
+        self._smtp = None
+        self._sent = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _open(self):
+        cfg = self.smtp_cfg
+        smtp = smtplib.SMTP(cfg['host'], cfg['port'], timeout=self.timeout)
+        try:
+            if cfg.get('starttls', True):
+                smtp.starttls()
+            if cfg.get('user') and cfg.get('pass'):
+                smtp.login(cfg['user'], cfg['pass'])
+        except Exception:
+            smtp.close()
+            raise
+        self._smtp = smtp
+        self._sent = 0
+        self.connects += 1
+
+    def _reopen(self):
+        self.close()
+        self._open()
+
+    def send(self, msg):
+        """Send an email.message.Message, reconnecting if the session was dropped"""
+        if self._smtp is None or self._sent >= self.max_messages:
+            self._reopen()
+        try:
+            self._smtp.send_message(msg)
+        except smtplib.SMTPServerDisconnected:
+            # Idle sessions get closed by the server; one fresh session, one more try
+            self._reopen()
+            self._smtp.send_message(msg)
+        self._sent += 1
+
+    def close(self):
+        if self._smtp is None:
+            return
+        try:
+            self._smtp.quit()
+        except (smtplib.SMTPException, OSError):
+            self._smtp.close()
+        self._smtp = None
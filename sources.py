@@ -0,0 +1,68 @@
+"""
+Source Registry
+Each scraper registers itself with the host it fetches from and that host's
+limits: request rate and burst (enforced by the fetch engine's token
+buckets), concurrent requests, how many results to keep and how many pages
+to walk. scrape_all() runs whatever is registered, so adding a source is
+one decorator
+"""
+import os
+from collections import namedtuple
+
+# Used for hosts no source has registered
+DEFAULT_RATE = 2.0
+DEFAULT_BURST = 4
+
+# Seconds a source may run before scrape_all stops waiting for it
+SOURCE_TIMEOUT = float(os.getenv("SOURCE_TIMEOUT", "300"))
+
+Source = namedtuple('Source', [
+    'key',          # short name, also the HTTP header profile and parser key
+    'name',         # display name
+    'scrape',       # generator function(seen_ids) yielding jobs
+    'host',         # host the pages are fetched from
+    'rate',         # allowed requests per second to host
+    'burst',        # requests allowed back to back before rate applies
+    'concurrency',  # simultaneous requests to host
+    'max_results',  # stop merging pages once this many unseen jobs are found
+    'per_page',     # listings parsed per results page (None: all)
+    'max_pages',    # results pages walked per search (None: pagination.MAX_PAGES)
+    'timeout',      # seconds the source may run (None: SOURCE_TIMEOUT)
+    'parser_version',  # bump when the parser's output changes, to drop its cached parses
+])
+
+SOURCES = []
+
+
+def register_source(key, name, host, rate=DEFAULT_RATE, burst=DEFAULT_BURST, concurrency=None,
+                    max_results=None, per_page=None, max_pages=None, timeout=None, parser_version=1):
+    """Decorator adding a scrape function to the registry, in definition order"""
+    def decorator(scrape_fn):
+        SOURCES[:] = [source for source in SOURCES if source.key != key]
+        SOURCES.append(Source(key, name, scrape_fn, host, rate, burst, concurrency,
+                              max_results, per_page, max_pages, timeout, parser_version))
+        return scrape_fn
+    return decorator
+
+
+def get_source(key):
+    for source in SOURCES:
+        if source.key == key:
+            return source
+    raise KeyError(f"Unknown source: {key}")
+
+
+def source_for_host(host):
+    """The registered source fetching from host, or None"""
+    for source in SOURCES:
+        if source.host == host:
+            return source
+    return None
+
+
+def host_rate(host):
+    """(rate, burst) for host, the policy used by the fetch engine's rate limiter"""
+    source = source_for_host(host)
+    if source is None:
+        return (DEFAULT_RATE, DEFAULT_BURST)
+    return (source.rate, source.burst)
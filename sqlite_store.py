@@ -0,0 +1,303 @@
+"""
+SQLite State Store
+Indexed SQLite backend for the seen-ID set and the pending batch, selected
+with STORAGE_BACKEND=sqlite. Each run reads and writes only the rows it
+touches instead of rewriting seen.json and batch.json
+"""
+import json
+import os
+import sqlite3
+from datetime import datetime
+
+from job_ids import normalize_text, needs_migration, migrate_seen_ids
+from near_duplicates import DuplicateIndex, describe_merge, load_recent_history, merge_listing, same_source
+
+DB_FILE = os.getenv("STORAGE_DB", "internbot.db")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS seen (
+    id TEXT PRIMARY KEY,
+    first_seen TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS batch (
+    position INTEGER PRIMARY KEY AUTOINCREMENT,
+    id TEXT UNIQUE,
+    norm_key TEXT NOT NULL,
+    added_at TEXT NOT NULL,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS batch_norm_key ON batch (norm_key);
+CREATE INDEX IF NOT EXISTS batch_added_at ON batch (added_at);
+"""
+
+
+def norm_key(job):
+    """Normalized title + company, the secondary duplicate key"""
+    return normalize_text(job.get('title')) + '|' + normalize_text(job.get('company'))
+
+
+class SQLiteStore:
+    def __init__(self, path=DB_FILE):
+        self.path = path
+        # Scraper threads check the seen set while paginating, so the
+        # connection is shared; sqlite3 serializes access to it internally
+        self.conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+        self._migrate()
+
+    def _migrate(self):
+        """Bring databases made by older versions up to SCHEMA"""
+        # Seen rows used to carry a title+company key nothing reads; its index
+        # only slowed inserts. The nullable column is left for SQLite to ignore
+        if self.conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'index' AND name = 'seen_norm_key'").fetchone():
+            with self.conn:
+                self.conn.execute("DROP INDEX seen_norm_key")
+
+    def close(self):
+        self.conn.close()
+
+    # Seen IDs
+
+    def has_seen(self, job_id):
+        return self.conn.execute("SELECT 1 FROM seen WHERE id = ?", (job_id,)).fetchone() is not None
+
+    def mark_seen(self, job_ids):
+        """Insert the IDs not seen before"""
+        now = datetime.now().isoformat()
+        with self.conn:
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO seen (id, first_seen) VALUES (?, ?)",
+                [(job_id, now) for job_id in job_ids]
+            )
+
+    def seen_count(self):
+        return self.conn.execute("SELECT COUNT(*) FROM seen").fetchone()[0]
+
+    def expire_seen(self, cutoff):
+        """Delete IDs first seen before cutoff (ISO timestamp); returns how many"""
+        with self.conn:
+            return self.conn.execute("DELETE FROM seen WHERE first_seen < ?", (cutoff,)).rowcount
+
+    def iter_seen(self):
+        for (job_id,) in self.conn.execute("SELECT id FROM seen"):
+            yield job_id
+
+    # Batch
+
+    def load_batch(self):
+        rows = self.conn.execute("SELECT data FROM batch ORDER BY position")
+        return [json.loads(data) for (data,) in rows]
+
+    def batch_count(self):
+        return self.conn.execute("SELECT COUNT(*) FROM batch").fetchone()[0]
+
+    def has_batch_id(self, job_id):
+        return self.conn.execute("SELECT 1 FROM batch WHERE id = ?", (job_id,)).fetchone() is not None
+
+    def batch_job_by_key(self, key):
+        """The oldest batch job with this norm_key, or None"""
+        row = self.conn.execute(
+            "SELECT data FROM batch WHERE norm_key = ? ORDER BY position LIMIT 1", (key,)
+        ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def insert_batch(self, jobs):
+        """Insert jobs (which already carry added_at) in one transaction"""
+        with self.conn:
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO batch (id, norm_key, added_at, data) VALUES (?, ?, ?, ?)",
+                [(job.get('id'), norm_key(job), job['added_at'], json.dumps(job)) for job in jobs]
+            )
+
+    def update_batch_job(self, job):
+        """Rewrite the stored data of a batch job, matched by id"""
+        with self.conn:
+            self.conn.execute("UPDATE batch SET data = ? WHERE id = ?", (json.dumps(job), job.get('id')))
+
+    def replace_batch(self, jobs):
+        with self.conn:
+            self.conn.execute("DELETE FROM batch")
+        for job in jobs:
+            job.setdefault('added_at', datetime.now().isoformat())
+        self.insert_batch(jobs)
+
+    def clear_batch(self):
+        with self.conn:
+            self.conn.execute("DELETE FROM batch")
+
+    def remove_batch_jobs(self, job_ids):
+        with self.conn:
+            self.conn.executemany("DELETE FROM batch WHERE id = ?", [(job_id,) for job_id in job_ids])
+
+    def batch_added_between(self, start=None, end=None):
+        """Batch jobs whose added_at falls in [start, end) (ISO strings, either optional)"""
+        conditions, params = [], []
+        if start:
+            conditions.append("added_at >= ?")
+            params.append(start)
+        if end:
+            conditions.append("added_at < ?")
+            params.append(end)
+        where = ("WHERE " + " AND ".join(conditions)) if conditions else ""
+        rows = self.conn.execute(f"SELECT data FROM batch {where} ORDER BY added_at", params)
+        return [json.loads(data) for (data,) in rows]
+
+    # Migration
+
+    def import_json(self, seen_file='seen.json', batch_file='batch.json'):
+        """One-shot import of the JSON state files; returns (seen, batch) row counts"""
+        first_seen = {}
+        if os.path.exists(seen_file):
+            with open(seen_file, 'r') as f:
+                first_seen = json.load(f)
+        if isinstance(first_seen, list):
+            now = datetime.now().isoformat()
+            first_seen = {job_id: now for job_id in first_seen}
+        seen_ids = set(first_seen)
+        if needs_migration(seen_ids):
+            seen_ids = migrate_seen_ids(seen_ids)[0]
+        now = datetime.now().isoformat()
+        with self.conn:
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO seen (id, first_seen) VALUES (?, ?)",
+                [(job_id, first_seen.get(job_id, now)) for job_id in seen_ids]
+            )
+
+        batch = []
+        if os.path.exists(batch_file):
+            with open(batch_file, 'r') as f:
+                batch = json.load(f)
+        for job in batch:
+            job.setdefault('added_at', datetime.now().isoformat())
+        self.insert_batch(batch)
+        return len(seen_ids), len(batch)
+
+
+class SQLiteSeenSet:
+    """Set-like view of the seen table returned by storage.load_seen().
+
+    Membership is an indexed lookup; add() buffers new IDs until
+    storage.save_seen() writes just those rows.
+    """
+
+    def __init__(self, store):
+        self.store = store
+        self.pending = set()
+
+    def __contains__(self, job_id):
+        return job_id in self.pending or self.store.has_seen(job_id)
+
+    def __len__(self):
+        return self.store.seen_count() + len(self.pending)
+
+    def __iter__(self):
+        yield from self.store.iter_seen()
+        yield from self.pending
+
+    def add(self, job_id):
+        self.pending.add(job_id)
+
+    def flush(self):
+        self.store.mark_seen(self.pending)
+        self.pending = set()
+
+
+class SQLiteBatchStore:
+    """BatchStore counterpart that checks exact duplicates with indexed queries.
+
+    Near-duplicates are found with the same in-memory index BatchStore uses,
+    built from the batch rows and recently sent listings.
+    """
+
+    def __init__(self, store):
+        self.store = store
+        self.pending = []
+        self._pending_ids = set()
+        self._pending_keys = {}
+        self._near = DuplicateIndex()
+        for job in load_recent_history() + store.load_batch():
+            self._near.add(job)
+        self._updated = {}
+        self.merged = []
+
+    def __len__(self):
+        return self.store.batch_count() + len(self.pending)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.flush()
+
+    def duplicate_of(self, job):
+        """Return (existing job, reason) if job duplicates one already known, else None"""
+        job_id = job.get('id')
+        if job_id in self._pending_ids or self.store.has_batch_id(job_id):
+            return None, 'same ID'
+        match = self._near.find(job)
+        if match:
+            return match
+        # Titles the near-duplicate index can't shingle still match exactly
+        key = norm_key(job)
+        existing = self._pending_keys.get(key) or self.store.batch_job_by_key(key)
+        if existing is None or same_source(job, existing):
+            return None
+        # A stored job already merged into this run carries its earlier links
+        return self._updated.get(existing.get('id'), existing), 'same title and company'
+
+    def is_duplicate(self, job):
+        return self.duplicate_of(job) is not None
+
+    def add(self, internship):
+        match = self.duplicate_of(internship)
+        if match:
+            existing, reason = match
+            if existing is not None:
+                self.merged.append(describe_merge(internship, existing, reason))
+                self._near.alias(internship, existing)
+                # Pending jobs are written by flush() anyway; stored ones need an update
+                if 'id' in existing and merge_listing(existing, internship):
+                    if existing['id'] not in self._pending_ids:
+                        self._updated[existing['id']] = existing
+            return False
+        internship['added_at'] = datetime.now().isoformat()
+        self.pending.append(internship)
+        self._pending_ids.add(internship.get('id'))
+        self._pending_keys.setdefault(norm_key(internship), internship)
+        self._near.add(internship)
+        return True
+
+    def add_many(self, internships):
+        return [internship for internship in internships if self.add(internship)]
+
+    def flush(self):
+        for job in self._updated.values():
+            self.store.update_batch_job(job)
+        self._updated = {}
+        if self.pending:
+            self.store.insert_batch(self.pending)
+            self.pending = []
+            self._pending_ids = set()
+            self._pending_keys = {}
+
+
+_store = None
+
+
+def get_store(path=DB_FILE):
+    """Return the shared SQLite store, opening it on first use"""
+    global _store
+    if _store is None:
+        _store = SQLiteStore(path)
+    return _store
+
+
+if __name__ == "__main__":
+    store = get_store()
+    seen_count, batch_count = store.import_json()
+    print(f"✅ Imported {seen_count} seen IDs and {batch_count} batch jobs into {store.path}")
@@ -1,48 +1,270 @@
 import json
 import os
-from datetime import datetime
+from datetime import datetime, timedelta
+from job_ids import needs_migration, migrate_seen_ids
+from near_duplicates import DuplicateIndex, describe_merge, load_recent_history, merge_listing
 
 FILE = 'seen.json'
 BATCH_FILE = 'batch.json'
 
+# "json" keeps state in seen.json/batch.json; "sqlite" uses the indexed
+# database in sqlite_store (import existing files with: python sqlite_store.py);
+# "mmap" keeps seen IDs in the memory-mapped seen_index and the batch in
+# batch.json (import seen.json with: python seen_index.py)
+STORAGE_BACKEND = os.getenv("STORAGE_BACKEND", "json")
+
+# Seen IDs are forgotten this many days after they were first seen. Keep it
+# above collect.MAX_AGE_DAYS so expired listings are still filtered as too old
+SEEN_RETENTION_DAYS = int(os.getenv("SEEN_RETENTION_DAYS", "30"))
+
+def _sqlite_store():
+    if STORAGE_BACKEND != "sqlite":
+        return None
+    from sqlite_store import get_store
+    return get_store()
+
+class SeenSet(set):
+    """The JSON backend's seen set, remembering when each ID was first seen"""
+
+    def __init__(self, first_seen=None):
+        first_seen = first_seen or {}
+        super().__init__(first_seen)
+        self.first_seen = dict(first_seen)
+
+    def add(self, job_id):
+        if job_id not in self:
+            self.first_seen[job_id] = datetime.now().isoformat()
+        super().add(job_id)
+
+    def expire(self, cutoff):
+        """Drop IDs first seen before cutoff (ISO timestamp); returns how many"""
+        expired = [job_id for job_id, seen_at in self.first_seen.items() if seen_at < cutoff]
+        for job_id in expired:
+            del self.first_seen[job_id]
+            self.discard(job_id)
+        return len(expired)
+
+def _read_seen_file():
+    """seen.json as {id: first_seen}; the old plain list gets first_seen = now"""
+    if not os.path.exists(FILE):
+        return {}
+    with open(FILE, 'r') as f:
+        data = json.load(f)
+    if isinstance(data, list):
+        now = datetime.now().isoformat()
+        return {job_id: now for job_id in data}
+    return data
+
+def _write_seen_file(first_seen):
+    with open(FILE,'w') as f:
+        json.dump(first_seen, f)
+
 def load_seen():
-    return set(json.load(open(FILE))) if os.path.exists(FILE) else set()
+    store = _sqlite_store()
+    if store:
+        from sqlite_store import SQLiteSeenSet
+        return SQLiteSeenSet(store)
+    if STORAGE_BACKEND == "mmap":
+        from seen_index import get_index
+        return get_index()
+
+    first_seen = _read_seen_file()
+    if needs_migration(first_seen):
+        first_seen = migrate_seen()
+    return SeenSet(first_seen)
+
+def migrate_seen():
+    """Rewrite seen.json from the old hash()-based job IDs to stable ones"""
+    first_seen = _read_seen_file()
+    migrated, converted, dropped = migrate_seen_ids(first_seen)
+    now = datetime.now().isoformat()
+    migrated = {job_id: first_seen.get(job_id, now) for job_id in migrated}
+    _write_seen_file(migrated)
+    print(f"🔁 Migrated seen IDs: {converted} converted, {dropped} unrecoverable dropped")
+    return migrated
 
 def save_seen(seen):
-    with open(FILE,'w') as f:
-        json.dump(list(seen), f)
+    store = _sqlite_store()
+    if store:
+        if hasattr(seen, 'flush'):
+            seen.flush()  # only the IDs added this run
+        else:
+            store.mark_seen(seen)
+        return
+    if STORAGE_BACKEND == "mmap":
+        from seen_index import get_index
+        index = get_index()
+        if seen is not index:
+            for job_id in seen:
+                index.add(job_id)
+        index.flush()
+        return
+
+    if isinstance(seen, SeenSet):
+        _write_seen_file(seen.first_seen)
+    else:
+        # A plain set: keep known first-seen times, stamp the rest now
+        existing = _read_seen_file()
+        now = datetime.now().isoformat()
+        _write_seen_file({job_id: existing.get(job_id, now) for job_id in seen})
+
+def compact_seen(seen, retention_days=None):
+    """Evict seen IDs first seen more than retention_days ago, in one pass.
+
+    Listings that old are past the age filter anyway, so this keeps the
+    seen set at roughly a constant size. Returns the number evicted.
+    """
+    if retention_days is None:
+        retention_days = SEEN_RETENTION_DAYS
+    cutoff = (datetime.now() - timedelta(days=retention_days)).isoformat()
+
+    store = _sqlite_store()
+    if store:
+        return store.expire_seen(cutoff)
+    return seen.expire(cutoff)
 
 def load_batch():
     """Load the current batch of internships waiting to be sent"""
+    store = _sqlite_store()
+    if store:
+        return store.load_batch()
+
     if os.path.exists(BATCH_FILE):
         with open(BATCH_FILE, 'r') as f:
             return json.load(f)
     return []
 
 def save_batch(batch_data):
-    """Save the current batch of internships"""
-    with open(BATCH_FILE, 'w') as f:
+    """Save the current batch of internships (atomically, via a temp file)"""
+    store = _sqlite_store()
+    if store:
+        store.replace_batch(batch_data)
+        return
+
+    tmp_file = BATCH_FILE + '.tmp'
+    with open(tmp_file, 'w') as f:
         json.dump(batch_data, f, indent=2)
+    os.replace(tmp_file, BATCH_FILE)
+
+def batch_added_between(start=None, end=None):
+    """Batch jobs added in [start, end) -- ISO timestamps, either bound optional"""
+    store = _sqlite_store()
+    if store:
+        return store.batch_added_between(start, end)
+
+    return [job for job in load_batch()
+            if (not start or job.get('added_at', '') >= start) and
+               (not end or job.get('added_at', '') < end)]
+
+class BatchStore:
+    """The batch loaded once, with indexes for duplicate checks.
+
+    Besides exact IDs, jobs are checked for near-duplicates of the batch and
+    of recently sent listings; those are merged into the listing they
+    duplicate and reported in merged. Jobs are added in memory and written
+    with a single flush() at the end of a collection cycle. Used as a
+    context manager it flushes on a clean exit.
+    """
+
+    def __init__(self):
+        self.jobs = load_batch()
+        self._ids = set()
+        self._near = DuplicateIndex()
+        for job in load_recent_history():
+            self._near.add(job)
+        for job in self.jobs:
+            self._index(job)
+        self.merged = []
+        self._dirty = False
+
+    def __len__(self):
+        return len(self.jobs)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.flush()
+
+    def _index(self, job):
+        self._ids.add(job.get('id'))
+        self._near.add(job)
+
+    def duplicate_of(self, job):
+        """Return (existing job, reason) if job duplicates one already known, else None"""
+        if job.get('id') in self._ids:
+            return None, 'same ID'
+        return self._near.find(job)
+
+    def is_duplicate(self, job):
+        return self.duplicate_of(job) is not None
+
+    def add(self, internship):
+        """Add a new internship (with duplicate checking); False if it is a duplicate"""
+        match = self.duplicate_of(internship)
+        if match:
+            existing, reason = match
+            if existing is not None:
+                self.merged.append(describe_merge(internship, existing, reason))
+                self._near.alias(internship, existing)
+                # Only listings still in the batch can take the extra link
+                if 'id' in existing and merge_listing(existing, internship):
+                    self._dirty = True
+            return False
+        
+        # Add timestamp to track when it was added
+        internship['added_at'] = datetime.now().isoformat()
+        self.jobs.append(internship)
+        self._index(internship)
+        self._dirty = True
+        return True
+
+    def add_many(self, internships):
+        """Add several internships and return the ones that were not duplicates"""
+        return [internship for internship in internships if self.add(internship)]
+
+    def flush(self):
+        """Write the batch to disk if anything was added"""
+        if self._dirty:
+            save_batch(self.jobs)
+            self._dirty = False
+
+def open_batch_store():
+    """Batch store for the configured backend"""
+    store = _sqlite_store()
+    if store:
+        from sqlite_store import SQLiteBatchStore
+        return SQLiteBatchStore(store)
+    return BatchStore()
 
 def add_to_batch(internship):
     """Add a new internship to the current batch (with duplicate checking)"""
-    batch = load_batch()
-    
-    # Check for duplicates in current batch
-    for existing in batch:
-        if (existing.get('id') == internship.get('id') or 
-            (existing.get('title') == internship.get('title') and 
-             existing.get('company') == internship.get('company'))):
-            # Duplicate found, don't add
-            return False
-    
-    # Add timestamp to track when it was added
-    internship['added_at'] = datetime.now().isoformat()
-    batch.append(internship)
-    save_batch(batch)
-    return True
+    store = open_batch_store()
+    added = store.add(internship)
+    store.flush()
+    return added
 
 def clear_batch():
     """Clear the batch after sending"""
+    store = _sqlite_store()
+    if store:
+        store.clear_batch()
+        return
+
     if os.path.exists(BATCH_FILE):
         os.remove(BATCH_FILE)
+
+def remove_from_batch(jobs):
+    """Remove jobs (matched by id, or link) from the batch once they have been sent"""
+    keys = {job.get('id') or job.get('link') for job in jobs}
+    store = _sqlite_store()
+    if store:
+        store.remove_batch_jobs([job['id'] for job in jobs if job.get('id')])
+        return
+
+    remaining = [job for job in load_batch() if (job.get('id') or job.get('link')) not in keys]
+    if remaining:
+        save_batch(remaining)
+    else:
+        clear_batch()
@@ -0,0 +1,32 @@
+"""Age filter of collected listings"""
+from datetime import datetime, timedelta, timezone
+
+from collect import MAX_AGE_DAYS, is_internship_too_old
+from date_normalizer import normalize_posted, to_timestamp
+
+NOW = datetime(2026, 3, 20, 9, 30, 15, 500000, tzinfo=timezone.utc)
+
+
+def test_exactly_max_age_is_kept():
+    assert MAX_AGE_DAYS == 14
+    assert not is_internship_too_old("Posted: 14 days ago", now=NOW)
+    assert is_internship_too_old("Posted: 15 days ago", now=NOW)
+
+
+def test_boundary_ignores_time_of_day():
+    # posted_at stored at whole seconds, earlier in the day, or in a run
+    # that started a little before this one
+    posted = to_timestamp(normalize_posted("14 days ago", NOW))
+    assert not is_internship_too_old("14 days ago", posted, NOW)
+    assert not is_internship_too_old("", to_timestamp(NOW - timedelta(days=14, hours=9)), NOW)
+    assert not is_internship_too_old("", to_timestamp(NOW - timedelta(days=14)), NOW + timedelta(seconds=1))
+    assert is_internship_too_old("", to_timestamp(NOW - timedelta(days=14, hours=10)), NOW)
+
+
+def test_posted_at_wins_over_text():
+    assert not is_internship_too_old("30+ days ago", to_timestamp(NOW - timedelta(days=2)), NOW)
+
+
+def test_undated_listing_is_kept():
+    assert not is_internship_too_old("", None, NOW)
+    assert not is_internship_too_old("Posted recently", None, NOW)
@@ -0,0 +1,76 @@
+"""Rate limiting and per-host concurrency of the fetch engine"""
+import threading
+import time
+
+from fetcher import FetchEngine
+from rate_limiter import HostRateLimiter, TokenBucket
+
+
+def test_bucket_allows_burst_then_paces():
+    bucket = TokenBucket(rate=10, burst=3)
+    assert [bucket.reserve() for _ in range(3)] == [0.0, 0.0, 0.0]
+    assert bucket.reserve() > 0.05
+    assert not bucket.try_acquire()
+
+
+def test_bucket_refills_at_its_rate():
+    bucket = TokenBucket(rate=50, burst=1)
+    assert bucket.try_acquire()
+    assert not bucket.try_acquire()
+    time.sleep(0.05)
+    assert bucket.try_acquire()
+
+
+def test_bucket_rate_holds_over_many_requests():
+    bucket = TokenBucket(rate=100, burst=1)
+    start = time.monotonic()
+    for _ in range(11):
+        bucket.acquire()
+    assert time.monotonic() - start >= 0.09
+
+
+def test_host_limiter_keeps_hosts_apart():
+    limiter = HostRateLimiter(lambda host: (1, 1) if host == 'slow.example' else None)
+    assert limiter.acquire('slow.example') == 0.0
+    # The slow host's next token is a second away; other hosts don't wait for it
+    assert limiter.bucket('slow.example').reserve() > 0.5
+    assert limiter.bucket('fast.example') is None
+    assert limiter.acquire('fast.example') == 0.0
+
+
+class Tracker:
+    """Fetch function that records how many calls overlap, per host"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.active = {}
+        self.peak = {}
+
+    def fetch(self, url):
+        host = url.split('/')[2]
+        with self.lock:
+            self.active[host] = self.active.get(host, 0) + 1
+            self.peak[host] = max(self.peak.get(host, 0), self.active[host])
+        time.sleep(0.02)
+        with self.lock:
+            self.active[host] -= 1
+        return url
+
+
+def test_per_host_limit_bounds_concurrency():
+    tracker = Tracker()
+    engine = FetchEngine(max_workers=8, per_host_limit=2, host_limits={'one.example': 1},
+                         rate_policy=None)
+    urls = [f"https://{host}/page/{i}" for host in ('one.example', 'two.example') for i in range(6)]
+    futures = [engine.submit(url, fetch_fn=tracker.fetch) for url in urls]
+    assert [future.result() for future in futures] == urls
+    engine.shutdown()
+    assert tracker.peak == {'one.example': 1, 'two.example': 2}
+
+
+def test_failed_fetch_releases_host_slot():
+    engine = FetchEngine(max_workers=2, per_host_limit=1, rate_policy=None)
+    engine.submit("https://one.example/", fetch_fn=lambda url: 1 / 0).exception()
+    # The slot was given back, so the next fetch of the host isn't blocked
+    assert engine.submit("https://one.example/2", fetch_fn=lambda url: url).result(timeout=5)
+    engine.shutdown()
@@ -0,0 +1,40 @@
+"""Persistence of the HTTP response cache index"""
+import json
+import os
+
+from http_cache import HttpCache, INDEX_FILE
+
+
+class Response:
+    def __init__(self, content, headers):
+        self.content = content
+        self.headers = headers
+
+
+def read_index(cache_dir):
+    with open(os.path.join(cache_dir, INDEX_FILE)) as f:
+        return json.load(f)
+
+
+def test_hits_are_written_once_by_save(tmp_path):
+    cache_dir = str(tmp_path)
+    cache = HttpCache(cache_dir)
+    url = "https://example.com/jobs"
+    cache.store(url, Response(b'<html></html>', {'ETag': '"v1"', 'Content-Type': 'text/html'}))
+    stored = read_index(cache_dir)[url]
+
+    response = cache.hit(url, revalidated=True)
+    assert response.content == b'<html></html>' and response.revalidated
+    # The hit changed the entry in memory only
+    assert read_index(cache_dir)[url] == stored
+    assert cache.lookup(url)['validated_at'] >= stored['validated_at']
+
+    cache.save()
+    assert read_index(cache_dir)[url]['last_used'] >= stored['last_used']
+    assert HttpCache(cache_dir).lookup(url)['etag'] == '"v1"'
+
+
+def test_save_without_changes_writes_nothing(tmp_path):
+    cache = HttpCache(str(tmp_path))
+    cache.save()
+    assert not os.path.exists(os.path.join(str(tmp_path), INDEX_FILE))
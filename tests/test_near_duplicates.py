@@ -0,0 +1,83 @@
+"""Near-duplicate matching of listings"""
+from job_ids import NO_COMPANY
+from near_duplicates import DuplicateIndex, merge_listing, normalize_company, shingles
+
+
+def job(title, company, link=None, source='internshala'):
+    return {'title': title, 'company': company, 'link': link, 'source': source}
+
+
+def index_of(*jobs):
+    index = DuplicateIndex()
+    for indexed in jobs:
+        index.add(indexed)
+    return index
+
+
+def test_similar_title_same_company_matches_across_sources():
+    existing = job("Marketing Intern", "Acme Pvt. Ltd.")
+    match = index_of(existing).find(job("Marketing Internship", "ACME Private Limited", source='timesjobs'))
+    assert match is not None
+    assert match[0] is existing
+    assert 'similar title' in match[1]
+    assert index_of(job("Data Science Intern", "Acme")).find(
+        job("Data Science Intern - Remote", "Acme", source='linkedin')) is not None
+
+
+def test_same_source_roles_do_not_match():
+    index = index_of(job("Web Development Intern", "Acme", "https://internshala.com/internship/detail/web-1"))
+    other_role = job("App Development Intern", "Acme", "https://internshala.com/internship/detail/app-2")
+    assert index.find(other_role) is None
+    # One board lists a role once, so even a near-identical title there is another listing
+    assert index.find(job("Web Development Internship", "Acme", "https://internshala.com/internship/detail/web-3")) is None
+
+
+def test_one_word_apart_titles_do_not_match():
+    index = index_of(job("Web Development Intern", "Acme"))
+    assert index.find(job("App Development Intern", "Acme", source='timesjobs')) is None
+
+
+def test_title_words_treat_intern_and_internship_alike():
+    assert shingles("Marketing Internship!") == shingles("marketing intern") == {'marketing', 'intern'}
+
+
+def test_same_listing_url_matches():
+    existing = job("Data Intern", "Acme", "https://example.com/jobs/42?utm_source=feed")
+    match = index_of(existing).find(job("Data Science Intern", "Other Co", "https://example.com/jobs/42"))
+    assert match == (existing, 'same listing URL')
+
+
+def test_other_company_does_not_match():
+    index = index_of(job("Marketing Intern", "Acme"))
+    assert index.find(job("Marketing Intern", "Globex", source='timesjobs')) is None
+
+
+def test_different_title_does_not_match():
+    index = index_of(job("Marketing Intern", "Acme"))
+    assert index.find(job("Backend Developer Intern", "Acme", source='timesjobs')) is None
+
+
+def test_placeholder_company_needs_identical_title():
+    for placeholder in (NO_COMPANY, "Unknown Company", "Company not specified", "", None):
+        index = index_of(job("Digital Marketing Intern Remote", placeholder))
+        assert index.find(job("Digital Marketing Intern", placeholder, source='timesjobs')) is None, placeholder
+        assert index.find(job("Digital Marketing Intern Remote", placeholder, source='timesjobs')), placeholder
+
+
+def test_placeholders_do_not_match_real_companies():
+    index = index_of(job("Marketing Intern", NO_COMPANY))
+    assert index.find(job("Marketing Intern", "Acme", source='timesjobs')) is None
+
+
+def test_normalize_company_drops_legal_suffixes():
+    assert normalize_company("The Acme Corp.") == normalize_company("acme") == "acme"
+    assert normalize_company("Acme Labs (Bangalore)") == "acme labs"
+
+
+def test_merge_listing_records_new_links_once():
+    existing = job("Data Intern", "Acme", "https://example.com/1")
+    duplicate = job("Data Intern", "Acme", "https://other.example/9", source='timesjobs')
+    assert merge_listing(existing, duplicate)
+    assert not merge_listing(existing, duplicate)
+    assert not merge_listing(existing, job("Data Intern", "Acme", "https://example.com/1"))
+    assert existing['also_listed'] == [{'source': 'timesjobs', 'link': "https://other.example/9"}]
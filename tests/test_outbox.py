@@ -0,0 +1,96 @@
+"""Per-recipient delivery state in the outbox"""
+import pytest
+
+from delivery import DEFERRED, DeliveryResult
+from outbox import FAILED, PENDING, SENT, Outbox, digest_key
+
+LATER = '9999-01-01T00:00:00'
+JOBS = [{'id': 'j1', 'title': 'Data Intern'}, {'id': 'j2', 'title': 'Web Intern'}]
+
+
+@pytest.fixture
+def outbox(tmp_path):
+    box = Outbox(str(tmp_path / 'outbox.db'), max_attempts=3)
+    yield box
+    box.close()
+
+
+def row(outbox, digest, recipient):
+    return outbox.conn.execute(
+        "SELECT state, attempts, next_retry FROM outbox WHERE digest = ? AND recipient = ?",
+        (digest, recipient)
+    ).fetchone()
+
+
+def test_new_digest_is_due_for_every_recipient(outbox):
+    digest = outbox.add_digest(JOBS, "body", ['a@x.com', ' b@x.com ', ''])
+    assert digest == digest_key(list(reversed(JOBS)))
+    assert outbox.due(digest) == ['a@x.com', 'b@x.com']
+    assert [d['digest'] for d in outbox.open_digests()] == [digest]
+
+
+def test_fail_retry_give_up_complete(outbox):
+    digest = outbox.add_digest(JOBS, "body", ['a@x.com'])
+    failure = DeliveryResult('a@x.com', FAILED, 3, "421 try later")
+
+    outbox.record(digest, failure)
+    state, attempts, next_retry = row(outbox, digest, 'a@x.com')
+    assert (state, attempts) == (FAILED, 1) and next_retry
+    # Waiting for the retry: not due now, still unsettled, so not complete
+    assert outbox.due(digest) == []
+    assert outbox.due(digest, now=LATER) == ['a@x.com']
+    assert not outbox.complete(digest)
+
+    # Attempts count runs, not the engine's sends within a run
+    outbox.record(digest, failure)
+    assert row(outbox, digest, 'a@x.com')[:2] == (FAILED, 2)
+    outbox.record(digest, failure)
+    assert row(outbox, digest, 'a@x.com') == (FAILED, 3, None)  # given up
+
+    assert outbox.unsettled(digest) == 0
+    assert outbox.due(digest, now=LATER) == []
+    assert outbox.complete(digest)
+    assert outbox.open_digests() == []
+    assert [d['digest'] for d in outbox.completed_digests()] == [digest]
+
+
+def test_retry_then_send_completes(outbox):
+    digest = outbox.add_digest(JOBS, "body", ['a@x.com', 'b@x.com'])
+    outbox.record(digest, DeliveryResult('a@x.com', SENT, 1, None))
+    outbox.record(digest, DeliveryResult('b@x.com', FAILED, 3, "connection reset"))
+    assert not outbox.complete(digest)
+    outbox.record(digest, DeliveryResult('b@x.com', SENT, 1, None))
+    assert row(outbox, digest, 'b@x.com') == (SENT, 2, None)
+    assert outbox.counts(digest) == {SENT: 2}
+    assert outbox.complete(digest)
+
+
+def test_refused_recipient_is_given_up_at_once(outbox):
+    digest = outbox.add_digest(JOBS, "body", ['bad@x.com'])
+    outbox.record(digest, DeliveryResult('bad@x.com', FAILED, 1, "550 no such user", True))
+    assert row(outbox, digest, 'bad@x.com') == (FAILED, 1, None)
+    assert outbox.complete(digest)
+
+
+def test_deferred_recipient_waits_without_using_an_attempt(outbox):
+    digest = outbox.add_digest(JOBS, "body", ['a@x.com'])
+    outbox.record(digest, DeliveryResult('a@x.com', DEFERRED, 0, "daily limit reached"))
+    state, attempts, next_retry = row(outbox, digest, 'a@x.com')
+    assert (state, attempts) == (PENDING, 0) and next_retry
+    assert outbox.due(digest) == []
+    assert not outbox.complete(digest)
+
+
+def test_re_adding_a_digest_only_queues_new_recipients(outbox):
+    digest = outbox.add_digest(JOBS, "body", ['a@x.com'])
+    outbox.record(digest, DeliveryResult('a@x.com', SENT, 1, None))
+    assert outbox.complete(digest)
+    assert outbox.add_digest(JOBS, "body", ['a@x.com', 'c@x.com']) == digest
+    assert outbox.due(digest) == ['c@x.com']
+    assert [d['digest'] for d in outbox.open_digests()] == [digest]
+
+
+def test_cancel_drops_unsubscribed_recipients(outbox):
+    digest = outbox.add_digest(JOBS, "body", ['a@x.com', 'gone@x.com'])
+    assert outbox.cancel(digest, ['a@x.com']) == 1
+    assert outbox.due(digest) == ['a@x.com']
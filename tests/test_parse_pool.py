@@ -0,0 +1,145 @@
+"""Error propagation through the parse pool"""
+from concurrent.futures import Future
+from concurrent.futures.process import BrokenProcessPool
+
+import pytest
+
+import parse_pool
+from pagination import PageResult, page_healthy
+from parse_pool import ParsePool, ParsePoolError
+
+
+def parse_titles(content):
+    """Module-level so a pool process can unpickle it"""
+    if b'broken' in content:
+        raise ValueError("unparseable page")
+    return [{'title': line} for line in content.decode().splitlines()]
+
+
+class Response:
+    def __init__(self, content=b'', status_code=200):
+        self._content = content
+        self.status_code = status_code
+
+    @property
+    def content(self):
+        if isinstance(self._content, Exception):
+            raise self._content
+        return self._content
+
+
+class BrokenExecutor:
+    """Stands in for a process pool whose workers have died"""
+
+    def __init__(self, fail_on_submit=True):
+        self.fail_on_submit = fail_on_submit
+        self.shut_down = False
+
+    def submit(self, fn, *args):
+        if self.fail_on_submit:
+            raise BrokenProcessPool("a child process terminated abruptly")
+        future = Future()
+        future.set_exception(BrokenProcessPool("a child process terminated abruptly"))
+        return future
+
+    def shutdown(self, wait=True):
+        self.shut_down = True
+
+
+def fetched(response=None, error=None):
+    future = Future()
+    if error is not None:
+        future.set_exception(error)
+    else:
+        future.set_result(response)
+    return future
+
+
+def pool_with(executor):
+    pool = ParsePool(workers=2, inline_pages=0)
+    pool._executor = executor
+    return pool
+
+
+def test_inline_parse_error_raises_from_future():
+    pool = ParsePool(workers=0)
+    assert pool.submit(parse_titles, b'a\nb').result() == [{'title': 'a'}, {'title': 'b'}]
+    with pytest.raises(ValueError):
+        pool.submit(parse_titles, b'broken').result()
+
+
+@pytest.mark.parametrize('fail_on_submit', [True, False])
+def test_broken_pool_raises_parse_pool_error(fail_on_submit):
+    executor = BrokenExecutor(fail_on_submit)
+    pool = pool_with(executor)
+    if fail_on_submit:
+        with pytest.raises(ParsePoolError):
+            pool.submit(parse_titles, b'a')
+    else:
+        with pytest.raises(ParsePoolError):
+            pool.submit(parse_titles, b'a').result(timeout=5)
+    # The broken executor is dropped so the next page gets a fresh one
+    assert executor.shut_down and pool._executor is None
+    # and its queue slot was given back
+    assert pool._slots.acquire(blocking=False)
+
+
+def test_parse_error_is_reported_with_the_page():
+    page = ParsePool(workers=0).parse_fetched(fetched(Response(b'broken')), parse_titles)
+    response, jobs, error = page.result(timeout=5)
+    assert response.status_code == 200 and jobs == []
+    assert isinstance(error, ValueError)
+
+
+def test_fetch_error_raises_from_page():
+    page = ParsePool(workers=0).parse_fetched(fetched(error=ConnectionError("reset")), parse_titles)
+    with pytest.raises(ConnectionError):
+        page.result(timeout=5)
+
+
+def test_unreadable_body_raises_from_page():
+    page = ParsePool(workers=0).parse_fetched(fetched(Response(ConnectionError("truncated"))), parse_titles)
+    with pytest.raises(ConnectionError):
+        page.result(timeout=5)
+
+
+def test_non_200_is_not_parsed():
+    page = ParsePool(workers=0).parse_fetched(fetched(Response(b'broken', status_code=503)), parse_titles)
+    assert page.result(timeout=5)[1:] == ([], None)
+
+
+def test_pool_failure_resolves_page_with_parse_pool_error():
+    pool = pool_with(BrokenExecutor())
+    response, jobs, error = pool.parse_fetched(fetched(Response(b'a')), parse_titles).result(timeout=5)
+    assert jobs == [] and isinstance(error, ParsePoolError)
+    # A local pool failure says nothing about the site's health
+    assert page_healthy(PageResult(1, 'https://example.com/', response, error, jobs)) is None
+    assert page_healthy(PageResult(1, 'https://example.com/', response, ValueError(), [])) is False
+
+
+def test_parse_cache_failure_still_returns_jobs(monkeypatch, capsys):
+    class FailingCache:
+        def get(self, source, version, content):
+            return None
+
+        def put(self, source, version, content, jobs):
+            raise OSError("disk full")
+
+    class Source:
+        parser_version = 1
+
+    monkeypatch.setattr(parse_pool, 'get_parse_cache', FailingCache)
+    monkeypatch.setattr(parse_pool, 'get_source', lambda key: Source())
+    page = ParsePool(workers=0).parse_fetched(fetched(Response(b'a')), parse_titles, source='example')
+    assert page.result(timeout=5)[1:] == ([{'title': 'a'}], None)
+    assert 'Could not cache parsed page' in capsys.readouterr().out
+
+
+def test_process_pool_propagates_parse_errors():
+    pool = ParsePool(workers=1, inline_pages=0)
+    try:
+        assert pool.submit(parse_titles, b'x').result(timeout=60) == [{'title': 'x'}]
+        with pytest.raises(ValueError):
+            pool.submit(parse_titles, b'broken').result(timeout=60)
+    finally:
+        pool.shutdown()
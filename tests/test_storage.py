@@ -0,0 +1,88 @@
+"""Seen-set compaction on each storage backend"""
+from datetime import datetime, timedelta
+
+import pytest
+
+import seen_index
+import sqlite_store
+import storage
+
+OLD = (datetime.now() - timedelta(days=40)).isoformat()
+RECENT = (datetime.now() - timedelta(days=2)).isoformat()
+
+
+@pytest.fixture
+def backend(tmp_path, monkeypatch):
+    """Select a storage backend with its files in a fresh directory"""
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(sqlite_store, '_store', None)
+    monkeypatch.setattr(seen_index, '_index', None)
+
+    def select(name):
+        monkeypatch.setattr(storage, 'STORAGE_BACKEND', name)
+    yield select
+    if sqlite_store._store is not None:
+        sqlite_store._store.close()
+    if seen_index._index is not None:
+        seen_index._index.close()
+
+
+def test_compact_seen_json(backend):
+    backend('json')
+    storage._write_seen_file({'old': OLD, 'recent': RECENT})
+    seen = storage.load_seen()
+    seen.add('new')
+    assert storage.compact_seen(seen, retention_days=30) == 1
+    assert seen == {'recent', 'new'}
+    storage.save_seen(seen)
+    assert set(storage.load_seen()) == {'recent', 'new'}
+
+
+def test_compact_seen_json_nothing_to_evict(backend):
+    backend('json')
+    storage._write_seen_file({'recent': RECENT})
+    seen = storage.load_seen()
+    assert storage.compact_seen(seen, retention_days=30) == 0
+    assert seen == {'recent'}
+
+
+def test_compact_seen_sqlite(backend):
+    backend('sqlite')
+    store = sqlite_store.get_store()
+    store.mark_seen(['old', 'recent'])
+    with store.conn:
+        store.conn.execute("UPDATE seen SET first_seen = ? WHERE id = 'old'", (OLD,))
+    seen = storage.load_seen()
+    assert storage.compact_seen(seen, retention_days=30) == 1
+    assert 'old' not in seen and 'recent' in seen
+    assert store.seen_count() == 1
+
+
+def test_compact_seen_mmap(backend):
+    backend('mmap')
+    index = seen_index.get_index()
+    index.import_ids({'old': OLD, 'recent': RECENT})
+    index.add('new')
+    seen = storage.load_seen()
+    assert seen is index
+    assert storage.compact_seen(seen, retention_days=30) == 1
+    assert 'old' not in seen and 'recent' in seen and 'new' in seen
+    # The eviction was written to disk, not just dropped from memory
+    reopened = seen_index.SeenIndex(seen_index.INDEX_FILE)
+    assert 'old' not in reopened and len(reopened) == 2
+    reopened.close()
+
+
+@pytest.mark.parametrize('name', ['json', 'sqlite'])
+def test_same_source_roles_both_stay_in_batch(backend, name):
+    backend(name)
+    roles = [
+        {'id': 'web', 'title': "Web Development Intern", 'company': "Acme", 'source': 'Internshala',
+         'link': "https://internshala.com/internship/detail/web-development-1"},
+        {'id': 'app', 'title': "App Development Intern", 'company': "Acme", 'source': 'Internshala',
+         'link': "https://internshala.com/internship/detail/app-development-2"},
+    ]
+    with storage.open_batch_store() as batch:
+        assert batch.add_many(roles) == roles
+        assert batch.merged == []
+    assert [job['id'] for job in storage.load_batch()] == ['web', 'app']